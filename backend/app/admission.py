@@ -0,0 +1,131 @@
+"""Admission control and load shedding for the summarization routes."""
+import asyncio
+from collections import deque
+from typing import Optional
+from fastapi import HTTPException, Request, status
+
+from .config import settings
+from .logger import logger
+
+# Non-standard status used when the client went away while queued (as in nginx)
+CLIENT_CLOSED_REQUEST = 499
+
+
+class AdmissionController:
+    """
+    Bounds the number of in-flight requests and the queue waiting behind them.
+
+    Requests beyond ``max_in_flight`` wait in a FIFO queue of at most
+    ``max_queue`` entries; anything past that is rejected immediately with
+    503 and ``Retry-After``. Queued requests whose client disconnects are
+    dropped without ever running.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = settings.ADMISSION_MAX_IN_FLIGHT,
+        max_queue: int = settings.ADMISSION_MAX_QUEUE,
+        retry_after: int = settings.ADMISSION_RETRY_AFTER_SECONDS,
+        poll_interval: float = settings.ADMISSION_DISCONNECT_POLL_SECONDS,
+    ):
+        """Initialize the controller with its concurrency and queue bounds."""
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+        self.poll_interval = poll_interval
+        self.in_flight = 0
+        self.rejected = 0
+        self.dropped = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of total capacity (in-flight plus queue) currently used."""
+        capacity = self.max_in_flight + self.max_queue
+        return (self.in_flight + self.queued) / capacity if capacity else 1.0
+
+    def stats(self) -> dict:
+        """Return current admission statistics."""
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": self.queued,
+            "max_queue": self.max_queue,
+            "saturation": round(self.saturation, 3),
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+        }
+
+    async def acquire(self, request: Optional[Request] = None) -> None:
+        """
+        Wait for an in-flight slot.
+
+        Raises:
+            HTTPException: 503 when the queue is full, or 499 when the client
+                disconnected while waiting
+        """
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return
+
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            logger.warning(f"Admission queue full ({self.queued} waiting); shedding request")
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={"error": {"message": "Server is overloaded, retry later", "code": "OVERLOADED"}},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            while True:
+                done, _ = await asyncio.wait({waiter}, timeout=self.poll_interval)
+                if done:
+                    return
+                if request is not None and await request.is_disconnected():
+                    self.dropped += 1
+                    logger.info("Dropping queued request: client disconnected")
+                    raise HTTPException(
+                        status_code=CLIENT_CLOSED_REQUEST,
+                        detail={"error": {"message": "Client closed request", "code": "CLIENT_CLOSED"}},
+                    )
+        except BaseException:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we gave up; pass it on
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self) -> None:
+        """Give the slot to the oldest live waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+# Global instance
+admission = AdmissionController()
+
+
+async def admit(request: Request):
+    """FastAPI dependency that holds an admission slot for the whole request."""
+    await admission.acquire(request)
+    try:
+        yield
+    finally:
+        admission.release()
@@ -1,20 +1,52 @@
 """REST API endpoints for the GenAIsummarizer application."""
-from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, status
+from fastapi import APIRouter, UploadFile, File, Form, Depends, HTTPException, Query, Request, status
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Literal, List
 from datetime import datetime
+import json
 import uuid
-from .auth import verify_token
+from .admission import admission, admit
+from .auth import require_admin, verify_token
+from .deadline import note_input_tokens, request_deadline
+from .metrics import metrics
+from .ndjson import encode_ndjson, iter_ndjson_lines
+from .profiling import profile_request, profile_store, to_thread
 from .summarizer.engine import engine
-from .summarizer.utils import extract_text, validate_file_size, validate_format
-from .errors import SummarizerException, format_error_response, URLFetchError, ExtractionError, FileSizeError
+from .summarizer.extractive import extractive_summary, select_salient
+from .summarizer.near_dup import near_duplicates
+from .summarizer.normalize import normalize_text
+from .summarizer.routing import track_usage
+from .summarizer.scheduler import Lane, scheduler
+from .summarizer.slicing import parse_page_range
+from .summarizer.sniff import SNIFF_BYTES, check_document, check_head
+from .summarizer.utils import estimate_tokens, extract_text, validate_file_size, validate_format
+from .config import settings
+from .errors import (
+    SummarizerException,
+    SummarizationError,
+    format_error_response,
+    URLFetchError,
+    ExtractionError,
+    FileSizeError,
+    ValidationError,
+)
 from .logger import logger
+from .search import SearchIndex
+from .store import SummaryStore, UserIndexes, from_timestamp, to_timestamp
+from .tracing import span
 
 router = APIRouter(prefix="/api", tags=["API"])
 
 # In-memory storage for summaries (in production, use database)
-summaries_db: dict = {}
-users_db: dict = {}
+summaries_db = SummaryStore()
+users_db = UserIndexes()
+
+# Full-text index over history, kept in sync with the store
+search_index = SearchIndex()
+summaries_db.subscribe(search_index.on_store_event)
+# Deleted or evicted summaries must not be reused for near-duplicate input
+summaries_db.subscribe(near_duplicates.on_store_event)
 
 
 class SummaryRequest(BaseModel):
@@ -22,6 +54,10 @@ class SummaryRequest(BaseModel):
 
     text: str
     summary_length: Literal["short", "medium", "long"] = "medium"
+    all_lengths: bool = False
+    incremental: bool = False
+    extractive: Literal["off", "prefilter", "fallback"] = "off"
+    reuse_similar: bool = True
 
 
 class SummaryResponse(BaseModel):
@@ -49,7 +85,111 @@ class HistoryResponse(BaseModel):
     total: int
 
 
-@router.post("/summarize")
+def _normalize(text: str) -> tuple[str, Optional[dict]]:
+    """Apply the pre-summarization cleanup stage when it is enabled."""
+    if not settings.NORMALIZE_TEXT:
+        return text, None
+    text, stats = normalize_text(text)
+    logger.info(f"Normalization saved {stats['chars_saved']} chars (~{stats['tokens_saved']} tokens)")
+    return text, stats
+
+
+async def _summarize(
+    text: str,
+    length: str,
+    user_id: str,
+    lane: Lane = "interactive",
+    all_lengths: bool = False,
+    incremental: bool = False,
+    extractive: str = "off",
+    reuse_similar: bool = True,
+) -> tuple[str, dict]:
+    """
+    Run the summarization mode selected for a request.
+
+    Input that nearly duplicates text summarized before at the same length
+    reuses that summary without an upstream call, unless the caller opts out
+    or asks for an incremental summary (which recomputes changed chunks).
+
+    Args:
+        text: Normalized text to summarize
+        length: Desired summary length
+        user_id: User the summary is generated for
+        lane: Scheduling lane for the upstream call
+        all_lengths: Generate every length in one upstream call
+        incremental: Reuse stored partial summaries of unchanged chunks
+        extractive: "prefilter" shrinks oversized input to its most salient
+            sentences; "fallback" also returns a local extractive summary
+            when the model is unavailable
+        reuse_similar: Allow reusing the summary of a near-duplicate input
+
+    Returns:
+        Tuple of the summary and extra fields for the summary record
+    """
+    details = {}
+    if extractive != "off":
+        shrunk = select_salient(text)
+        details["extractive"] = {
+            "mode": extractive,
+            "tokens_before": estimate_tokens(text),
+            "tokens_after": estimate_tokens(shrunk),
+            "fallback": False,
+        }
+        text = shrunk
+
+    scope = "" if settings.NEAR_DUPLICATE_SHARED else user_id
+    if settings.NEAR_DUPLICATE_ENABLED and reuse_similar and not all_lengths and not incremental:
+        match = near_duplicates.lookup(text, f"{scope}:{length}")
+        if match is not None:
+            summary, similarity = match
+            metrics.inc("near_duplicate_hits_total")
+            logger.info(f"Reusing summary of a near-duplicate input (similarity {similarity:.2f})")
+            details["reused"] = {"similarity": round(similarity, 3)}
+            return summary, details
+
+    weight = settings.SCHEDULER_GUEST_WEIGHT if user_id.startswith("guest_") else 1.0
+    note_input_tokens(estimate_tokens(text))
+    with track_usage() as usage:
+        try:
+            async with scheduler.slot(user_id, lane, cost=estimate_tokens(text), weight=weight):
+                if all_lengths:
+                    # One upstream call fills the cache for every length
+                    details["summaries"] = await engine.generate_summaries(text)
+                    summary = details["summaries"][length]
+                elif incremental:
+                    summary, details["chunks"] = await engine.generate_incremental_summary(text, length)
+                else:
+                    summary = await engine.generate_summary(text, length)
+        except SummarizationError as e:
+            if extractive != "fallback" or not text.strip():
+                raise
+            logger.warning(f"Falling back to extractive summary: {e.message}")
+            summary = extractive_summary(text, length)
+            details["extractive"]["fallback"] = True
+            return summary, details
+
+    if usage.calls:
+        details["route"] = usage.to_dict()
+
+    if settings.NEAR_DUPLICATE_ENABLED:
+        for generated_length, generated in details.get("summaries", {length: summary}).items():
+            near_duplicates.add(text, f"{scope}:{generated_length}", generated)
+
+    return summary, details
+
+
+def _save_summary(summary_record: dict) -> None:
+    """Persist a summary record and add it to its owner's history."""
+    summary_id = summary_record["id"]
+    user_id = summary_record["user_id"]
+    with span("persistence", op="save", summary_id=summary_id):
+        summaries_db[summary_id] = summary_record
+        if user_id not in users_db:
+            users_db[user_id] = []
+        users_db[user_id].append(summary_id)
+
+
+@router.post("/summarize", dependencies=[Depends(profile_request), Depends(request_deadline), Depends(admit)])
 async def summarize_text(
     request: SummaryRequest,
     user_id: str = Depends(verify_token),
@@ -73,7 +213,17 @@ async def summarize_text(
 
         logger.info(f"Summarizing text for user {user_id}")
 
-        summary = await engine.generate_summary(request.text, request.summary_length)
+        text, normalization = _normalize(request.text)
+
+        summary, details = await _summarize(
+            text,
+            request.summary_length,
+            user_id,
+            all_lengths=request.all_lengths,
+            incremental=request.incremental,
+            extractive=request.extractive,
+            reuse_similar=request.reuse_similar,
+        )
 
         summary_id = str(uuid.uuid4())
         summary_record = {
@@ -84,12 +234,11 @@ async def summarize_text(
             "created_at": datetime.utcnow().isoformat(),
             "user_id": user_id,
         }
+        summary_record.update(details)
+        if normalization is not None:
+            summary_record["normalization"] = normalization
 
-        summaries_db[summary_id] = summary_record
-
-        if user_id not in users_db:
-            users_db[user_id] = []
-        users_db[user_id].append(summary_id)
+        _save_summary(summary_record)
 
         logger.info(f"Summary {summary_id} created for user {user_id}")
 
@@ -109,10 +258,15 @@ async def summarize_text(
         )
 
 
-@router.post("/summarize/file")
+@router.post("/summarize/file", dependencies=[Depends(profile_request), Depends(request_deadline), Depends(admit)])
 async def summarize_file(
     file: UploadFile = File(...),
     summary_length: Literal["short", "medium", "long"] = Form("medium"),
+    incremental: bool = Form(False),
+    extractive: Literal["off", "prefilter", "fallback"] = Form("off"),
+    reuse_similar: bool = Form(True),
+    page_range: Optional[str] = Form(None),
+    section: Optional[str] = Form(None),
     user_id: str = Depends(verify_token),
 ) -> dict:
     """
@@ -121,6 +275,11 @@ async def summarize_file(
     Args:
         file: Uploaded file
         summary_length: Desired summary length
+        incremental: Reuse stored partial summaries of unchanged chunks
+        extractive: Extractive pre-filter/fallback mode
+        reuse_similar: Allow reusing the summary of a near-duplicate input
+        page_range: Only summarize these 1-based PDF pages, e.g. "10-24" or "1-2,7"
+        section: Only summarize the DOCX heading section with this title or number
         user_id: Authenticated user ID
 
     Returns:
@@ -135,16 +294,36 @@ async def summarize_file(
                 detail={"error": {"message": f"Unsupported file format: {file_ext}", "code": "FILE_FORMAT_ERROR"}},
             )
 
-        # Read file content
-        content = await file.read()
+        # Reject malformed selections before reading the upload
+        page_range = page_range.strip() if page_range and page_range.strip() else None
+        section = section.strip() if section and section.strip() else None
+        if page_range is not None and section is not None:
+            raise ValidationError("Use either page_range or section, not both")
+        if page_range is not None:
+            parse_page_range(page_range)
+
+        # Reject oversized uploads before reading them
+        if file.size is not None:
+            validate_file_size(file.size)
+
+        # Read the head first so obviously wrong content is rejected without reading the rest
+        with span("upload_read", filename=file.filename):
+            head = await file.read(SNIFF_BYTES)
+            check_head(head, file_ext)
+            content = head + await file.read()
 
         # Validate file size
         validate_file_size(len(content))
 
         logger.info(f"Processing file {file.filename} for user {user_id}")
 
-        # Extract text
-        text = await extract_text(content, file_ext)
+        # Confirm the format from the content and probe PDFs for a text layer
+        with span("sniff", declared=file_ext) as current:
+            file_ext = await to_thread(check_document, content, file_ext)
+            current.set_attribute("format", file_ext)
+
+        # Extract text, parsing only the requested pages or section
+        text = await extract_text(content, file_ext, page_range=page_range, section=section)
 
         if not text or not text.strip():
             raise HTTPException(
@@ -152,8 +331,18 @@ async def summarize_file(
                 detail={"error": {"message": "Could not extract text from file", "code": "EXTRACTION_ERROR"}},
             )
 
+        # Clean up extraction artifacts before they cost tokens
+        text, normalization = _normalize(text)
+
         # Generate summary
-        summary = await engine.generate_summary(text, summary_length)
+        summary, details = await _summarize(
+            text,
+            summary_length,
+            user_id,
+            incremental=incremental,
+            extractive=extractive,
+            reuse_similar=reuse_similar,
+        )
 
         summary_id = str(uuid.uuid4())
         summary_record = {
@@ -165,12 +354,15 @@ async def summarize_file(
             "user_id": user_id,
             "filename": file.filename,
         }
+        if page_range is not None:
+            summary_record["page_range"] = page_range
+        if section is not None:
+            summary_record["section"] = section
+        summary_record.update(details)
+        if normalization is not None:
+            summary_record["normalization"] = normalization
 
-        summaries_db[summary_id] = summary_record
-
-        if user_id not in users_db:
-            users_db[user_id] = []
-        users_db[user_id].append(summary_id)
+        _save_summary(summary_record)
 
         logger.info(f"File summary {summary_id} created for user {user_id}")
 
@@ -190,10 +382,13 @@ async def summarize_file(
         )
 
 
-@router.post("/summarize/url")
+@router.post("/summarize/url", dependencies=[Depends(profile_request), Depends(request_deadline), Depends(admit)])
 async def summarize_url(
     url: str = Form(...),
     summary_length: Literal["short", "medium", "long"] = Form("medium"),
+    incremental: bool = Form(False),
+    extractive: Literal["off", "prefilter", "fallback"] = Form("off"),
+    reuse_similar: bool = Form(True),
     user_id: str = Depends(verify_token),
 ) -> dict:
     """
@@ -202,6 +397,9 @@ async def summarize_url(
     Args:
         url: URL to fetch and summarize
         summary_length: Desired summary length
+        incremental: Reuse stored partial summaries of unchanged chunks
+        extractive: Extractive pre-filter/fallback mode
+        reuse_similar: Allow reusing the summary of a near-duplicate input
         user_id: Authenticated user ID
 
     Returns:
@@ -219,8 +417,18 @@ async def summarize_url(
                 detail={"error": {"message": "Could not extract text from URL", "code": "EXTRACTION_ERROR"}},
             )
 
+        # Clean up extraction artifacts before they cost tokens
+        text, normalization = _normalize(text)
+
         # Generate summary
-        summary = await engine.generate_summary(text, summary_length)
+        summary, details = await _summarize(
+            text,
+            summary_length,
+            user_id,
+            incremental=incremental,
+            extractive=extractive,
+            reuse_similar=reuse_similar,
+        )
 
         summary_id = str(uuid.uuid4())
         summary_record = {
@@ -232,12 +440,11 @@ async def summarize_url(
             "user_id": user_id,
             "source_url": url,
         }
+        summary_record.update(details)
+        if normalization is not None:
+            summary_record["normalization"] = normalization
 
-        summaries_db[summary_id] = summary_record
-
-        if user_id not in users_db:
-            users_db[user_id] = []
-        users_db[user_id].append(summary_id)
+        _save_summary(summary_record)
 
         logger.info(f"URL summary {summary_id} created for user {user_id}")
 
@@ -257,7 +464,7 @@ async def summarize_url(
         )
 
 
-@router.post("/batch")
+@router.post("/batch", dependencies=[Depends(profile_request), Depends(request_deadline), Depends(admit)])
 async def batch_summarize(
     request: BatchRequest,
     user_id: str = Depends(verify_token),
@@ -285,19 +492,17 @@ async def batch_summarize(
         for item in request.items:
             try:
                 if "text" in item:
-                    summary = await engine.generate_summary(item["text"], request.summary_length)
+                    summary, _ = await _summarize(item["text"], request.summary_length, user_id, lane="batch")
                     summary_id = str(uuid.uuid4())
                     summary_record = {
                         "id": summary_id,
                         "summary": summary,
                         "length": request.summary_length,
                         "created_at": datetime.utcnow().isoformat(),
+                        "user_id": user_id,
                     }
                     results.append(summary_record)
-                    summaries_db[summary_id] = summary_record
-                    if user_id not in users_db:
-                        users_db[user_id] = []
-                    users_db[user_id].append(summary_id)
+                    _save_summary(summary_record)
             except Exception as e:
                 logger.error(f"Failed to process batch item: {str(e)}")
                 results.append({"error": str(e)})
@@ -315,11 +520,12 @@ async def batch_summarize(
 
 
 @router.get("/history")
-async def get_history(user_id: str = Depends(verify_token)) -> dict:
+async def get_history(include_text: bool = False, user_id: str = Depends(verify_token)) -> dict:
     """
     Get summarization history for the authenticated user.
 
     Args:
+        include_text: Also return each summary's (decompressed) source text
         user_id: Authenticated user ID
 
     Returns:
@@ -329,7 +535,9 @@ async def get_history(user_id: str = Depends(verify_token)) -> dict:
         logger.info(f"Retrieving history for user {user_id}")
 
         user_summaries = users_db.get(user_id, [])
-        summaries = [summaries_db[sid] for sid in user_summaries if sid in summaries_db]
+        summaries = [
+            summaries_db[sid].to_dict(include_text=include_text) for sid in user_summaries if sid in summaries_db
+        ]
 
         return {
             "summaries": summaries,
@@ -344,6 +552,224 @@ async def get_history(user_id: str = Depends(verify_token)) -> dict:
         )
 
 
+@router.get("/history/search")
+async def search_history(
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    user_id: str = Depends(verify_token),
+) -> dict:
+    """
+    Search the authenticated user's history by summary text, filename and source URL.
+
+    Args:
+        q: Search query
+        limit: Maximum number of results per page
+        offset: Number of ranked results to skip
+        user_id: Authenticated user ID
+
+    Returns:
+        Page of matching summaries ranked by BM25 score
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": {"message": "Search query cannot be empty", "code": "VALIDATION_ERROR"}},
+        )
+
+    try:
+        logger.info(f"Searching history for user {user_id}")
+
+        hits, total = search_index.search(user_id, q, limit=limit, offset=offset)
+        results = []
+        for summary_id, score in hits:
+            record = summaries_db.get(summary_id)
+            if record is not None:
+                results.append({**record.to_dict(include_text=False), "score": round(score, 4)})
+
+        return {
+            "query": q,
+            "results": results,
+            "total": total,
+            "limit": limit,
+            "offset": offset,
+        }
+
+    except Exception as e:
+        logger.error(f"Failed to search history: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"error": {"message": "Failed to search history", "code": "HISTORY_ERROR"}},
+        )
+
+
+@router.get("/history/export")
+async def export_history(
+    include_text: bool = True,
+    compress: bool = Query(False, alias="gzip"),
+    user_id: str = Depends(verify_token),
+) -> StreamingResponse:
+    """
+    Stream the authenticated user's history as NDJSON, one summary per line.
+
+    Records are read and encoded in batches while the response is sent, so
+    memory does not grow with the size of the history.
+
+    Args:
+        include_text: Include each summary's source text
+        compress: Send a gzip file instead of plain NDJSON
+        user_id: Authenticated user ID
+
+    Returns:
+        Streaming NDJSON (or gzip) download
+    """
+    logger.info(f"Exporting history for user {user_id}")
+    summary_ids = list(users_db.get(user_id, []))
+
+    def records():
+        for summary_id in summary_ids:
+            record = summaries_db.get(summary_id)
+            if record is not None:
+                yield record.to_dict(include_text=include_text)
+
+    chunks = encode_ndjson(records(), settings.HISTORY_EXPORT_BATCH_SIZE, compress=compress)
+    filename = "history.ndjson.gz" if compress else "history.ndjson"
+    return StreamingResponse(
+        chunks,
+        media_type="application/gzip" if compress else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# Source details an imported summary may carry besides its core fields
+IMPORT_EXTRA_FIELDS = ("filename", "source_url", "page_range", "section")
+
+
+def _import_record(data, user_id: str, seen: set) -> Optional[dict]:
+    """
+    Validate one imported line and turn it into a summary record owned by ``user_id``.
+
+    Only the core fields and ``IMPORT_EXTRA_FIELDS`` are kept; anything else
+    (including fields the server sets itself, such as ``reused``) is dropped.
+
+    Returns:
+        The record, or None if the user already has a summary with this ID,
+        or the ID appeared earlier in the same import
+
+    Raises:
+        ValueError: If the line is not a valid summary
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Line is not a JSON object")
+    if not isinstance(data.get("summary"), str) or not data["summary"].strip():
+        raise ValueError("Missing summary")
+    length = data.get("length", "medium")
+    if length not in ("short", "medium", "long"):
+        raise ValueError(f"Invalid length: {length}")
+    for field in ("text",) + IMPORT_EXTRA_FIELDS:
+        if data.get(field) is not None and not isinstance(data[field], str):
+            raise ValueError(f"{field} must be a string")
+    try:
+        created_at = from_timestamp(to_timestamp(data.get("created_at") or datetime.utcnow()))
+    except (TypeError, AttributeError, OverflowError):
+        raise ValueError(f"Invalid created_at: {data.get('created_at')!r}")
+
+    summary_id = data.get("id")
+    if isinstance(summary_id, str) and summary_id:
+        existing = summaries_db.get(summary_id)
+        if summary_id in seen or (existing is not None and existing.user_id == user_id):
+            return None
+        # Track the file's ID, so a repeated line is skipped even if it gets a new ID below
+        seen.add(summary_id)
+        if existing is not None:
+            # The ID belongs to someone else; keep both summaries
+            summary_id = str(uuid.uuid4())
+    else:
+        summary_id = str(uuid.uuid4())
+    record = {
+        "id": summary_id,
+        "summary": data["summary"],
+        "length": length,
+        "created_at": created_at,
+        "user_id": user_id,
+    }
+    for field in ("text",) + IMPORT_EXTRA_FIELDS:
+        if data.get(field) is not None:
+            record[field] = data[field]
+    return record
+
+
+def _save_summaries(summary_records: list[dict], user_id: str) -> None:
+    """Persist a validated batch of one user's records in a single step."""
+    with span("persistence", op="import", count=len(summary_records)):
+        if user_id not in users_db:
+            users_db[user_id] = []
+        index = users_db[user_id]
+        for summary_record in summary_records:
+            summaries_db[summary_record["id"]] = summary_record
+            index.append(summary_record["id"])
+
+
+@router.post("/history/import")
+async def import_history(request: Request, user_id: str = Depends(verify_token)) -> dict:
+    """
+    Import NDJSON summaries (as produced by /history/export) into the user's history.
+
+    The body is parsed as it streams in and stored in batches of
+    ``HISTORY_IMPORT_BATCH_SIZE``; each batch is validated in full before any
+    of it is stored. Send ``Content-Encoding: gzip`` or
+    ``Content-Type: application/gzip`` for compressed bodies. Imported
+    summaries belong to the caller; lines whose ID the caller already has are
+    skipped, so an import can be re-run safely.
+
+    Args:
+        request: Request with the NDJSON body
+        user_id: Authenticated user ID
+
+    Returns:
+        Counts of imported, skipped (duplicate) and invalid lines, with the first errors
+    """
+    compressed = (
+        request.headers.get("content-encoding", "").lower() == "gzip"
+        or request.headers.get("content-type", "").split(";")[0].strip() in ("application/gzip", "application/x-gzip")
+    )
+    imported = skipped = invalid = 0
+    errors = []
+    batch: list[dict] = []
+    seen: set = set()
+
+    try:
+        lines = iter_ndjson_lines(request.stream(), compressed, settings.HISTORY_IMPORT_MAX_LINE_BYTES)
+        async for number, line in lines:
+            try:
+                summary_record = _import_record(json.loads(line), user_id, seen)
+            except ValueError as e:
+                invalid += 1
+                if len(errors) < 20:
+                    errors.append({"line": number, "error": str(e)})
+                continue
+            if summary_record is None:
+                skipped += 1
+                continue
+            batch.append(summary_record)
+            if len(batch) >= settings.HISTORY_IMPORT_BATCH_SIZE:
+                _save_summaries(batch, user_id)
+                imported += len(batch)
+                batch = []
+        if batch:
+            _save_summaries(batch, user_id)
+            imported += len(batch)
+    except SummarizerException as e:
+        logger.error(f"History import failed after {imported} records: {e.message}")
+        raise HTTPException(
+            status_code=e.status_code,
+            detail={**format_error_response(e), "imported": imported},
+        )
+
+    logger.info(f"Imported {imported} summaries for user {user_id} ({skipped} duplicates, {invalid} invalid)")
+    return {"imported": imported, "skipped": skipped, "invalid": invalid, "errors": errors}
+
+
 @router.get("/summary/{summary_id}")
 async def get_summary(summary_id: str, user_id: str = Depends(verify_token)) -> dict:
     """
@@ -374,7 +800,7 @@ async def get_summary(summary_id: str, user_id: str = Depends(verify_token)) ->
 
         logger.info(f"Retrieved summary {summary_id} for user {user_id}")
 
-        return summary
+        return summary.to_dict()
 
     except HTTPException:
         raise
@@ -414,11 +840,12 @@ async def delete_summary(summary_id: str, user_id: str = Depends(verify_token))
                 detail={"error": {"message": "Access denied", "code": "FORBIDDEN"}},
             )
 
-        del summaries_db[summary_id]
+        with span("persistence", op="delete", summary_id=summary_id):
+            del summaries_db[summary_id]
 
-        # Remove from user history
-        if user_id in users_db and summary_id in users_db[user_id]:
-            users_db[user_id].remove(summary_id)
+            # Remove from user history
+            if user_id in users_db:
+                users_db[user_id].discard(summary_id)
 
         logger.info(f"Deleted summary {summary_id} for user {user_id}")
 
@@ -438,3 +865,59 @@ async def delete_summary(summary_id: str, user_id: str = Depends(verify_token))
 async def health_check() -> dict:
     """Health check endpoint."""
     return {"status": "healthy", "version": "1.0.0"}
+
+
+@router.get("/metrics")
+async def get_metrics() -> dict:
+    """Return application counters and gauges."""
+    return metrics.snapshot()
+
+
+@router.get("/admin/profiles")
+async def list_profiles(admin_id: str = Depends(require_admin)) -> dict:
+    """List stored request profiles, newest first (admin only)."""
+    profiles = [profile.to_dict(include_samples=False) for profile in profile_store.list()]
+    return {"profiles": profiles, "total": len(profiles)}
+
+
+@router.get("/admin/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: Literal["json", "folded"] = "json",
+    admin_id: str = Depends(require_admin),
+):
+    """
+    Download a request profile (admin only).
+
+    Args:
+        profile_id: Profile ID from the X-Profile-Id response header
+        format: ``json`` for stage timings and top stacks, or ``folded``
+            for flame graph tools (e.g. flamegraph.pl, speedscope)
+        admin_id: Authenticated admin user ID
+
+    Returns:
+        Profile data
+    """
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"error": {"message": "Profile not found", "code": "NOT_FOUND"}},
+        )
+    if format == "folded":
+        return PlainTextResponse(
+            profile.folded(),
+            headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.folded"'},
+        )
+    return profile.to_dict()
+
+
+@router.get("/health/ready")
+async def readiness_check() -> JSONResponse:
+    """Readiness check that reports 503 while the summarization routes are saturated."""
+    stats = admission.stats()
+    ready = admission.saturation < settings.ADMISSION_READY_THRESHOLD
+    return JSONResponse(
+        {"status": "ready" if ready else "saturated", **stats, "scheduler": scheduler.stats()},
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
@@ -56,29 +56,72 @@ def verify_token(credentials: Optional[HTTPAuthorizationCredentials] = Depends(s
         logger.info(f"Guest user access: {guest_id}")
         return guest_id
 
-    token = credentials.credentials
+    user_id = decode_access_token(credentials.credentials)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    logger.info(f"Token verified for user {user_id}")
+    return user_id
+
+
+def decode_access_token(token: str) -> Optional[str]:
+    """
+    Decode a JWT access token.
+
+    Args:
+        token: Encoded JWT token
+
+    Returns:
+        User ID from the token, or None if the token is invalid or expired
+    """
     try:
         payload = jwt.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM],
         )
-        user_id: str = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        logger.info(f"Token verified for user {user_id}")
-        return user_id
     except JWTError as e:
         logger.error(f"Token verification failed: {str(e)}")
+        return None
+    return payload.get("sub")
+
+
+def is_admin(user_id: str) -> bool:
+    """
+    Check whether a user is listed in ADMIN_USERS.
+
+    Args:
+        user_id: User identifier
+
+    Returns:
+        True if the user is an admin
+    """
+    admins = {admin.strip() for admin in settings.ADMIN_USERS.split(",") if admin.strip()}
+    return user_id in admins
+
+
+def require_admin(user_id: str = Depends(verify_token)) -> str:
+    """
+    Verify that the caller is an admin user.
+
+    Args:
+        user_id: User ID from the token
+
+    Returns:
+        The admin's user ID
+
+    Raises:
+        HTTPException: If the user is not an admin
+    """
+    if not is_admin(user_id):
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"error": {"message": "Admin access required", "code": "FORBIDDEN"}},
         )
+    return user_id
 
 
 def get_user_token(user_id: str) -> str:
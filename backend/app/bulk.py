@@ -0,0 +1,196 @@
+"""Offline bulk summarization of many files, used by ``run.py summarize``."""
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+from .config import settings
+from .errors import ValidationError
+from .logger import logger
+from .summarizer.engine import engine
+from .summarizer.normalize import normalize_text
+from .summarizer.sniff import check_document
+from .summarizer.utils import extract_text
+from .tracing import attach, inject, span
+
+SUPPORTED_EXTENSIONS = {"txt", "pdf", "docx"}
+MANIFEST_SUFFIXES = {".manifest", ".list", ".jsonl"}
+
+
+def _read_manifest(manifest: Path) -> list[Path]:
+    """
+    Read input paths from a manifest (one path per line, or JSON lines with a "path" key).
+
+    Raises:
+        ValidationError: If a JSON line is malformed or has no string "path"
+    """
+    paths = []
+    for number, line in enumerate(manifest.read_text(encoding="utf-8").splitlines(), start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            try:
+                entry = json.loads(line).get("path")
+            except ValueError as e:
+                raise ValidationError(f"{manifest}:{number}: invalid JSON ({str(e)})")
+            if not isinstance(entry, str) or not entry:
+                raise ValidationError(f'{manifest}:{number}: entry has no "path" string')
+        else:
+            entry = line
+        path = Path(entry)
+        paths.append(path if path.is_absolute() else manifest.parent / path)
+    return paths
+
+
+def resolve_inputs(target: str) -> list[Path]:
+    """
+    Expand a directory, glob pattern or manifest file into input files.
+
+    Args:
+        target: Directory (searched recursively), glob pattern, single file,
+            or manifest ending in .manifest, .list or .jsonl
+
+    Returns:
+        Sorted list of supported input files
+    """
+    path = Path(target)
+    if path.is_dir():
+        candidates: Iterable[Path] = path.rglob("*")
+    elif path.is_file() and path.suffix in MANIFEST_SUFFIXES:
+        candidates = _read_manifest(path)
+    elif path.is_file():
+        candidates = [path]
+    else:
+        candidates = (Path(match) for match in glob.glob(target, recursive=True))
+    return sorted(
+        {p for p in candidates if p.is_file() and p.suffix.lower().lstrip(".") in SUPPORTED_EXTENSIONS}
+    )
+
+
+def _extract_file(path: str, trace_context: Optional[dict] = None) -> tuple[str, Optional[str], Optional[str]]:
+    """Process-pool worker: extract and normalize one file's text."""
+    try:
+        with attach(trace_context), span("bulk.extract", path=path):
+            content = Path(path).read_bytes()
+            fmt = check_document(content, Path(path).suffix.lower().lstrip("."))
+            text = asyncio.run(extract_text(content, fmt))
+            if settings.NORMALIZE_TEXT:
+                text, _ = normalize_text(text)
+        return path, text, None
+    except Exception as e:
+        return path, None, str(e)
+
+
+class _Progress:
+    """Periodic progress and throughput reporting on stderr."""
+
+    def __init__(self, total: int, skipped: int):
+        self.total = total
+        self.skipped = skipped
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._last_report = 0.0
+
+    def update(self, failed: bool) -> None:
+        self.done += 1
+        self.failed += int(failed)
+        now = time.monotonic()
+        if now - self._last_report >= 1.0 or self.done == self.total:
+            self._last_report = now
+            self.report()
+
+    def report(self) -> None:
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        print(
+            f"\r[{self.done}/{self.total}] {self.failed} failed, "
+            f"{self.done / elapsed:.2f} files/s, {elapsed:.0f}s elapsed",
+            end="",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+async def summarize_files(
+    paths: list[Path],
+    output: Path,
+    checkpoint: Path,
+    length: str = "medium",
+    workers: Optional[int] = None,
+    concurrency: int = 8,
+) -> dict:
+    """
+    Summarize files, appending one JSON line per file to ``output``.
+
+    Extraction runs in a process pool; model calls run with at most
+    ``concurrency`` in flight. Successfully summarized paths are appended to
+    ``checkpoint`` and skipped on the next run, so an interrupted job resumes
+    where it stopped. Failures are written to the output but not
+    checkpointed, so they are retried.
+
+    Returns:
+        Counts of processed, failed and skipped files
+    """
+    completed = set()
+    if checkpoint.exists():
+        completed = set(checkpoint.read_text(encoding="utf-8").splitlines())
+    pending = [str(path) for path in paths if str(path) not in completed]
+    progress = _Progress(len(pending), len(paths) - len(pending))
+    logger.info(f"Bulk summarization: {len(pending)} files to process, {progress.skipped} already done")
+
+    llm_slots = asyncio.Semaphore(concurrency)
+    # Bound outstanding files so extracted text does not pile up waiting for the model
+    window = asyncio.Semaphore(concurrency * 2 + (workers or os.cpu_count() or 1))
+    loop = asyncio.get_running_loop()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool, \
+            output.open("a", encoding="utf-8") as out, \
+            checkpoint.open("a", encoding="utf-8") as done_log:
+
+        async def process(path: str) -> None:
+            started = time.monotonic()
+            try:
+                with span("bulk.file", path=path) as current:
+                    _, text, error = await loop.run_in_executor(pool, _extract_file, path, inject())
+                    if error is None and (not text or not text.strip()):
+                        error = "No text could be extracted"
+                    if error is None:
+                        async with llm_slots:
+                            summary = await engine.generate_summary(text, length)
+                        record = {
+                            "path": path,
+                            "summary": summary,
+                            "length": length,
+                            "chars": len(text),
+                            "elapsed_ms": round((time.monotonic() - started) * 1000),
+                        }
+                    else:
+                        current.set_attribute("error", error)
+                        record = {"path": path, "error": error}
+            except Exception as e:
+                record = {"path": path, "error": str(e)}
+            finally:
+                window.release()
+
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            if "error" not in record:
+                done_log.write(path + "\n")
+                done_log.flush()
+            progress.update(failed="error" in record)
+
+        tasks = []
+        for path in pending:
+            await window.acquire()
+            tasks.append(asyncio.create_task(process(path)))
+        await asyncio.gather(*tasks)
+
+    if pending:
+        print(file=sys.stderr)
+    return {"processed": progress.done, "failed": progress.failed, "skipped": progress.skipped}
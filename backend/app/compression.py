@@ -0,0 +1,161 @@
+"""Response compression: Brotli when available and accepted, gzip otherwise."""
+from typing import Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # Optional: without it, responses are gzip-compressed only
+    brotli = None
+
+# Media types that are already compressed, or are streams that must not be buffered
+EXCLUDED_CONTENT_TYPES = (
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "audio/*",
+    "font/woff",
+    "font/woff2",
+    "image/avif",
+    "image/gif",
+    "image/jpeg",
+    "image/png",
+    "image/webp",
+    "text/event-stream",
+    "video/*",
+)
+
+
+def _accepts(accept_encoding: str, coding: str) -> bool:
+    """Check whether an Accept-Encoding header allows a content coding (q=0 refuses it)."""
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        if name.strip().lower() == coding:
+            return params.replace(" ", "").lower() not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+def _excluded(content_type: str) -> bool:
+    """Check whether a Content-Type is one that is sent uncompressed."""
+    media_type = content_type.partition(";")[0].strip().lower()
+    return media_type in EXCLUDED_CONTENT_TYPES or f"{media_type.partition('/')[0]}/*" in EXCLUDED_CONTENT_TYPES
+
+
+class BrotliResponder:
+    """
+    ASGI send wrapper that Brotli-compresses one response, including streams.
+
+    The start message is held back until the first body chunk shows whether
+    the response is worth compressing: small single-chunk bodies,
+    already-encoded bodies, partial content and excluded media types pass
+    through unchanged.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.quality = quality
+        self.send: Optional[Send] = None
+        self.start: Optional[Message] = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or _excluded(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            if self.start is not None:
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(body) < self.minimum_size and not more_body:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = brotli.Compressor(quality=self.quality)
+            data = self._compress(body, more_body)
+            headers["Content-Encoding"] = "br"
+            if more_body:
+                if "content-length" in headers:
+                    del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(data))
+            await self.send(start)
+        else:
+            data = self._compress(body, more_body)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    def _compress(self, body: bytes, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        return data + (self.compressor.flush() if more_body else self.compressor.finish())
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress HTML, JSON and other text responses.
+
+    Uses Brotli for clients that accept ``br`` when the ``brotli`` package is
+    installed, and Starlette's gzip otherwise. Responses under
+    ``COMPRESSION_MINIMUM_SIZE`` bytes, already-encoded bodies and binary
+    media types are sent as is. A compressed response's ETag is made weak,
+    since its bytes differ from the identity encoding; conditional requests
+    use weak comparison, so revalidation still works.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESSION_MINIMUM_SIZE,
+        gzip_level: int = settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality: int = settings.COMPRESSION_BROTLI_QUALITY,
+    ):
+        super().__init__(app, minimum_size=minimum_size, compresslevel=gzip_level)
+        self.brotli_minimum_size = minimum_size
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_weak_etag(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                etag = headers.get("etag")
+                if etag and "content-encoding" in headers and not etag.startswith("W/"):
+                    headers["etag"] = f"W/{etag}"
+            await send(message)
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        if brotli is not None and _accepts(accept_encoding, "br"):
+            responder = BrotliResponder(self.app, self.brotli_minimum_size, self.brotli_quality)
+            await responder(scope, receive, send_with_weak_etag)
+        else:
+            await super().__call__(scope, receive, send_with_weak_etag)
@@ -21,29 +21,152 @@ class Settings(BaseSettings):
     AZURE_OPENAI_ENDPOINT: str = os.getenv("AZURE_OPENAI_ENDPOINT", "")
     AZURE_OPENAI_DEPLOYMENT_NAME: str = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME", "")
 
+    # Model routing. MODEL_ROUTES is a JSON list ordered from cheapest/fastest to largest, e.g.
+    # [{"name": "small", "deployment": "gpt-4o-mini", "max_input_tokens": 8000, "lengths": ["short", "medium"],
+    #   "input_cost_per_1k": 0.00015, "output_cost_per_1k": 0.0006},
+    #  {"name": "large", "deployment": "gpt-4o", "params": {"max_completion_tokens": 800}}]
+    # When empty, every call uses AZURE_OPENAI_DEPLOYMENT_NAME.
+    MODEL_ROUTES: list[dict] = []
+    MODEL_DEFAULT_INPUT_COST_PER_1K: float = 0.0
+    MODEL_DEFAULT_OUTPUT_COST_PER_1K: float = 0.0
+    MODEL_ROUTING_LATENCY_SLO_SECONDS: float = 20.0
+    MODEL_ROUTING_EWMA_ALPHA: float = 0.2
+    MODEL_ROUTING_RECOVERY_SECONDS: float = 60.0  # Probe a degraded route after this long without samples
+
+    # Hedged model calls (opt-in): duplicate slow calls to a backup route
+    HEDGING_ENABLED: bool = False
+    HEDGING_PERCENTILE: float = 0.95  # Hedge once the primary is slower than this share of recent calls
+    HEDGING_MIN_DELAY_SECONDS: float = 1.0
+    HEDGING_MIN_SAMPLES: int = 20
+    HEDGING_BUDGET_RATIO: float = 0.05  # At most this fraction of calls is hedged
+    HEDGING_ROUTE: str = ""  # Backup route name; defaults to the next eligible route
+
+    # Adaptive (AIMD) limit on concurrent upstream model calls
+    ADAPTIVE_CONCURRENCY_ENABLED: bool = True
+    ADAPTIVE_CONCURRENCY_INITIAL: int = 8
+    ADAPTIVE_CONCURRENCY_MIN: int = 1
+    ADAPTIVE_CONCURRENCY_MAX: int = 64
+    ADAPTIVE_CONCURRENCY_BACKOFF: float = 0.5  # Limit multiplier when the upstream throttles (429/503)
+    ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE: float = 2.0  # Calls slower than this times the average shrink the limit
+
     # Summary configuration
     SUMMARY_LENGTH_SHORT: int = 50
     SUMMARY_LENGTH_MEDIUM: int = 150
     SUMMARY_LENGTH_LONG: int = 300
 
+    # Summary cache
+    SUMMARY_CACHE_MAX_ENTRIES: int = 1024
+
+    # History export/import
+    HISTORY_EXPORT_BATCH_SIZE: int = 500  # Records encoded per streamed chunk
+    HISTORY_IMPORT_BATCH_SIZE: int = 1000  # Records stored per batch
+    HISTORY_IMPORT_MAX_LINE_BYTES: int = 1024 * 1024
+
+    # Summary retention, enforced by a background sweep (0 disables a limit)
+    RETENTION_ENABLED: bool = True
+    RETENTION_INTERVAL_SECONDS: float = 300.0
+    RETENTION_GUEST_MAX_COUNT: int = 10000  # Across all guests together; 0 means no limit
+    RETENTION_GUEST_MAX_AGE_HOURS: float = 24.0
+    RETENTION_USER_MAX_COUNT: int = 0  # Per registered user; 0 keeps the whole history
+    RETENTION_USER_MAX_AGE_HOURS: float = 0.0
+
+    # WebSocket summarization
+    WS_MAX_JOBS_PER_CONNECTION: int = 8
+
+    # UI pages and response compression
+    COMPRESSION_MINIMUM_SIZE: int = 500  # Smaller responses are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 5  # Used when the optional brotli package is installed
+
+    # Cross-worker shared cache tables (memory-mapped files, POSIX only)
+    SHARED_CACHE_ENABLED: bool = False
+    SHARED_CACHE_DIR: str = os.getenv("SHARED_CACHE_DIR", "cache/shared")
+    SHARED_SUMMARY_SLOTS: int = 16384
+    SHARED_SUMMARY_SLOT_BYTES: int = 4096
+    SHARED_EXTRACTION_SLOTS: int = 1024
+    SHARED_EXTRACTION_SLOT_BYTES: int = 65536
+
+    # Near-duplicate summary reuse (MinHash/LSH)
+    NEAR_DUPLICATE_ENABLED: bool = True
+    NEAR_DUPLICATE_THRESHOLD: float = 0.9  # Estimated Jaccard similarity of word shingles
+    NEAR_DUPLICATE_NUM_PERM: int = 64
+    NEAR_DUPLICATE_BANDS: int = 16
+    NEAR_DUPLICATE_SHINGLE_SIZE: int = 5
+    NEAR_DUPLICATE_MIN_WORDS: int = 50
+    NEAR_DUPLICATE_MAX_ENTRIES: int = 100000
+    NEAR_DUPLICATE_SHARED: bool = False  # Reuse across users, not only within one user's history
+
+    # Incremental (chunked) summarization
+    CHUNK_MIN_CHARS: int = 2000
+    CHUNK_MAX_CHARS: int = 8000
+    CHUNK_BOUNDARY_DIVISOR: int = 4
+    CHUNK_STORE_MAX_ENTRIES: int = 10000
+
+    # Text normalization before summarization
+    NORMALIZE_TEXT: bool = True
+    NORMALIZE_MIN_PAGES_FOR_HEADERS: int = 3
+    NORMALIZE_HEADER_PAGE_RATIO: float = 0.5
+    NORMALIZE_SHINGLE_SIZE: int = 5
+    NORMALIZE_DUPLICATE_THRESHOLD: float = 0.8
+    NORMALIZE_MIN_DUPLICATE_CHARS: int = 40
+
+    # Extractive pre-filter and fallback
+    EXTRACTIVE_TOKEN_BUDGET: int = 6000
+
     # File upload settings
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     ALLOWED_FORMATS: list = ["txt", "pdf", "docx", "url"]
+    SNIFF_PDF_PROBE_PAGES: int = 3  # Pages checked for a text layer before full extraction
+
+    # Extraction cache (shared by workers through the filesystem)
+    EXTRACTION_CACHE_ENABLED: bool = True
+    EXTRACTION_CACHE_DIR: str = os.getenv("EXTRACTION_CACHE_DIR", "cache/extraction")
+    EXTRACTION_CACHE_MAX_BYTES: int = 256 * 1024 * 1024  # 256MB compressed
+    EXTRACTION_CACHE_COMPRESSION_LEVEL: int = 6
 
     # Batch processing
     MAX_BATCH_SIZE: int = 10
 
+    # Admission control for summarization routes
+    ADMISSION_MAX_IN_FLIGHT: int = 32
+    ADMISSION_MAX_QUEUE: int = 64
+    ADMISSION_RETRY_AFTER_SECONDS: int = 5
+    ADMISSION_DISCONNECT_POLL_SECONDS: float = 0.5
+    ADMISSION_READY_THRESHOLD: float = 0.8
+
+    # Request deadlines (overridable per request with X-Request-Timeout)
+    REQUEST_TIMEOUT_SECONDS: float = 120.0
+    REQUEST_TIMEOUT_MAX_SECONDS: float = 600.0
+    REQUEST_DISCONNECT_POLL_SECONDS: float = 0.5
+
+    # Fair scheduling of upstream LLM capacity
+    SCHEDULER_MAX_CONCURRENCY: int = 16  # Used only when adaptive concurrency is disabled
+    SCHEDULER_USER_TOKENS_PER_MINUTE: int = 200000  # 0 disables the quota
+    SCHEDULER_GUEST_TOKENS_PER_MINUTE: int = 200000  # Shared by all guests; 0 disables the quota
+    SCHEDULER_GUEST_WEIGHT: float = 0.5
+
     # JWT settings
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
     JWT_ALGORITHM: str = "HS256"
     JWT_EXPIRATION_HOURS: int = 24
 
+    # Admin users (comma-separated user IDs), allowed to profile requests
+    ADMIN_USERS: str = os.getenv("ADMIN_USERS", "")
+
+    # Per-request profiling
+    PROFILE_SAMPLE_INTERVAL_SECONDS: float = 0.005
+    PROFILE_STORE_MAX_ENTRIES: int = 50
+
     # Database settings (if needed in future)
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./summarizer.db")
 
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
+    # Tracing: comma-separated exporters ("console", "file"); empty disables export
+    TRACING_EXPORTERS: str = os.getenv("TRACING_EXPORTERS", "")
+    TRACING_FILE: str = os.getenv("TRACING_FILE", "logs/traces.jsonl")
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,125 @@
+"""Per-request deadlines and cancellation when the client disconnects."""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import HTTPException, Request, status
+
+from .admission import CLIENT_CLOSED_REQUEST
+from .config import settings
+from .logger import logger
+from .metrics import metrics
+
+TIMEOUT_HEADER = "X-Request-Timeout"
+
+
+class RequestScope:
+    """Deadline and progress of the request being handled."""
+
+    __slots__ = ("deadline", "input_tokens", "upstream_started")
+
+    def __init__(self, deadline: float):
+        self.deadline = deadline
+        self.input_tokens = 0
+        self.upstream_started = False
+
+
+_scope: ContextVar[Optional[RequestScope]] = ContextVar("request_scope", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None outside a request."""
+    scope = _scope.get()
+    if scope is None:
+        return None
+    return max(0.0, scope.deadline - time.monotonic())
+
+
+def timeout_for(default: float) -> float:
+    """Return ``default`` capped by the time left before the deadline."""
+    left = remaining()
+    return default if left is None else max(0.001, min(default, left))
+
+
+def note_input_tokens(tokens: int) -> None:
+    """Record how many input tokens the current request will send upstream."""
+    scope = _scope.get()
+    if scope is not None:
+        scope.input_tokens = tokens
+
+
+def mark_upstream_started() -> None:
+    """Record that the current request has started a paid upstream call."""
+    scope = _scope.get()
+    if scope is not None:
+        scope.upstream_started = True
+
+
+def _parse_timeout(request: Request) -> float:
+    value = request.headers.get(TIMEOUT_HEADER)
+    if value is None:
+        return settings.REQUEST_TIMEOUT_SECONDS
+    try:
+        timeout = float(value)
+    except ValueError:
+        timeout = -1.0
+    if timeout <= 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"error": {"message": f"Invalid {TIMEOUT_HEADER} header", "code": "VALIDATION_ERROR"}},
+        )
+    return min(timeout, settings.REQUEST_TIMEOUT_MAX_SECONDS)
+
+
+async def _watch(request: Request, task: asyncio.Task, scope: RequestScope, reason: list) -> None:
+    """Cancel ``task`` when the client disconnects or the deadline passes."""
+    while True:
+        left = scope.deadline - time.monotonic()
+        if left <= 0:
+            reason.append("deadline")
+            task.cancel()
+            return
+        await asyncio.sleep(min(settings.REQUEST_DISCONNECT_POLL_SECONDS, left))
+        if await request.is_disconnected():
+            reason.append("disconnect")
+            task.cancel()
+            return
+
+
+async def request_deadline(request: Request):
+    """
+    FastAPI dependency giving the request a deadline and disconnect cancellation.
+
+    The deadline comes from the ``X-Request-Timeout`` header (seconds) or
+    ``REQUEST_TIMEOUT_SECONDS``. When it passes, or the client goes away,
+    the handler is cancelled: in-flight extraction and model calls are
+    abandoned, and scheduler and admission slots are released. The result is
+    never stored.
+    """
+    scope = RequestScope(time.monotonic() + _parse_timeout(request))
+    token = _scope.set(scope)
+    reason: list[str] = []
+    watcher = asyncio.create_task(_watch(request, asyncio.current_task(), scope, reason))
+    try:
+        yield scope
+    except asyncio.CancelledError:
+        if not reason:
+            raise
+        asyncio.current_task().uncancel()
+        saved = 0 if scope.upstream_started else scope.input_tokens
+        metrics.inc("requests_cancelled_total")
+        metrics.inc(f"requests_cancelled_{reason[0]}_total")
+        metrics.inc("cancelled_tokens_saved_total", saved)
+        logger.info(f"Request cancelled ({reason[0]}); ~{saved} upstream tokens saved")
+        if reason[0] == "deadline":
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail={"error": {"message": "Request deadline exceeded", "code": "DEADLINE_EXCEEDED"}},
+            )
+        raise HTTPException(
+            status_code=CLIENT_CLOSED_REQUEST,
+            detail={"error": {"message": "Client closed request", "code": "CLIENT_CLOSED"}},
+        )
+    finally:
+        watcher.cancel()
+        _scope.reset(token)
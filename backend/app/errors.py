@@ -47,6 +47,13 @@ class SummarizationError(SummarizerException):
         super().__init__(message, "SUMMARIZATION_ERROR", status_code)
 
 
+class QuotaExceededError(SummarizerException):
+    """Raised when a user exceeds their upstream token quota."""
+
+    def __init__(self, message: str, status_code: int = 429):
+        super().__init__(message, "QUOTA_EXCEEDED", status_code)
+
+
 class AuthenticationError(SummarizerException):
     """Raised when authentication fails."""
 
@@ -9,17 +9,20 @@ def setup_logger():
     # Remove default handler
     logger.remove()
 
+    # Request ID is filled in by the tracing middleware; "-" outside a request
+    logger.configure(extra={"request_id": "-"})
+
     # Add new handler with custom format
     logger.add(
         sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | {extra[request_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
         level=settings.LOG_LEVEL,
     )
 
     # Add file handler for logs
     logger.add(
         "logs/summarizer.log",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {extra[request_id]} | {name}:{function}:{line} - {message}",
         level=settings.LOG_LEVEL,
         rotation="500 MB",
         retention="7 days",
@@ -9,7 +9,11 @@ from .config import settings
 from .logger import logger
 from . import api
 from . import ui
+from . import ws
+from .compression import CompressionMiddleware
 from .errors import SummarizerException
+from .retention import retention
+from .tracing import RequestTracingMiddleware, tracer
 
 # Ensure logs directory exists
 os.makedirs("logs", exist_ok=True)
@@ -19,8 +23,12 @@ os.makedirs("logs", exist_ok=True)
 async def lifespan(app: FastAPI):
     """Application lifecycle manager."""
     logger.info(f"Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    ui.page_cache.warm(ui.PAGES)
+    retention.start()
     yield
     logger.info("Shutting down application")
+    await retention.stop()
+    tracer.shutdown()
 
 
 # Create FastAPI app
@@ -40,9 +48,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress HTML and JSON responses (Brotli if installed, gzip otherwise)
+app.add_middleware(CompressionMiddleware)
+
+# Request IDs and root spans (added last so it wraps every other middleware)
+app.add_middleware(RequestTracingMiddleware)
+
 # Include routers
 app.include_router(api.router)
 app.include_router(ui.router)
+app.include_router(ws.router)
 
 
 @app.exception_handler(SummarizerException)
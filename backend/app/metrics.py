@@ -0,0 +1,47 @@
+"""Lightweight in-process metrics registry."""
+from collections import defaultdict
+from threading import Lock
+from typing import Union
+
+Number = Union[int, float]
+
+
+class Metrics:
+    """Thread-safe counters and gauges exposed through ``/api/metrics``."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._counters: dict[str, Number] = defaultdict(int)
+        self._gauges: dict[str, Number] = {}
+
+    def inc(self, name: str, value: Number = 1) -> None:
+        """Increase a counter."""
+        with self._lock:
+            self._counters[name] += value
+
+    def set_gauge(self, name: str, value: Number) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def get(self, name: str) -> Number:
+        """Return the current value of a counter or gauge (0 if unset)."""
+        with self._lock:
+            if name in self._gauges:
+                return self._gauges[name]
+            return self._counters.get(name, 0)
+
+    def snapshot(self) -> dict:
+        """Return a copy of all counters and gauges."""
+        with self._lock:
+            return {"counters": dict(self._counters), "gauges": dict(self._gauges)}
+
+    def reset(self) -> None:
+        """Clear every metric."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+# Global instance
+metrics = Metrics()
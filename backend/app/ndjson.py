@@ -0,0 +1,91 @@
+"""Streaming NDJSON encoding and decoding, optionally gzip-compressed."""
+import json
+import zlib
+from typing import AsyncIterator, Iterable, Iterator
+
+from .errors import ValidationError
+
+# Decompressed bytes produced per step, so a small compressed body cannot expand all at once
+_INFLATE_STEP = 1 << 20
+
+
+def encode_ndjson(records: Iterable[dict], batch_size: int = 500, compress: bool = False) -> Iterator[bytes]:
+    """
+    Encode records as NDJSON chunks of ``batch_size`` lines.
+
+    Args:
+        records: Records to encode, consumed lazily
+        batch_size: Lines per yielded chunk
+        compress: Emit a single gzip stream instead of plain text
+
+    Yields:
+        Encoded (and possibly compressed) chunks
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS) if compress else None
+    lines: list[str] = []
+
+    def flush() -> bytes:
+        chunk = ("\n".join(lines) + "\n").encode("utf-8")
+        lines.clear()
+        return compressor.compress(chunk) if compressor else chunk
+
+    for record in records:
+        lines.append(json.dumps(record, ensure_ascii=False, default=str))
+        if len(lines) >= batch_size:
+            chunk = flush()
+            if chunk:
+                yield chunk
+    if lines:
+        chunk = flush()
+        if chunk:
+            yield chunk
+    if compressor:
+        yield compressor.flush()
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterator[bytes], compressed: bool = False, max_line_bytes: int = 1 << 20
+) -> AsyncIterator[tuple[int, bytes]]:
+    """
+    Split a streamed body into NDJSON lines without holding more than one line.
+
+    Args:
+        chunks: Body chunks, e.g. ``request.stream()``
+        compressed: The body is gzip (or zlib) compressed
+        max_line_bytes: Longest accepted line
+
+    Yields:
+        (line number, line bytes) for every non-blank line
+
+    Raises:
+        ValidationError: If a line is too long or the compressed data is corrupt
+    """
+    # wbits 32 + MAX_WBITS accepts both gzip and zlib headers
+    decompressor = zlib.decompressobj(32 + zlib.MAX_WBITS) if compressed else None
+    buffer = b""
+    number = 0
+
+    async for chunk in chunks:
+        pending = chunk
+        while pending:
+            if decompressor is not None:
+                try:
+                    data = decompressor.decompress(pending, _INFLATE_STEP)
+                except zlib.error as e:
+                    raise ValidationError(f"Invalid compressed data: {str(e)}")
+                pending = decompressor.unconsumed_tail
+            else:
+                data, pending = pending, b""
+            buffer += data
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                number += 1
+                if len(line) > max_line_bytes:
+                    raise ValidationError(f"Line {number} is longer than {max_line_bytes} bytes")
+                if line.strip():
+                    yield number, line
+            if len(buffer) > max_line_bytes:
+                raise ValidationError(f"Line {number + 1} is longer than {max_line_bytes} bytes")
+
+    if buffer.strip():
+        yield number + 1, buffer
@@ -0,0 +1,96 @@
+"""Rendered UI page cache with ETags and conditional responses."""
+import hashlib
+from typing import NamedTuple, Optional
+
+from fastapi import Request
+from fastapi.responses import HTMLResponse, Response
+from jinja2 import Environment, meta
+
+from .logger import logger
+
+
+class RenderedPage(NamedTuple):
+    """Encoded page body and its strong ETag."""
+
+    body: bytes
+    etag: str
+
+
+def make_etag(body: bytes) -> str:
+    """Build a strong ETag from the body's content hash."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag using weak comparison, as RFC 9110 requires."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+class PageCache:
+    """
+    Cache of rendered Jinja templates.
+
+    The UI templates reference no variables (pages fetch their data from
+    the API), so each renders the same for everyone. It is rendered once
+    (``warm`` at startup) and served from memory.
+    """
+
+    def __init__(self, env: Environment):
+        """Initialize an empty cache over the templates in ``env``."""
+        self.env = env
+        self._static: dict[str, RenderedPage] = {}
+        self._dynamic: dict[str, bool] = {}
+
+    def is_static(self, name: str) -> bool:
+        """Return True if the template uses no context variables."""
+        if name not in self._dynamic:
+            source = self.env.loader.get_source(self.env, name)[0]
+            self._dynamic[name] = bool(meta.find_undeclared_variables(self.env.parse(source)))
+        return not self._dynamic[name]
+
+    def _render(self, name: str) -> RenderedPage:
+        body = self.env.get_template(name).render().encode("utf-8")
+        return RenderedPage(body, make_etag(body))
+
+    def warm(self, names: list[str]) -> None:
+        """Render the static templates among ``names`` ahead of the first request."""
+        for name in names:
+            try:
+                if self.is_static(name):
+                    self._static[name] = self._render(name)
+            except Exception as e:
+                logger.error(f"Failed to pre-render {name}: {str(e)}")
+        logger.info(f"Pre-rendered {len(self._static)} static pages")
+
+    def page(self, name: str) -> RenderedPage:
+        """Return a static page, rendering it on first use if it was not warmed."""
+        page = self._static.get(name)
+        if page is None:
+            page = self._static[name] = self._render(name)
+        return page
+
+    def clear(self) -> None:
+        """Drop all cached pages."""
+        self._static.clear()
+        self._dynamic.clear()
+
+
+def page_response(request: Request, page: RenderedPage) -> Response:
+    """
+    Serve a rendered page, or ``304 Not Modified`` if the client already has it.
+
+    Pages are sent with ``Cache-Control: no-cache``, so browsers keep a copy
+    but revalidate it with ``If-None-Match`` on every visit.
+    """
+    headers = {
+        "ETag": page.etag,
+        "Cache-Control": "no-cache",
+    }
+    if etag_matches(request.headers.get("if-none-match"), page.etag):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=page.body, headers=headers)
@@ -0,0 +1,204 @@
+"""Opt-in per-request profiling: stage timings plus a sampling profiler."""
+import asyncio
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from .auth import is_admin, verify_token
+from .config import settings
+from .logger import logger
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+class RequestProfile:
+    """Stage timings and sampled stacks collected for one request."""
+
+    def __init__(self, path: str, user_id: str):
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.user_id = user_id
+        self.created_at = datetime.utcnow().isoformat()
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.stages: list[dict] = []
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        # Threads whose stacks belong to this request (event loop plus offloaded work)
+        self.threads: set[int] = {threading.get_ident()}
+
+    def folded(self) -> str:
+        """Return sampled stacks in folded format for flame graph tools."""
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def to_dict(self, include_samples: bool = True) -> dict:
+        data = {
+            "id": self.id,
+            "path": self.path,
+            "user_id": self.user_id,
+            "created_at": self.created_at,
+            "duration_ms": self.duration_ms,
+            "stages": self.stages,
+            "sample_count": self.sample_count,
+        }
+        if include_samples:
+            data["top_stacks"] = [
+                {"stack": stack, "samples": count} for stack, count in self.samples.most_common(50)
+            ]
+        return data
+
+
+_active: ContextVar[Optional[RequestProfile]] = ContextVar("active_profile", default=None)
+
+
+class _NullStage:
+    """Shared no-op context manager used when no profile is active."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name: str):
+    """
+    Time a pipeline stage of the current request.
+
+    Returns a shared no-op context manager unless the request is being
+    profiled, so unprofiled requests only pay for a context variable lookup.
+    """
+    profile = _active.get()
+    if profile is None:
+        return _NULL_STAGE
+    return _record_stage(profile, name)
+
+
+@contextmanager
+def _record_stage(profile: RequestProfile, name: str):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        profile.stages.append({
+            "stage": name,
+            "start_ms": round((start - profile.started) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+        })
+
+
+async def to_thread(func, *args, **kwargs):
+    """``asyncio.to_thread`` that lets the sampler follow work into the worker thread."""
+    profile = _active.get()
+    if profile is None:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    def run():
+        ident = threading.get_ident()
+        profile.threads.add(ident)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.threads.discard(ident)
+
+    return await asyncio.to_thread(run)
+
+
+class _Sampler(threading.Thread):
+    """Background thread that periodically samples the profiled threads' stacks."""
+
+    def __init__(self, profile: RequestProfile, interval: float):
+        super().__init__(name=f"profiler-{profile.id[:8]}", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        own = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in list(self.profile.threads):
+                frame = frames.get(ident)
+                if frame is None or ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.profile.samples[";".join(reversed(stack))] += 1
+                self.profile.sample_count += 1
+
+
+class ProfileStore:
+    """Bounded store of completed request profiles."""
+
+    def __init__(self, max_entries: int = settings.PROFILE_STORE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._profiles: OrderedDict[str, RequestProfile] = OrderedDict()
+
+    def add(self, profile: RequestProfile) -> None:
+        self._profiles[profile.id] = profile
+        while len(self._profiles) > self.max_entries:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[RequestProfile]:
+        return self._profiles.get(profile_id)
+
+    def list(self) -> list[RequestProfile]:
+        return list(reversed(self._profiles.values()))
+
+
+# Global instance
+profile_store = ProfileStore()
+
+
+def _profiling_requested(request: Request) -> bool:
+    flag = request.headers.get(PROFILE_HEADER) or request.query_params.get("profile")
+    return flag is not None and flag.lower() in ("1", "true", "yes")
+
+
+async def profile_request(request: Request, response: Response, user_id: str = Depends(verify_token)):
+    """
+    FastAPI dependency that profiles the request when an admin asks for it.
+
+    Profiling is requested with an ``X-Profile: 1`` header or ``?profile=1``.
+    The profile ID is returned in the ``X-Profile-Id`` response header, and
+    the profile can be downloaded from ``/api/admin/profiles/{id}``.
+    """
+    if not _profiling_requested(request):
+        yield None
+        return
+
+    if not is_admin(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"error": {"message": "Profiling requires admin access", "code": "FORBIDDEN"}},
+        )
+
+    profile = RequestProfile(request.url.path, user_id)
+    token = _active.set(profile)
+    sampler = _Sampler(profile, settings.PROFILE_SAMPLE_INTERVAL_SECONDS)
+    sampler.start()
+    response.headers[PROFILE_ID_HEADER] = profile.id
+    try:
+        yield profile
+    finally:
+        sampler.stopped.set()
+        sampler.join()
+        profile.duration_ms = round((time.perf_counter() - profile.started) * 1000, 3)
+        _active.reset(token)
+        profile_store.add(profile)
+        logger.info(f"Stored profile {profile.id} for {profile.path} ({profile.duration_ms} ms)")
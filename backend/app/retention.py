@@ -0,0 +1,182 @@
+"""Retention policies for stored summaries, enforced by a background sweep."""
+import asyncio
+import time
+from datetime import datetime
+from typing import Iterator, NamedTuple, Optional
+
+from .api import summaries_db, users_db
+from .config import settings
+from .logger import logger
+from .metrics import metrics
+from .store import SummaryRecord, SummaryStore, UserIndexes, to_timestamp
+
+
+class RetentionPolicy(NamedTuple):
+    """How many summaries a user keeps, and for how long; 0 means no limit."""
+
+    max_count: int = 0
+    max_age_hours: float = 0
+
+
+class RetentionManager:
+    """
+    Periodically evicts summaries that fall outside their owner's policy.
+
+    Registered users each have their own policy. Guests get a new ID on
+    every request, so the guest policy applies to all guests as one group:
+    its count limit caps the guest summaries kept in total. Sweeps evict
+    batch by batch and yield to the event loop in between. The store is
+    compacted, returning the memory of deleted entries, only once enough
+    has been evicted to make copying it worthwhile.
+    """
+
+    def __init__(
+        self,
+        store: SummaryStore,
+        indexes: UserIndexes,
+        guest_policy: Optional[RetentionPolicy] = None,
+        user_policy: Optional[RetentionPolicy] = None,
+        interval: float = settings.RETENTION_INTERVAL_SECONDS,
+        batch_size: int = 500,
+    ):
+        """Initialize the manager over a summary store and its per-user indexes."""
+        self.store = store
+        self.indexes = indexes
+        self.guest_policy = guest_policy or RetentionPolicy(
+            settings.RETENTION_GUEST_MAX_COUNT, settings.RETENTION_GUEST_MAX_AGE_HOURS
+        )
+        self.user_policy = user_policy or RetentionPolicy(
+            settings.RETENTION_USER_MAX_COUNT, settings.RETENTION_USER_MAX_AGE_HOURS
+        )
+        self.interval = interval
+        self.batch_size = batch_size
+        self._evicted_since_compact = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def policy_for(self, user_id: str) -> RetentionPolicy:
+        return self.guest_policy if user_id.startswith("guest_") else self.user_policy
+
+    @staticmethod
+    def _keep(records: list[SummaryRecord], policy: RetentionPolicy, now_ts: int) -> list[SummaryRecord]:
+        """Return the records a policy keeps; the oldest go first when over the count limit."""
+        keep = records
+        if policy.max_age_hours > 0:
+            cutoff = now_ts - int(policy.max_age_hours * 3600 * 1_000_000)
+            keep = [record for record in keep if record.created_at >= cutoff]
+        if policy.max_count > 0 and len(keep) > policy.max_count:
+            keep = sorted(keep, key=lambda record: record.created_at)[-policy.max_count:]
+        return keep
+
+    def _sweep_group(self, user_ids: list[str], policy: RetentionPolicy, now_ts: int, totals: dict) -> list[str]:
+        """Apply one policy to the users' summaries taken together; returns the IDs to evict."""
+        records = {}
+        for user_id in user_ids:
+            index = self.indexes.get(user_id)
+            if index is not None:
+                records[user_id] = [record for record in map(self.store.get, index) if record is not None]
+        kept = {record.packed_id for record in self._keep([r for rs in records.values() for r in rs], policy, now_ts)}
+
+        evicted_ids: list[str] = []
+        for user_id, user_records in records.items():
+            keep = [record for record in user_records if record.packed_id in kept]
+            if len(keep) == len(self.indexes[user_id]):
+                continue
+            evicted_ids.extend(record.id for record in user_records if record.packed_id not in kept)
+            if keep:
+                # A fresh index also drops IDs of summaries deleted elsewhere
+                self.indexes[user_id] = [record.id for record in keep]
+            else:
+                del self.indexes[user_id]
+                totals["users_removed"] += 1
+        return evicted_ids
+
+    def _delete(self, evicted_ids: list[str], totals: dict) -> None:
+        removed = self.store.delete_many(evicted_ids)
+        totals["evicted"] += len(removed)
+        self._evicted_since_compact += len(removed)
+
+    def _steps(self, now: Optional[datetime], totals: dict) -> Iterator[None]:
+        """Evict in batches, yielding between them so callers can let other work run."""
+        now_ts = to_timestamp(now)
+        user_ids = list(self.indexes)
+        guests = [user_id for user_id in user_ids if user_id.startswith("guest_")]
+        users = [user_id for user_id in user_ids if not user_id.startswith("guest_")]
+
+        self._delete(self._sweep_group(guests, self.guest_policy, now_ts, totals), totals)
+        yield
+        for start in range(0, len(users), self.batch_size):
+            evicted_ids: list[str] = []
+            for user_id in users[start:start + self.batch_size]:
+                evicted_ids.extend(self._sweep_group([user_id], self.user_policy, now_ts, totals))
+            self._delete(evicted_ids, totals)
+            yield
+
+        # Dicts never shrink; copying is O(size), so only do it once a good share was deleted
+        if self._evicted_since_compact and self._evicted_since_compact >= len(self.store) // 2:
+            self.store.compact()
+            self._evicted_since_compact = 0
+
+    def _finish(self, totals: dict, started: float) -> dict:
+        duration = time.perf_counter() - started
+        metrics.inc("retention_evicted_total", totals["evicted"])
+        metrics.set_gauge("summaries_stored", len(self.store))
+        metrics.set_gauge("retention_last_sweep_seconds", round(duration, 4))
+        if totals["evicted"]:
+            logger.info(
+                f"Retention evicted {totals['evicted']} summaries and {totals['users_removed']} users in {duration:.3f}s"
+            )
+        return {**totals, "seconds": round(duration, 4)}
+
+    def sweep(self, now: Optional[datetime] = None) -> dict:
+        """
+        Evict every summary outside its owner's policy in one go.
+
+        Args:
+            now: Reference time for age limits (defaults to the current UTC time)
+
+        Returns:
+            Counts of evicted summaries and removed users, and the sweep duration
+        """
+        started = time.perf_counter()
+        totals = {"evicted": 0, "users_removed": 0}
+        for _ in self._steps(now, totals):
+            pass
+        return self._finish(totals, started)
+
+    async def sweep_async(self, now: Optional[datetime] = None) -> dict:
+        """Like ``sweep``, but yield to the event loop after every batch of users."""
+        started = time.perf_counter()
+        totals = {"evicted": 0, "users_removed": 0}
+        for _ in self._steps(now, totals):
+            await asyncio.sleep(0)
+        return self._finish(totals, started)
+
+    async def run(self) -> None:
+        """Sweep every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.sweep_async()
+            except Exception as e:
+                logger.error(f"Retention sweep failed: {str(e)}")
+
+    def start(self) -> None:
+        """Start the background sweep if retention is enabled."""
+        if settings.RETENTION_ENABLED and self._task is None:
+            self._task = asyncio.create_task(self.run())
+            logger.info(f"Retention sweep scheduled every {self.interval:.0f}s")
+
+    async def stop(self) -> None:
+        """Stop the background sweep."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# Global instance
+retention = RetentionManager(summaries_db, users_db)
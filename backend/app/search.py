@@ -0,0 +1,131 @@
+"""In-process full-text search over summary history."""
+import heapq
+import math
+import re
+import sys
+from collections import defaultdict
+from typing import Optional
+from .store import PackedId, SummaryRecord, unpack_id
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Record fields that are searchable
+SEARCH_FIELDS = ("summary", "filename", "source_url")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase alphanumeric search terms."""
+    return [sys.intern(term) for term in _TOKEN_RE.findall(text.lower())]
+
+
+class _UserPostings:
+    """Inverted index over one user's summaries."""
+
+    __slots__ = ("postings", "doc_terms", "doc_lengths", "total_length")
+
+    def __init__(self):
+        self.postings: dict[str, dict[PackedId, int]] = defaultdict(dict)
+        self.doc_terms: dict[PackedId, tuple[str, ...]] = {}
+        self.doc_lengths: dict[PackedId, int] = {}
+        self.total_length = 0
+
+
+class SearchIndex:
+    """
+    Per-user inverted index with BM25 ranking.
+
+    Keeps itself up to date by subscribing to a SummaryStore, so summaries
+    are indexed when created and dropped when deleted.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """Initialize an empty index with the given BM25 parameters."""
+        self.k1 = k1
+        self.b = b
+        self._users: dict[str, _UserPostings] = {}
+
+    def on_store_event(self, event: str, record: Optional[SummaryRecord]) -> None:
+        """SummaryStore listener that keeps the index in sync."""
+        if event == "add":
+            self.add(record)
+        elif event == "delete":
+            self.remove(record)
+        elif event == "clear":
+            self.clear()
+
+    def add(self, record: SummaryRecord) -> None:
+        """Index a summary record under its owner."""
+        if record.user_id is None:
+            return
+        terms: dict[str, int] = defaultdict(int)
+        for field in SEARCH_FIELDS:
+            value = record.get(field)
+            if isinstance(value, str):
+                for term in tokenize(value):
+                    terms[term] += 1
+        if not terms:
+            return
+
+        self.remove(record)
+        index = self._users.setdefault(record.user_id, _UserPostings())
+        index.doc_terms[record.packed_id] = tuple(terms)
+        index.doc_lengths[record.packed_id] = sum(terms.values())
+        index.total_length += index.doc_lengths[record.packed_id]
+        for term, frequency in terms.items():
+            index.postings[term][record.packed_id] = frequency
+
+    def remove(self, record: SummaryRecord) -> None:
+        """Drop a summary record from the index."""
+        index = self._users.get(record.user_id)
+        if index is None:
+            return
+        terms = index.doc_terms.pop(record.packed_id, None)
+        if terms is None:
+            return
+        index.total_length -= index.doc_lengths.pop(record.packed_id)
+        for term in terms:
+            postings = index.postings[term]
+            postings.pop(record.packed_id, None)
+            if not postings:
+                del index.postings[term]
+        if not index.doc_terms:
+            del self._users[record.user_id]
+
+    def clear(self) -> None:
+        """Remove everything from the index."""
+        self._users.clear()
+
+    def search(
+        self, user_id: str, query: str, limit: int = 20, offset: int = 0
+    ) -> tuple[list[tuple[str, float]], int]:
+        """
+        Rank a user's summaries against a query with BM25.
+
+        Args:
+            user_id: Owner whose summaries are searched
+            query: Free-text query
+            limit: Maximum number of results to return
+            offset: Number of ranked results to skip
+
+        Returns:
+            Tuple of (summary ID, score) pairs for the requested page and
+            the total number of matching summaries
+        """
+        index = self._users.get(user_id)
+        if index is None:
+            return [], 0
+
+        count = len(index.doc_terms)
+        average_length = index.total_length / count
+        scores: dict[PackedId, float] = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = index.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc, frequency in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * index.doc_lengths[doc] / average_length)
+                scores[doc] += idf * frequency * (self.k1 + 1) / (frequency + norm)
+
+        top = heapq.nlargest(offset + limit, scores.items(), key=lambda item: item[1])
+        return [(unpack_id(doc), score) for doc, score in top[offset:]], len(scores)
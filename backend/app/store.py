@@ -0,0 +1,258 @@
+"""Compact in-memory storage for summary records and per-user history."""
+import sys
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+_EPOCH = datetime(1970, 1, 1)
+
+# Fields held in dedicated slots; anything else goes to the record's extras
+_CORE_FIELDS = ("id", "text", "summary", "length", "created_at", "user_id")
+
+PackedId = Union[bytes, str]
+
+
+def pack_id(summary_id: str) -> PackedId:
+    """Return the 16-byte binary form of a UUID string, or the string itself."""
+    try:
+        parsed = uuid.UUID(summary_id)
+    except (ValueError, TypeError, AttributeError):
+        return summary_id
+    # Only canonical strings round-trip, so other spellings stay as-is
+    return parsed.bytes if str(parsed) == summary_id else summary_id
+
+
+def unpack_id(packed: PackedId) -> str:
+    """Return the string form of a packed summary ID."""
+    return str(uuid.UUID(bytes=packed)) if isinstance(packed, bytes) else packed
+
+
+def to_timestamp(value: Union[str, datetime, int, None]) -> int:
+    """Convert an ISO string or naive UTC datetime to integer microseconds since the epoch."""
+    if value is None:
+        value = datetime.utcnow()
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.replace(tzinfo=None) - value.utcoffset()
+    delta = value - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def from_timestamp(value: int) -> str:
+    """Convert integer microseconds since the epoch to a naive UTC ISO string."""
+    return (_EPOCH + timedelta(microseconds=value)).isoformat()
+
+
+class SummaryRecord:
+    """
+    A stored summary.
+
+    Uses ``__slots__``, a binary ID, an integer timestamp and zlib-compressed
+    source text. The text is only decompressed when it is read. Supports
+    read-only mapping access (``record["summary"]``, ``record.get(...)``)
+    for code written against plain dict records.
+    """
+
+    __slots__ = ("packed_id", "user_id", "summary", "length", "created_at", "_text", "extra")
+
+    def __init__(
+        self,
+        summary_id: str,
+        summary: str,
+        length: str,
+        user_id: Optional[str] = None,
+        created_at: Union[str, datetime, int, None] = None,
+        text: Optional[str] = None,
+        extra: Optional[dict] = None,
+    ):
+        """Build a record, compressing the text and interning repeated strings."""
+        self.packed_id = pack_id(summary_id)
+        self.user_id = sys.intern(user_id) if user_id else None
+        self.summary = summary
+        self.length = sys.intern(length)
+        self.created_at = to_timestamp(created_at)
+        self._text = zlib.compress(text.encode("utf-8")) if text is not None else None
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SummaryRecord":
+        """Build a record from the dict form used by the API."""
+        extra = {key: value for key, value in data.items() if key not in _CORE_FIELDS}
+        return cls(
+            summary_id=data["id"],
+            summary=data["summary"],
+            length=data["length"],
+            user_id=data.get("user_id"),
+            created_at=data.get("created_at"),
+            text=data.get("text"),
+            extra=extra,
+        )
+
+    @property
+    def id(self) -> str:
+        return unpack_id(self.packed_id)
+
+    @property
+    def text(self) -> Optional[str]:
+        """Decompress and return the stored source text."""
+        return zlib.decompress(self._text).decode("utf-8") if self._text is not None else None
+
+    def to_dict(self, include_text: bool = True) -> dict:
+        """Return the API dict form, decompressing the text only if requested."""
+        data = {
+            "id": self.id,
+            "summary": self.summary,
+            "length": self.length,
+            "created_at": from_timestamp(self.created_at),
+        }
+        if self.user_id is not None:
+            data["user_id"] = self.user_id
+        if include_text and self._text is not None:
+            data["text"] = self.text
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "created_at":
+            return from_timestamp(self.created_at)
+        if key in _CORE_FIELDS:
+            value = getattr(self, key)
+            if value is None:
+                raise KeyError(key)
+            return value
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+
+class SummaryStore:
+    """
+    Mapping of summary ID to SummaryRecord, keyed internally by binary ID.
+
+    Listeners registered with ``subscribe`` are called as
+    ``listener(event, record)`` with event "add" or "delete", and as
+    ``listener("clear", None)`` when the store is emptied.
+    """
+
+    def __init__(self):
+        self._records: dict[PackedId, SummaryRecord] = {}
+        self._listeners: list[Callable[[str, Optional[SummaryRecord]], None]] = []
+
+    def subscribe(self, listener: Callable[[str, Optional[SummaryRecord]], None]) -> None:
+        """Register a callback for store changes."""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[str, Optional[SummaryRecord]], None]) -> None:
+        """Remove a callback registered with ``subscribe``."""
+        self._listeners.remove(listener)
+
+    def _notify(self, event: str, record: Optional[SummaryRecord]) -> None:
+        for listener in self._listeners:
+            listener(event, record)
+
+    def __setitem__(self, summary_id: str, record: Union[dict, SummaryRecord]) -> None:
+        if isinstance(record, dict):
+            record = SummaryRecord.from_dict({**record, "id": summary_id})
+        packed = pack_id(summary_id)
+        previous = self._records.get(packed)
+        if previous is not None:
+            self._notify("delete", previous)
+        self._records[packed] = record
+        self._notify("add", record)
+
+    def __getitem__(self, summary_id: str) -> SummaryRecord:
+        return self._records[pack_id(summary_id)]
+
+    def __delitem__(self, summary_id: str) -> None:
+        record = self._records.pop(pack_id(summary_id))
+        self._notify("delete", record)
+
+    def __contains__(self, summary_id: object) -> bool:
+        return isinstance(summary_id, str) and pack_id(summary_id) in self._records
+
+    def __iter__(self) -> Iterator[str]:
+        return (unpack_id(packed) for packed in self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, summary_id: str, default: Optional[SummaryRecord] = None) -> Optional[SummaryRecord]:
+        return self._records.get(pack_id(summary_id), default)
+
+    def values(self) -> Iterable[SummaryRecord]:
+        return self._records.values()
+
+    def delete_many(self, summary_ids: Iterable[str]) -> list[SummaryRecord]:
+        """Remove several summaries at once, skipping unknown IDs; returns the removed records."""
+        removed = []
+        for summary_id in summary_ids:
+            record = self._records.pop(pack_id(summary_id), None)
+            if record is not None:
+                removed.append(record)
+        for record in removed:
+            self._notify("delete", record)
+        return removed
+
+    def compact(self) -> None:
+        """Rebuild the record table so the memory of deleted entries is released (dicts never shrink)."""
+        self._records = dict(self._records)
+
+    def clear(self) -> None:
+        self._records.clear()
+        self._notify("clear", None)
+
+
+class UserIndex:
+    """Insertion-ordered set of a user's summary IDs with O(1) removal."""
+
+    __slots__ = ("_ids",)
+
+    def __init__(self, summary_ids: Iterable[str] = ()):
+        self._ids: dict[PackedId, None] = dict.fromkeys(pack_id(sid) for sid in summary_ids)
+
+    def append(self, summary_id: str) -> None:
+        self._ids[pack_id(summary_id)] = None
+
+    def remove(self, summary_id: str) -> None:
+        try:
+            del self._ids[pack_id(summary_id)]
+        except KeyError:
+            raise ValueError(f"{summary_id} not in index") from None
+
+    def discard(self, summary_id: str) -> None:
+        self._ids.pop(pack_id(summary_id), None)
+
+    def __contains__(self, summary_id: object) -> bool:
+        return isinstance(summary_id, str) and pack_id(summary_id) in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return (unpack_id(packed) for packed in self._ids)
+
+    def __reversed__(self) -> Iterator[str]:
+        return (unpack_id(packed) for packed in reversed(self._ids))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+
+class UserIndexes(dict):
+    """Per-user summary indexes; plain lists assigned to a user become UserIndex objects."""
+
+    def __setitem__(self, user_id: str, summary_ids: Iterable[str]) -> None:
+        if not isinstance(summary_ids, UserIndex):
+            summary_ids = UserIndex(summary_ids)
+        super().__setitem__(user_id, summary_ids)
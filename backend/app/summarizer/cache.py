@@ -0,0 +1,69 @@
+"""In-process cache of generated summaries."""
+import hashlib
+from collections import OrderedDict
+from typing import Optional
+from .shared_cache import SharedTable
+from ..config import settings
+
+
+class SummaryCache:
+    """
+    LRU cache of summaries keyed by input text hash and summary length.
+
+    With a shared table, the in-process LRU sits in front of a table that
+    every worker process reads and writes, so a summary generated by one
+    worker is a hit in all of them.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.SUMMARY_CACHE_MAX_ENTRIES,
+        shared: Optional[SharedTable] = None,
+    ):
+        """Initialize an empty cache holding at most ``max_entries`` summaries locally."""
+        self.max_entries = max_entries
+        self.shared = shared
+        self._entries: OrderedDict[str, str] = OrderedDict()
+
+    @staticmethod
+    def make_key(text: str, length: str) -> str:
+        """Build the cache key for a text and summary length."""
+        digest = hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+        return f"{digest}:{length}"
+
+    def get(self, text: str, length: str) -> Optional[str]:
+        """Return the cached summary for the text and length, if present."""
+        key = self.make_key(text, length)
+        summary = self._entries.get(key)
+        if summary is not None:
+            self._entries.move_to_end(key)
+        elif self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                summary = value.decode("utf-8", errors="ignore")
+                self._store(key, summary)
+        return summary
+
+    def set(self, text: str, length: str, summary: str) -> None:
+        """Store a summary, evicting the least recently used entry when full."""
+        if self.max_entries <= 0:
+            return
+        key = self.make_key(text, length)
+        self._store(key, summary)
+        if self.shared is not None:
+            self.shared.set(key, summary.encode("utf-8"))
+
+    def _store(self, key: str, summary: str) -> None:
+        self._entries[key] = summary
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all cached summaries."""
+        self._entries.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
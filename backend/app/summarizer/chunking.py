@@ -0,0 +1,106 @@
+"""Content-defined chunking and per-chunk partial summary storage."""
+import hashlib
+import re
+import zlib
+from collections import OrderedDict
+from typing import Optional
+from ..config import settings
+
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+
+def _segments(text: str, max_chars: int) -> list[str]:
+    """Split text into paragraphs, breaking oversized ones into sentences."""
+    segments = []
+    for paragraph in _PARAGRAPH_RE.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            segments.append(paragraph)
+            continue
+        for sentence in _SENTENCE_RE.split(paragraph):
+            # Text without sentence punctuation is sliced at the hard limit
+            for start in range(0, len(sentence), max_chars):
+                piece = sentence[start:start + max_chars].strip()
+                if piece:
+                    segments.append(piece)
+    return segments
+
+
+def chunk_text(
+    text: str,
+    min_chars: int = settings.CHUNK_MIN_CHARS,
+    max_chars: int = settings.CHUNK_MAX_CHARS,
+    divisor: int = settings.CHUNK_BOUNDARY_DIVISOR,
+) -> list[str]:
+    """
+    Split text into content-defined chunks.
+
+    A chunk ends after a paragraph or sentence whose CRC32 is divisible by
+    ``divisor`` once it holds at least ``min_chars``, or when it would grow
+    past ``max_chars``. Boundaries depend only on nearby content, so an edit
+    in one section leaves the other chunks (and their hashes) unchanged.
+
+    Args:
+        text: Text to split
+        min_chars: Minimum chunk size before a content boundary is accepted
+        max_chars: Maximum chunk size
+        divisor: Boundary selector; larger values give larger chunks
+
+    Returns:
+        List of chunk strings in document order
+    """
+    chunks = []
+    current: list[str] = []
+    size = 0
+    for segment in _segments(text, max_chars):
+        if current and size + len(segment) > max_chars:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+        current.append(segment)
+        size += len(segment)
+        if size >= min_chars and zlib.crc32(segment.encode("utf-8")) % divisor == 0:
+            chunks.append("\n\n".join(current))
+            current, size = [], 0
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def chunk_hash(chunk: str) -> str:
+    """Return the content hash identifying a chunk."""
+    return hashlib.sha256(chunk.encode("utf-8", errors="ignore")).hexdigest()
+
+
+class ChunkStore:
+    """LRU store of partial summaries keyed by chunk hash."""
+
+    def __init__(self, max_entries: int = settings.CHUNK_STORE_MAX_ENTRIES):
+        """Initialize an empty store holding at most ``max_entries`` partials."""
+        self.max_entries = max_entries
+        self._partials: OrderedDict[str, str] = OrderedDict()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the stored partial summary for a chunk hash, if present."""
+        partial = self._partials.get(key)
+        if partial is not None:
+            self._partials.move_to_end(key)
+        return partial
+
+    def set(self, key: str, partial: str) -> None:
+        """Store a partial summary, evicting the least recently used when full."""
+        if self.max_entries <= 0:
+            return
+        self._partials[key] = partial
+        self._partials.move_to_end(key)
+        while len(self._partials) > self.max_entries:
+            self._partials.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove all stored partial summaries."""
+        self._partials.clear()
+
+    def __len__(self) -> int:
+        return len(self._partials)
@@ -1,9 +1,25 @@
 """Summarization engine using Azure OpenAI."""
-from typing import Literal
+import asyncio
+import json
+import time
+from typing import Callable, Iterable, Literal, Optional
 from openai import AzureOpenAI
+from .cache import SummaryCache
+from .chunking import ChunkStore, chunk_hash, chunk_text
+from .hedging import Hedger
+from .limiter import AdaptiveLimiter
+from .routing import ModelRouter, Route
+from .shared_cache import open_shared_table
+from ..deadline import mark_upstream_started, remaining
 from ..errors import SummarizationError
 from ..logger import logger
 from ..config import settings
+from ..profiling import stage, to_thread
+from ..tracing import span
+
+SUMMARY_LENGTHS = ("short", "medium", "long")
+
+SYSTEM_PROMPT = "You are a concise and helpful assistant that creates accurate summaries of documents."
 
 
 class SummarizationEngine:
@@ -20,6 +36,13 @@ class SummarizationEngine:
                 api_version="2024-12-01-preview",
                 azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
             )
+        self.cache = SummaryCache(
+            shared=open_shared_table("summaries", settings.SHARED_SUMMARY_SLOTS, settings.SHARED_SUMMARY_SLOT_BYTES)
+        )
+        self.chunk_store = ChunkStore()
+        self.router = ModelRouter()
+        self.hedger = Hedger()
+        self.limiter = AdaptiveLimiter()
 
     def _get_summary_length_instruction(
         self, length: Literal["short", "medium", "long"]
@@ -32,6 +55,98 @@ class SummarizationEngine:
         }
         return length_config.get(length, length_config["medium"])
 
+    def _create(
+        self,
+        route: Route,
+        message: str,
+        defaults: dict,
+        kwargs: dict,
+        on_latency: Optional[Callable[[float], None]] = None,
+    ):
+        """
+        Make one blocking model call on ``route``.
+
+        Completion parameters are ``defaults``, then the route's overrides,
+        then ``kwargs``. Latency, token usage and cost are recorded when the
+        call returns, even if the awaiting task has already given up on it,
+        because the spend happened either way.
+        """
+        params = {**defaults, **route.params, **kwargs}
+        with span(
+            "llm_call",
+            route=route.name,
+            model=route.deployment,
+            max_completion_tokens=params.get("max_completion_tokens"),
+        ) as current:
+            started = time.monotonic()
+            try:
+                response = self.client.chat.completions.create(
+                    model=route.deployment,
+                    messages=[
+                        {"role": "system", "content": SYSTEM_PROMPT},
+                        {"role": "user", "content": message},
+                    ],
+                    **params,
+                )
+            except BaseException:
+                self.router.record_failure(route, time.monotonic() - started)
+                raise
+            latency = time.monotonic() - started
+            usage = getattr(response, "usage", None)
+            prompt_tokens = getattr(usage, "prompt_tokens", None)
+            completion_tokens = getattr(usage, "completion_tokens", None)
+            if not isinstance(prompt_tokens, int):
+                prompt_tokens = (len(message) + 3) // 4
+            if not isinstance(completion_tokens, int):
+                completion_tokens = 0
+            current.set_attribute("prompt_tokens", prompt_tokens)
+            current.set_attribute("completion_tokens", completion_tokens)
+            self.router.record(route, latency, prompt_tokens, completion_tokens)
+            if on_latency is not None:
+                on_latency(latency)
+        return response
+
+    async def _complete(
+        self,
+        message: str,
+        max_completion_tokens: int = 500,
+        length: Optional[str] = None,
+        **kwargs,
+    ) -> str:
+        """Send a single summarization prompt to the routed deployment and return its reply."""
+        candidates = self.router.candidates((len(message) + 3) // 4, length)
+        timeout = remaining()
+        if timeout is not None:
+            # Let the HTTP call itself give up at the request deadline
+            kwargs["timeout"] = timeout
+        defaults = {"temperature": 1, "max_completion_tokens": max_completion_tokens}
+        mark_upstream_started()
+
+        probe = self.router.start_probe(candidates[0])
+        try:
+            # The client is synchronous; run it off the event loop so other requests keep moving
+            if not settings.HEDGING_ENABLED:
+                response = await self.limiter.run(
+                    lambda: to_thread(self._create, candidates[0], message, defaults, kwargs)
+                )
+            else:
+                backup = next((route for route in candidates[1:]), candidates[0])
+                if settings.HEDGING_ROUTE:
+                    backup = next(
+                        (route for route in self.router.routes if route.name == settings.HEDGING_ROUTE), backup
+                    )
+
+                def call(route: Route, is_primary: bool):
+                    observe = self.hedger.observe_primary if is_primary else None
+                    return self.limiter.run(lambda: to_thread(self._create, route, message, defaults, kwargs, observe))
+
+                response = await self.hedger.run(call, candidates[0], backup)
+        finally:
+            if probe:
+                # A probe cancelled while queued or at the deadline must not keep the route out for good
+                self.router.end_probe(candidates[0])
+        return response.choices[0].message.content.strip()
+
     async def generate_summary(
         self,
         text: str,
@@ -58,10 +173,16 @@ class SummarizationEngine:
         if not text or not text.strip():
             raise SummarizationError("Cannot summarize empty text")
 
+        cached = self.cache.get(text, length)
+        if cached is not None:
+            logger.info(f"Summary cache hit for {length} summary")
+            return cached
+
         try:
-            word_count, instruction = self._get_summary_length_instruction(length)
+            with stage("prompt_build"):
+                word_count, instruction = self._get_summary_length_instruction(length)
 
-            message = f"""{instruction}
+                message = f"""{instruction}
 
 Text to summarize:
 {text}
@@ -70,27 +191,175 @@ Summary:"""
 
             logger.info(f"Generating {length} summary for text of length {len(text)}")
 
-            response = self.client.chat.completions.create(
-                model=settings.AZURE_OPENAI_DEPLOYMENT_NAME,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a concise and helpful assistant that creates accurate summaries of documents.",
-                    },
-                    {"role": "user", "content": message},
-                ],
-                temperature=1,
-                max_completion_tokens=500,
-            )
-
-            summary = response.choices[0].message.content.strip()
+            summary = await self._complete(message, length=length)
             logger.info(f"Successfully generated summary ({len(summary)} chars)")
+            self.cache.set(text, length, summary)
             return summary
 
         except Exception as e:
             logger.error(f"Summarization failed: {str(e)}")
             raise SummarizationError(f"Failed to generate summary: {str(e)}")
 
+    async def generate_summaries(
+        self,
+        text: str,
+        lengths: Iterable[Literal["short", "medium", "long"]] = SUMMARY_LENGTHS,
+    ) -> dict[str, str]:
+        """
+        Generate summaries of several lengths from a single upstream call.
+
+        The model is asked for a JSON object with one key per length, so the
+        input text is only sent once. A length missing from the response is
+        derived from the longest summary that is longer than it, or from the
+        text when there is none. Every result is written to the summary cache.
+
+        Args:
+            text: Text to summarize
+            lengths: Summary lengths to produce
+
+        Returns:
+            Mapping of summary length to generated summary
+
+        Raises:
+            SummarizationError: If summarization fails
+        """
+        if not self.client:
+            raise SummarizationError(
+                "Azure OpenAI is not configured. Please set AZURE_OPENAI_API_KEY and AZURE_OPENAI_ENDPOINT."
+            )
+
+        if not text or not text.strip():
+            raise SummarizationError("Cannot summarize empty text")
+
+        lengths = [length for length in SUMMARY_LENGTHS if length in set(lengths)]
+        summaries = {}
+        for length in lengths:
+            cached = self.cache.get(text, length)
+            if cached is not None:
+                summaries[length] = cached
+
+        missing = [length for length in lengths if length not in summaries]
+        if not missing:
+            logger.info(f"Summary cache hit for lengths {', '.join(lengths)}")
+            return summaries
+
+        try:
+            with stage("prompt_build"):
+                instructions = "\n".join(
+                    f'- "{length}": {self._get_summary_length_instruction(length)[1]}' for length in missing
+                )
+                message = f"""Summarize the text below at several lengths.
+Respond with a JSON object with exactly these keys:
+{instructions}
+
+Text to summarize:
+{text}"""
+
+            logger.info(f"Generating {', '.join(missing)} summaries for text of length {len(text)}")
+
+            content = await self._complete(
+                message,
+                max_completion_tokens=500 * len(missing),
+                length=missing[-1],
+                response_format={"type": "json_object"},
+            )
+            try:
+                parsed = json.loads(content)
+            except json.JSONDecodeError:
+                logger.warning("Multi-length response was not valid JSON; using it as the longest summary")
+                parsed = {missing[-1]: content}
+
+            for length in missing:
+                value = parsed.get(length) if isinstance(parsed, dict) else None
+                if isinstance(value, str) and value.strip():
+                    summaries[length] = value.strip()
+                    self.cache.set(text, length, summaries[length])
+
+        except Exception as e:
+            logger.error(f"Multi-length summarization failed: {str(e)}")
+            raise SummarizationError(f"Failed to generate summary: {str(e)}")
+
+        if not summaries:
+            raise SummarizationError("Failed to generate summary: empty multi-length response")
+
+        # Derive anything the model left out from a longer summary, or else from the text itself;
+        # a shorter summary no longer has the detail a longer one needs
+        for length in missing:
+            if length in summaries:
+                continue
+            longer = SUMMARY_LENGTHS[SUMMARY_LENGTHS.index(length) + 1:]
+            source = next((summaries[key] for key in reversed(longer) if key in summaries), text)
+            summaries[length] = await self.generate_summary(source, length)
+            self.cache.set(text, length, summaries[length])
+
+        logger.info(f"Successfully generated {len(missing)} summaries in one request")
+        return summaries
+
+    async def _summarize_chunk(self, chunk: str) -> str:
+        """Produce the partial summary of one document chunk."""
+        message = f"""Summarize this section of a longer document. Keep every key fact, figure and name.
+
+Section:
+{chunk}
+
+Summary:"""
+        return await self._complete(message, max_completion_tokens=400)
+
+    async def generate_incremental_summary(
+        self,
+        text: str,
+        length: Literal["short", "medium", "long"] = "medium",
+    ) -> tuple[str, dict]:
+        """
+        Summarize text via per-chunk partial summaries that are reused across runs.
+
+        The text is split into content-defined chunks. Only chunks whose hash
+        has no stored partial summary are sent to the model; the final summary
+        is then reduced from the stored and new partials.
+
+        Args:
+            text: Text to summarize
+            length: Desired summary length (short, medium, long)
+
+        Returns:
+            Tuple of the generated summary and chunk statistics
+
+        Raises:
+            SummarizationError: If summarization fails
+        """
+        if not self.client:
+            raise SummarizationError(
+                "Azure OpenAI is not configured. Please set AZURE_OPENAI_API_KEY and AZURE_OPENAI_ENDPOINT."
+            )
+
+        if not text or not text.strip():
+            raise SummarizationError("Cannot summarize empty text")
+
+        chunks = chunk_text(text)
+        if len(chunks) <= 1:
+            summary = await self.generate_summary(text, length)
+            return summary, {"total": len(chunks), "reused": 0}
+
+        keys = [chunk_hash(chunk) for chunk in chunks]
+        partials = {key: self.chunk_store.get(key) for key in keys}
+        changed = {key: chunk for key, chunk in zip(keys, chunks) if partials[key] is None}
+
+        logger.info(f"Incremental summary: {len(changed)} of {len(chunks)} chunks changed")
+
+        try:
+            results = await asyncio.gather(*(self._summarize_chunk(chunk) for chunk in changed.values()))
+        except Exception as e:
+            logger.error(f"Chunk summarization failed: {str(e)}")
+            raise SummarizationError(f"Failed to generate summary: {str(e)}")
+
+        for key, partial in zip(changed, results):
+            partials[key] = partial
+            self.chunk_store.set(key, partial)
+
+        combined = "\n\n".join(partials[key] for key in keys)
+        summary = await self.generate_summary(combined, length)
+        return summary, {"total": len(chunks), "reused": len(chunks) - len(changed)}
+
 
 # Global instance
 engine = SummarizationEngine()
@@ -0,0 +1,139 @@
+"""On-disk cache of extracted document text, shared by all worker processes."""
+import hashlib
+import os
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Optional
+from .shared_cache import SharedTable, open_shared_table
+from ..config import settings
+from ..logger import logger
+
+# Bump whenever extractor output changes so stale entries are never served
+EXTRACTOR_VERSION = 2
+
+
+class ExtractionCache:
+    """
+    Size-bounded cache of extracted text keyed by the SHA-256 of the upload.
+
+    Entries are zlib-compressed files written atomically, so several workers
+    can share one directory. Reads refresh an entry's modification time and
+    eviction removes the least recently used files first. Entries small
+    enough for a slot are also kept in an optional shared memory-mapped
+    table, which serves repeat uploads without touching the filesystem.
+    """
+
+    def __init__(
+        self,
+        directory: str = settings.EXTRACTION_CACHE_DIR,
+        max_bytes: int = settings.EXTRACTION_CACHE_MAX_BYTES,
+        shared: Optional[SharedTable] = None,
+    ):
+        """Initialize the cache in ``directory`` holding at most ``max_bytes``."""
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self._approx_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(content: bytes, format_type: str) -> str:
+        """Build the cache key for uploaded bytes of a given format."""
+        digest = hashlib.sha256(content).hexdigest()
+        return f"{digest}-{format_type}-v{EXTRACTOR_VERSION}"
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.z"
+
+    def get(self, content: bytes, format_type: str) -> Optional[str]:
+        """Return cached text for the upload, or None on a miss."""
+        key = self.make_key(content, format_type)
+        if self.shared is not None:
+            data = self.shared.get(key)
+            if data is not None:
+                try:
+                    return zlib.decompress(data).decode("utf-8")
+                except (zlib.error, UnicodeDecodeError):
+                    pass
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            text = zlib.decompress(data).decode("utf-8")
+            os.utime(path)
+            if self.shared is not None:
+                self.shared.set(key, data)
+            return text
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"Discarding unreadable extraction cache entry {path.name}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def set(self, content: bytes, format_type: str, text: str) -> None:
+        """Store extracted text for the upload, evicting old entries if over budget."""
+        if self.max_bytes <= 0:
+            return
+        data = zlib.compress(text.encode("utf-8"), settings.EXTRACTION_CACHE_COMPRESSION_LEVEL)
+        if len(data) > self.max_bytes:
+            return
+        key = self.make_key(content, format_type)
+        if self.shared is not None:
+            self.shared.set(key, data)
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_name, path)
+        except OSError as e:
+            logger.warning(f"Failed to write extraction cache entry: {str(e)}")
+            return
+
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan_size()
+        else:
+            self._approx_bytes += len(data)
+        if self._approx_bytes > self.max_bytes:
+            self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        entries = []
+        for path in self.directory.glob("*/*.z"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its budget."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        # Evict down to 90% of the budget so every write does not trigger a scan
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._approx_bytes = total
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        for _, _, path in self._entries():
+            path.unlink(missing_ok=True)
+        self._approx_bytes = 0
+        if self.shared is not None:
+            self.shared.clear()
+
+
+# Global instance
+extraction_cache = ExtractionCache(
+    shared=open_shared_table("extraction", settings.SHARED_EXTRACTION_SLOTS, settings.SHARED_EXTRACTION_SLOT_BYTES)
+)
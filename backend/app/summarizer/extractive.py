@@ -0,0 +1,118 @@
+"""Local extractive summarization using TF-IDF sentence scoring."""
+import re
+from typing import Literal
+import numpy as np
+from .utils import estimate_tokens
+from ..config import settings
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+_WORD_RE = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+
+def split_sentences(text: str) -> list[str]:
+    """Split text into sentences, dropping empty fragments."""
+    return [sentence.strip() for sentence in _SENTENCE_RE.split(text) if sentence and sentence.strip()]
+
+
+def score_sentences(sentences: list[str]) -> np.ndarray:
+    """
+    Score sentences by TF-IDF cosine similarity to the document centroid.
+
+    The sentence-term matrix is kept in coordinate form, so memory and time
+    grow with the number of words rather than sentences times vocabulary.
+
+    Args:
+        sentences: Sentences of a single document
+
+    Returns:
+        Array with one salience score per sentence
+    """
+    count = len(sentences)
+    vocabulary: dict[str, int] = {}
+    rows, cols = [], []
+    for index, sentence in enumerate(sentences):
+        for word in _WORD_RE.findall(sentence.lower()):
+            rows.append(index)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+
+    if not vocabulary:
+        return np.zeros(count)
+
+    size = len(vocabulary)
+    keys, term_counts = np.unique(
+        np.asarray(rows, dtype=np.int64) * size + np.asarray(cols, dtype=np.int64),
+        return_counts=True,
+    )
+    rows, cols = keys // size, keys % size
+
+    document_frequency = np.bincount(cols, minlength=size)
+    idf = np.log((1 + count) / (1 + document_frequency)) + 1.0
+    weights = (1.0 + np.log(term_counts)) * idf[cols]
+
+    centroid = np.bincount(cols, weights=weights, minlength=size)
+    dots = np.bincount(rows, weights=weights * centroid[cols], minlength=count)
+    norms = np.sqrt(np.bincount(rows, weights=weights * weights, minlength=count))
+    return dots / (norms * np.linalg.norm(centroid) + 1e-12)
+
+
+def _select(sentences: list[str], sizes: list[int], budget: int) -> str:
+    """Pick the highest-scoring sentences that fit the budget, in document order."""
+    scores = score_sentences(sentences)
+    chosen = []
+    used = 0
+    for index in np.argsort(-scores, kind="stable"):
+        if used + sizes[index] > budget:
+            continue
+        chosen.append(index)
+        used += sizes[index]
+    return " ".join(sentences[index] for index in sorted(chosen))
+
+
+def select_salient(text: str, token_budget: int = settings.EXTRACTIVE_TOKEN_BUDGET) -> str:
+    """
+    Shrink text to its most salient sentences within a token budget.
+
+    Args:
+        text: Text to shrink
+        token_budget: Maximum estimated tokens in the result
+
+    Returns:
+        Selected sentences in their original order, or the text unchanged if it fits.
+        When no sentence fits (e.g. unpunctuated tables), the start of the text.
+    """
+    if estimate_tokens(text) <= token_budget:
+        return text
+    sentences = split_sentences(text)
+    selected = _select(sentences, [estimate_tokens(sentence) + 1 for sentence in sentences], token_budget)
+    if selected:
+        return selected
+    # Truncate at a word boundary; about four characters make a token
+    head = text[:token_budget * 4]
+    cut = head.rfind(" ")
+    return (head[:cut] if cut > 0 else head).strip()
+
+
+def extractive_summary(text: str, length: Literal["short", "medium", "long"] = "medium") -> str:
+    """
+    Build a summary from the source's own sentences, without calling a model.
+
+    Args:
+        text: Text to summarize
+        length: Desired summary length (short, medium, long)
+
+    Returns:
+        Extractive summary of roughly the configured word count
+    """
+    word_budget = {
+        "short": settings.SUMMARY_LENGTH_SHORT,
+        "medium": settings.SUMMARY_LENGTH_MEDIUM,
+        "long": settings.SUMMARY_LENGTH_LONG,
+    }.get(length, settings.SUMMARY_LENGTH_MEDIUM)
+    sentences = split_sentences(text)
+    sizes = [len(sentence.split()) for sentence in sentences]
+    summary = _select(sentences, sizes, word_budget)
+    if not summary and sentences:
+        # Even the shortest sentence is over budget; truncate the best one
+        best = sentences[int(np.argmax(score_sentences(sentences)))]
+        summary = " ".join(best.split()[:word_budget])
+    return summary
@@ -0,0 +1,128 @@
+"""Hedged model calls: race a backup request against a slow primary."""
+import asyncio
+import time
+from collections import deque
+from threading import Lock
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import numpy as np
+
+from ..config import settings
+from ..logger import logger
+from ..metrics import metrics
+from .routing import Route
+
+T = TypeVar("T")
+
+
+def _percentile(samples, q: float) -> Optional[float]:
+    if not samples:
+        return None
+    return float(np.percentile(np.fromiter(samples, dtype=float, count=len(samples)), q * 100))
+
+
+class Hedger:
+    """
+    Send a backup request when the primary one is slower than usual.
+
+    If the primary call has not finished after the ``percentile`` of recent
+    primary latencies, the same call is sent to a backup route. The first
+    successful answer wins and the other task is cancelled. Hedges draw on a
+    budget that refills by ``budget_ratio`` per call, so at most that fraction
+    of calls is duplicated.
+    """
+
+    def __init__(
+        self,
+        percentile: float = settings.HEDGING_PERCENTILE,
+        min_delay: float = settings.HEDGING_MIN_DELAY_SECONDS,
+        min_samples: int = settings.HEDGING_MIN_SAMPLES,
+        budget_ratio: float = settings.HEDGING_BUDGET_RATIO,
+        window: int = 1000,
+    ):
+        """Initialize the hedger with its trigger percentile and spend budget."""
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.budget_ratio = budget_ratio
+        self._budget = 0.0
+        self._lock = Lock()
+        # Latency of primary calls, including those that lost or were abandoned
+        self._primary: deque[float] = deque(maxlen=window)
+        # Latency seen by callers, after hedging
+        self._effective: deque[float] = deque(maxlen=window)
+
+    def observe_primary(self, latency: float) -> None:
+        """Record how long a primary call took; safe to call from worker threads."""
+        with self._lock:
+            self._primary.append(latency)
+
+    def delay(self) -> Optional[float]:
+        """Seconds to wait for the primary before hedging, or None until enough samples exist."""
+        with self._lock:
+            if len(self._primary) < self.min_samples:
+                return None
+            samples = list(self._primary)
+        return max(self.min_delay, _percentile(samples, self.percentile))
+
+    def _take_budget(self) -> bool:
+        if self._budget >= 1.0:
+            self._budget -= 1.0
+            return True
+        return False
+
+    def _report(self, latency: float) -> None:
+        self._effective.append(latency)
+        with self._lock:
+            primary = list(self._primary)
+        primary_p99 = _percentile(primary, 0.99)
+        effective_p99 = _percentile(self._effective, 0.99)
+        calls = metrics.get("hedge_calls_total")
+        hedges = metrics.get("hedges_total")
+        metrics.set_gauge("hedge_rate", round(hedges / calls, 4) if calls else 0.0)
+        metrics.set_gauge("hedge_win_rate", round(metrics.get("hedge_wins_total") / hedges, 4) if hedges else 0.0)
+        if primary_p99 is not None and effective_p99 is not None:
+            metrics.set_gauge("hedge_primary_p99_seconds", round(primary_p99, 4))
+            metrics.set_gauge("hedge_effective_p99_seconds", round(effective_p99, 4))
+            metrics.set_gauge("hedge_p99_improvement_seconds", round(primary_p99 - effective_p99, 4))
+
+    async def run(self, call: Callable[[Route, bool], Awaitable[T]], primary: Route, backup: Route) -> T:
+        """
+        Run ``call(primary, True)``, hedging with ``call(backup, False)`` if it is slow.
+
+        Args:
+            call: Starts the model call on a route; the flag marks the primary
+            primary: Route for the first request
+            backup: Route for the hedged request
+
+        Returns:
+            Result of whichever call succeeds first
+        """
+        metrics.inc("hedge_calls_total")
+        self._budget = min(self._budget + self.budget_ratio, 10.0)
+        started = time.monotonic()
+        primary_task = asyncio.ensure_future(call(primary, True))
+        tasks = {primary_task}
+        try:
+            delay = self.delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=delay)
+                if not done and self._take_budget():
+                    metrics.inc("hedges_total")
+                    logger.info(f"Primary call on {primary.name} exceeded {delay:.2f}s; hedging to {backup.name}")
+                    tasks.add(asyncio.ensure_future(call(backup, False)))
+
+            failure: Optional[BaseException] = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary_task:
+                            metrics.inc("hedge_wins_total")
+                        self._report(time.monotonic() - started)
+                        return task.result()
+                    failure = failure or task.exception()
+            raise failure
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,178 @@
+"""Adaptive (AIMD) concurrency limit for upstream model calls."""
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import openai
+
+from ..config import settings
+from ..deadline import remaining
+from ..logger import logger
+from ..metrics import metrics
+
+T = TypeVar("T")
+
+# Upstream statuses that mean "slow down" rather than "this request is bad"
+THROTTLE_STATUSES = (429, 503)
+
+
+def is_throttle(error: BaseException) -> bool:
+    """Return True if a model call failed because the upstream is overloaded or rate limiting."""
+    return getattr(error, "status_code", None) in THROTTLE_STATUSES
+
+
+def is_timeout(error: BaseException) -> bool:
+    """Return True if a model call timed out."""
+    return isinstance(error, (openai.APITimeoutError, TimeoutError))
+
+
+class AdaptiveLimiter:
+    """
+    Limits in-flight upstream calls to a limit that tracks upstream capacity.
+
+    The limit follows additive-increase/multiplicative-decrease:
+
+    - A throttled (429/503) or timed-out call multiplies the limit by
+      ``backoff``. A call whose request hit its deadline counts as timed out.
+    - A successful call slower than ``latency_tolerance`` times the
+      long-run average latency is an early congestion signal, and shrinks
+      the limit a little (the gradient step).
+    - Any other successful call made while the limit was fully used grows
+      the limit by ``1 / limit``, i.e. by one after a full window of calls.
+
+    The limit stays within ``[min_limit, max_limit]``. Calls over the limit
+    wait in FIFO order. A slot is held until the call itself finishes, even
+    when the caller stops waiting for it (deadline, disconnect, lost hedge):
+    the worker thread is still talking to the upstream. When disabled, calls
+    pass straight through.
+    """
+
+    def __init__(
+        self,
+        initial: int = settings.ADAPTIVE_CONCURRENCY_INITIAL,
+        min_limit: int = settings.ADAPTIVE_CONCURRENCY_MIN,
+        max_limit: int = settings.ADAPTIVE_CONCURRENCY_MAX,
+        backoff: float = settings.ADAPTIVE_CONCURRENCY_BACKOFF,
+        latency_tolerance: float = settings.ADAPTIVE_CONCURRENCY_LATENCY_TOLERANCE,
+        gradient_step: float = 0.9,
+        alpha: float = 0.05,
+        enabled: bool = settings.ADAPTIVE_CONCURRENCY_ENABLED,
+    ):
+        """Initialize the limiter with its bounds and tuning parameters."""
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.gradient_step = gradient_step
+        self.alpha = alpha
+        self.enabled = enabled
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        self._waiters: deque[asyncio.Future] = deque()
+        self._report()
+
+    def stats(self) -> dict:
+        """Return the current limit, usage and latency baseline."""
+        return {
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "queued": sum(1 for waiter in self._waiters if not waiter.done()),
+            "latency_ewma": round(self.latency_ewma, 4) if self.latency_ewma is not None else None,
+        }
+
+    def _report(self) -> None:
+        metrics.set_gauge("llm_concurrency_limit", round(self.limit, 2))
+        metrics.set_gauge("llm_in_flight", self.in_flight)
+
+    def _set_limit(self, limit: float) -> None:
+        self.limit = min(max(limit, float(self.min_limit)), float(self.max_limit))
+        self._report()
+
+    def _observe(self, latency: float, error: Optional[BaseException], saturated: bool) -> None:
+        """Adjust the limit after a call finished."""
+        if error is not None:
+            if is_throttle(error):
+                metrics.inc("llm_throttled_total")
+                reason = "throttled"
+            elif is_timeout(error):
+                metrics.inc("llm_timeouts_total")
+                reason = "timed out"
+            else:
+                # Other failures say nothing about capacity
+                return
+            previous = self.limit
+            self._set_limit(self.limit * self.backoff)
+            logger.warning(f"Upstream call {reason}; concurrency limit {previous:.1f} -> {self.limit:.1f}")
+            return
+
+        baseline = self.latency_ewma
+        self.latency_ewma = latency if baseline is None else baseline + self.alpha * (latency - baseline)
+        if baseline is not None and latency > baseline * self.latency_tolerance:
+            self._set_limit(self.limit * self.gradient_step)
+        elif saturated:
+            self._set_limit(self.limit + 1.0 / self.limit)
+
+    def _dispatch(self) -> None:
+        """Admit waiters while there is room under the (possibly changed) limit."""
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    async def _acquire(self) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # A slot was handed over just as we were cancelled; pass it on
+                self.in_flight -= 1
+                self._dispatch()
+            else:
+                waiter.cancel()
+            raise
+
+    async def run(self, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run an upstream call in a slot, and learn from how the call went.
+
+        Args:
+            call: Starts the call, e.g. ``lambda: to_thread(create, ...)``
+
+        Returns:
+            Result of the call
+        """
+        if not self.enabled:
+            return await call()
+        await self._acquire()
+        self._report()
+        saturated = self.in_flight >= int(self.limit)
+        started = time.monotonic()
+        deadline_exceeded = False
+
+        def finished(task: asyncio.Future) -> None:
+            self.in_flight -= 1
+            if not task.cancelled():
+                error = task.exception()
+                if deadline_exceeded and not (error is not None and is_throttle(error)):
+                    error = TimeoutError("request deadline exceeded")
+                self._observe(time.monotonic() - started, error, saturated)
+            self._dispatch()
+            self._report()
+
+        # The slot follows the call, not the caller: it is released when the call finishes
+        task = asyncio.ensure_future(call())
+        task.add_done_callback(finished)
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            left = remaining()
+            deadline_exceeded = left is not None and left <= 0
+            raise
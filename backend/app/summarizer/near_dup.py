@@ -0,0 +1,192 @@
+"""Near-duplicate input detection with MinHash signatures and LSH banding."""
+import re
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from ..config import settings
+
+_WORD_RE = re.compile(r"\w+")
+
+# Universal hashing modulo a Mersenne prime; 32-bit shingles keep a * x + b inside uint64
+_PRIME = np.uint64((1 << 31) - 1)
+_SHINGLE_MULTIPLIER = np.uint64(1_000_003)
+_BLOCK = 4096
+
+
+class NearDuplicateIndex:
+    """
+    Index of summarized inputs that finds stored texts similar to a new one.
+
+    Each text is reduced to a MinHash signature over its word shingles. The
+    signature is cut into ``bands`` bands, and texts sharing any band are
+    candidates. Candidates are then scored by the fraction of matching
+    signature values, which estimates their Jaccard similarity. A lookup costs
+    one signature computation plus ``bands`` dictionary probes, independent of
+    how many entries are stored. The oldest entries are overwritten once
+    ``max_entries`` is reached, and entries whose summary was deleted from
+    the summary store are dropped (see ``on_store_event``).
+    """
+
+    def __init__(
+        self,
+        threshold: float = settings.NEAR_DUPLICATE_THRESHOLD,
+        num_perm: int = settings.NEAR_DUPLICATE_NUM_PERM,
+        bands: int = settings.NEAR_DUPLICATE_BANDS,
+        shingle_size: int = settings.NEAR_DUPLICATE_SHINGLE_SIZE,
+        min_words: int = settings.NEAR_DUPLICATE_MIN_WORDS,
+        max_entries: int = settings.NEAR_DUPLICATE_MAX_ENTRIES,
+        seed: int = 1,
+    ):
+        """Initialize an empty index; ``num_perm`` must be divisible by ``bands``."""
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.min_words = max(min_words, shingle_size)
+        self.max_entries = max_entries
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, int(_PRIME), size=num_perm, dtype=np.uint64)
+        self._signatures = np.zeros((0, num_perm), dtype=np.uint32)
+        self._entries: list[Optional[tuple[str, str]]] = []
+        self._buckets: dict[int, list[int]] = {}
+        # Slots holding each summary, so deleting a stored summary drops its entries
+        self._by_summary: dict[str, list[int]] = {}
+        self._added = 0
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """Return the MinHash signature of a text, or None if it is too short to compare."""
+        words = _WORD_RE.findall(text.lower())
+        if len(words) < self.min_words:
+            return None
+        hashes = np.fromiter(
+            (zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words)
+        )
+        count = len(words) - self.shingle_size + 1
+        shingles = np.zeros(count, dtype=np.uint64)
+        for offset in range(self.shingle_size):
+            shingles = shingles * _SHINGLE_MULTIPLIER + hashes[offset:offset + count]
+        shingles = np.unique(shingles & np.uint64(0xFFFFFFFF))
+
+        signature = np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        for start in range(0, len(shingles), _BLOCK):
+            block = shingles[start:start + _BLOCK]
+            hashed = (np.outer(self._a, block) + self._b[:, None]) % _PRIME
+            np.minimum(signature, hashed.min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray, namespace: str) -> list[int]:
+        rows = self.rows
+        return [
+            hash((namespace, band, signature[band * rows:(band + 1) * rows].tobytes()))
+            for band in range(self.bands)
+        ]
+
+    def lookup(self, text: str, namespace: str) -> Optional[tuple[str, float]]:
+        """
+        Find a stored summary whose input is similar to ``text``.
+
+        Args:
+            text: Input text about to be summarized
+            namespace: Scope the match must share (e.g. summary length)
+
+        Returns:
+            Tuple of the stored summary and estimated similarity, or None
+        """
+        if not self._added:
+            return None
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        candidates = set()
+        for key in self._band_keys(signature, namespace):
+            candidates.update(self._buckets.get(key, ()))
+        if not candidates:
+            return None
+
+        slots = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarity = (self._signatures[slots] == signature).mean(axis=1)
+        best = int(similarity.argmax())
+        if similarity[best] < self.threshold:
+            return None
+        _, summary = self._entries[slots[best]]
+        return summary, float(similarity[best])
+
+    def _drop(self, slot: int) -> None:
+        """Unlink an occupied slot from the band buckets and the summary map."""
+        namespace, summary = self._entries[slot]
+        for key in self._band_keys(self._signatures[slot], namespace):
+            bucket = self._buckets[key]
+            bucket.remove(slot)
+            if not bucket:
+                del self._buckets[key]
+        slots = self._by_summary[summary]
+        slots.remove(slot)
+        if not slots:
+            del self._by_summary[summary]
+        self._entries[slot] = None
+
+    def add(self, text: str, namespace: str, summary: str) -> None:
+        """Index a summarized input, overwriting the oldest entry when full."""
+        if self.max_entries <= 0:
+            return
+        signature = self.signature(text)
+        if signature is None:
+            return
+
+        slot = self._added % self.max_entries
+        if slot < len(self._entries):
+            if self._entries[slot] is not None:
+                self._drop(slot)
+        else:
+            if slot >= len(self._signatures):
+                size = min(self.max_entries, max(1024, 2 * len(self._signatures)))
+                grown = np.zeros((size, self.num_perm), dtype=np.uint32)
+                grown[:len(self._signatures)] = self._signatures
+                self._signatures = grown
+            self._entries.append(None)
+
+        self._signatures[slot] = signature
+        self._entries[slot] = (namespace, summary)
+        for key in self._band_keys(signature, namespace):
+            self._buckets.setdefault(key, []).append(slot)
+        self._by_summary.setdefault(summary, []).append(slot)
+        self._added += 1
+
+    def discard(self, summary: str) -> int:
+        """Drop every entry that would return ``summary``; returns how many were dropped."""
+        slots = list(self._by_summary.get(summary, ()))
+        for slot in slots:
+            self._drop(slot)
+        return len(slots)
+
+    def on_store_event(self, event: str, record) -> None:
+        """Summary store listener: stop reusing summaries that were deleted."""
+        if event == "clear":
+            self.clear()
+        elif event == "delete" and record is not None:
+            self.discard(record.summary)
+            # Summaries generated for the other lengths in the same call
+            for summary in ((record.extra or {}).get("summaries") or {}).values():
+                if isinstance(summary, str):
+                    self.discard(summary)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self._signatures = np.zeros((0, self.num_perm), dtype=np.uint32)
+        self._entries.clear()
+        self._buckets.clear()
+        self._by_summary.clear()
+        self._added = 0
+
+    def __len__(self) -> int:
+        return sum(1 for entry in self._entries if entry is not None)
+
+
+# Global instance
+near_duplicates = NearDuplicateIndex()
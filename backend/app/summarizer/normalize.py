@@ -0,0 +1,142 @@
+"""Text normalization and deduplication applied before summarization."""
+import re
+import zlib
+from collections import Counter, defaultdict
+from .utils import PAGE_BREAK, estimate_tokens
+from ..config import settings
+
+_INLINE_WS_RE = re.compile(r"[ \t\r\v\u00a0]+")
+_DIGITS_RE = re.compile(r"\d+")
+_PAGE_NUMBER_RE = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$|^-\s*\d+\s*-$", re.IGNORECASE)
+_WORD_RE = re.compile(r"\w+")
+
+# Number of lines at the top and bottom of each page checked for running headers/footers
+_EDGE_LINES = 3
+
+
+def _line_signature(line: str) -> str:
+    """Normalize a line so that running headers differing only in numbers compare equal."""
+    return _DIGITS_RE.sub("#", line.lower())
+
+
+def _strip_page_furniture(pages: list[list[str]]) -> tuple[list[list[str]], int]:
+    """Remove page numbers and headers/footers repeated across pages."""
+    removed = 0
+    if len(pages) < 2:
+        return pages, removed
+
+    repeated: set[str] = set()
+    if len(pages) >= settings.NORMALIZE_MIN_PAGES_FOR_HEADERS:
+        counts = Counter()
+        for lines in pages:
+            edges = lines[:_EDGE_LINES] + lines[-_EDGE_LINES:]
+            counts.update({_line_signature(line) for line in edges if line})
+        threshold = max(2, int(len(pages) * settings.NORMALIZE_HEADER_PAGE_RATIO))
+        repeated = {signature for signature, count in counts.items() if count >= threshold}
+
+    cleaned = []
+    for lines in pages:
+        kept = []
+        last = len(lines) - 1
+        for index, line in enumerate(lines):
+            at_edge = index < _EDGE_LINES or index > last - _EDGE_LINES
+            if at_edge and (_PAGE_NUMBER_RE.match(line) or _line_signature(line) in repeated):
+                removed += 1
+                continue
+            kept.append(line)
+        cleaned.append(kept)
+    return cleaned, removed
+
+
+def _shingles(paragraph: str, size: int) -> set[int]:
+    """Return hashed word shingles of a paragraph."""
+    words = _WORD_RE.findall(paragraph.lower())
+    if len(words) < size:
+        return set()
+    return {
+        zlib.crc32(" ".join(words[i:i + size]).encode("utf-8"))
+        for i in range(len(words) - size + 1)
+    }
+
+
+def _dedupe_paragraphs(paragraphs: list[str]) -> tuple[list[str], int]:
+    """Drop exact and near-duplicate paragraphs, keeping the first occurrence."""
+    size = settings.NORMALIZE_SHINGLE_SIZE
+    threshold = settings.NORMALIZE_DUPLICATE_THRESHOLD
+    seen_exact: set[str] = set()
+    shingle_index: dict[int, list[int]] = defaultdict(list)
+    shingle_sets: list[set[int]] = []
+    kept = []
+    removed = 0
+
+    for paragraph in paragraphs:
+        key = paragraph.lower()
+        if len(paragraph) >= settings.NORMALIZE_MIN_DUPLICATE_CHARS and key in seen_exact:
+            removed += 1
+            continue
+
+        shingles = _shingles(paragraph, size)
+        if shingles:
+            overlap = Counter()
+            for shingle in shingles:
+                overlap.update(shingle_index.get(shingle, ()))
+            duplicate = any(
+                shared / len(shingles | shingle_sets[other]) >= threshold
+                for other, shared in overlap.items()
+            )
+            if duplicate:
+                removed += 1
+                continue
+            position = len(shingle_sets)
+            shingle_sets.append(shingles)
+            for shingle in shingles:
+                shingle_index[shingle].append(position)
+
+        seen_exact.add(key)
+        kept.append(paragraph)
+    return kept, removed
+
+
+def normalize_text(text: str) -> tuple[str, dict]:
+    """
+    Clean extracted text before it is sent to the summarization engine.
+
+    Collapses whitespace runs, removes page numbers and headers/footers that
+    repeat across pages (pages are separated by form feeds), and drops exact
+    and near-duplicate paragraphs using word-shingle hashing.
+
+    Args:
+        text: Extracted text
+
+    Returns:
+        Tuple of the cleaned text and statistics about what was removed
+    """
+    pages = []
+    for page in text.split(PAGE_BREAK):
+        lines = (_INLINE_WS_RE.sub(" ", line).strip() for line in page.split("\n"))
+        pages.append(list(lines))
+
+    pages, furniture_removed = _strip_page_furniture(pages)
+
+    paragraphs = []
+    for lines in pages:
+        current = []
+        for line in lines + [""]:
+            if line:
+                current.append(line)
+            elif current:
+                paragraphs.append("\n".join(current))
+                current = []
+
+    paragraphs, duplicates_removed = _dedupe_paragraphs(paragraphs)
+    cleaned = "\n\n".join(paragraphs)
+
+    stats = {
+        "chars_before": len(text),
+        "chars_after": len(cleaned),
+        "chars_saved": len(text) - len(cleaned),
+        "tokens_saved": max(0, estimate_tokens(text) - estimate_tokens(cleaned)),
+        "header_footer_lines_removed": furniture_removed,
+        "duplicate_paragraphs_removed": duplicates_removed,
+    }
+    return cleaned, stats
@@ -0,0 +1,201 @@
+"""Cost- and latency-aware routing of model calls across deployments."""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from ..config import settings
+from ..metrics import metrics
+
+
+class Route:
+    """A configured model deployment and the requests it should serve."""
+
+    __slots__ = ("name", "deployment", "max_input_tokens", "lengths", "input_cost_per_1k",
+                 "output_cost_per_1k", "latency_slo", "params", "latency_ewma", "latency_updated", "probing")
+
+    def __init__(
+        self,
+        name: str,
+        deployment: str,
+        max_input_tokens: Optional[int] = None,
+        lengths: Optional[list[str]] = None,
+        input_cost_per_1k: float = 0.0,
+        output_cost_per_1k: float = 0.0,
+        latency_slo: Optional[float] = None,
+        params: Optional[dict] = None,
+    ):
+        self.name = name
+        self.deployment = deployment
+        self.max_input_tokens = max_input_tokens
+        self.lengths = set(lengths) if lengths else None
+        self.input_cost_per_1k = input_cost_per_1k
+        self.output_cost_per_1k = output_cost_per_1k
+        self.latency_slo = latency_slo if latency_slo is not None else settings.MODEL_ROUTING_LATENCY_SLO_SECONDS
+        # Per-route overrides of completion parameters (temperature, max_completion_tokens, ...)
+        self.params = params or {}
+        self.latency_ewma: Optional[float] = None
+        # Monotonic time of the last latency sample (or probe sent), and whether a probe is out
+        self.latency_updated = 0.0
+        self.probing = False
+
+    def degraded(self) -> bool:
+        """Check whether the route's recent latency is over its SLO."""
+        return self.latency_ewma is not None and self.latency_ewma > self.latency_slo
+
+    def accepts(self, input_tokens: int, length: Optional[str]) -> bool:
+        """Check whether the route is configured for this input size and summary length."""
+        if self.max_input_tokens is not None and input_tokens > self.max_input_tokens:
+            return False
+        return length is None or self.lengths is None or length in self.lengths
+
+    def cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        """Return the cost of a call with the given token usage."""
+        return prompt_tokens / 1000 * self.input_cost_per_1k + completion_tokens / 1000 * self.output_cost_per_1k
+
+
+class RouteUsage:
+    """Model calls made for one request, recorded on its summary record."""
+
+    def __init__(self):
+        self.routes: list[str] = []
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "routes": self.routes,
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cost": round(self.cost, 6),
+        }
+
+
+_usage: ContextVar[Optional[RouteUsage]] = ContextVar("route_usage", default=None)
+
+
+@contextmanager
+def track_usage():
+    """Collect the routes, tokens and cost of every model call made inside the block."""
+    usage = RouteUsage()
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
+class ModelRouter:
+    """
+    Pick a deployment for each model call.
+
+    Routes are listed from cheapest/fastest to largest. A call goes to the
+    first route that accepts its input size and summary length, unless that
+    route's recent latency (an EWMA) is over its SLO. In that case the
+    accepting route with the lowest recent latency is used instead. Input too
+    large for every route goes to the route with the largest input limit.
+
+    A degraded route gets no traffic, so its estimate would never improve.
+    Once it has had no samples for ``MODEL_ROUTING_RECOVERY_SECONDS``, it is
+    offered again in its usual place, and the caller that picks it claims
+    a probe with ``start_probe``. A successful probe replaces the stale
+    estimate. A slow or failed probe keeps the route out for another
+    recovery period. A probe that is abandoned before it reports back is
+    released with ``end_probe``.
+    """
+
+    def __init__(self, routes: Optional[list[Route]] = None):
+        """Initialize the router with ``routes``, or from MODEL_ROUTES settings."""
+        if routes is None:
+            routes = [Route(**route) for route in settings.MODEL_ROUTES]
+        if not routes:
+            routes = [Route(
+                "default",
+                settings.AZURE_OPENAI_DEPLOYMENT_NAME,
+                input_cost_per_1k=settings.MODEL_DEFAULT_INPUT_COST_PER_1K,
+                output_cost_per_1k=settings.MODEL_DEFAULT_OUTPUT_COST_PER_1K,
+            )]
+        self.routes = routes
+
+    def candidates(self, input_tokens: int, length: Optional[str] = None) -> list[Route]:
+        """Return the routes able to serve a call, in preference order."""
+        accepting = [route for route in self.routes if route.accepts(input_tokens, length)]
+        if not accepting:
+            largest = max(
+                self.routes, key=lambda route: float("inf") if route.max_input_tokens is None else route.max_input_tokens
+            )
+            return [largest]
+        now = time.monotonic()
+        recovery = settings.MODEL_ROUTING_RECOVERY_SECONDS
+        healthy = [
+            r for r in accepting
+            if not r.degraded() or (not r.probing and now - r.latency_updated >= recovery)
+        ]
+        degraded = sorted((r for r in accepting if r not in healthy), key=lambda route: route.latency_ewma)
+        return healthy + degraded
+
+    def start_probe(self, route: Route) -> bool:
+        """
+        Claim the probe of a degraded route about to be called.
+
+        Returns:
+            True if this call is the probe and must be ended with ``end_probe``
+        """
+        if not route.degraded() or route.probing:
+            return False
+        # Only this call probes; the route stays out until the probe reports back
+        route.probing = True
+        route.latency_updated = time.monotonic()
+        metrics.inc(f"route_{route.name}_probes_total")
+        return True
+
+    def end_probe(self, route: Route) -> None:
+        """Release a probe that finished without a sample (e.g. cancelled while queued)."""
+        route.probing = False
+
+    def choose(self, input_tokens: int, length: Optional[str] = None) -> Route:
+        """Return the route a call should use."""
+        return self.candidates(input_tokens, length)[0]
+
+    def _observe(self, route: Route, latency: float, failed: bool = False) -> None:
+        route.latency_updated = time.monotonic()
+        if route.probing:
+            route.probing = False
+            if failed:
+                return
+            # The old estimate kept the route out of rotation; the probe is the only fresh sample
+            route.latency_ewma = latency
+        else:
+            alpha = settings.MODEL_ROUTING_EWMA_ALPHA
+            route.latency_ewma = (
+                latency if route.latency_ewma is None else alpha * latency + (1 - alpha) * route.latency_ewma
+            )
+        metrics.set_gauge(f"route_{route.name}_latency_ewma_seconds", round(route.latency_ewma, 4))
+
+    def record(self, route: Route, latency: float, prompt_tokens: int = 0, completion_tokens: int = 0) -> None:
+        """Record a finished call's latency, token usage and cost."""
+        self._observe(route, latency)
+        cost = route.cost(prompt_tokens, completion_tokens)
+        metrics.inc(f"route_{route.name}_calls_total")
+        metrics.inc(f"route_{route.name}_cost_total", cost)
+
+        usage = _usage.get()
+        if usage is not None:
+            if route.name not in usage.routes:
+                usage.routes.append(route.name)
+            usage.calls += 1
+            usage.prompt_tokens += prompt_tokens
+            usage.completion_tokens += completion_tokens
+            usage.cost += cost
+
+    def record_failure(self, route: Route, latency: float) -> None:
+        """Count a failed call's time against the route's latency estimate."""
+        self._observe(route, latency, failed=True)
+        metrics.inc(f"route_{route.name}_errors_total")
+
+    def stats(self) -> dict:
+        """Return each route's current latency estimate."""
+        return {route.name: {"deployment": route.deployment, "latency_ewma": route.latency_ewma} for route in self.routes}
@@ -0,0 +1,209 @@
+"""Per-user fair scheduling of upstream LLM capacity."""
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from typing import Literal, Optional
+from .engine import engine
+from .limiter import AdaptiveLimiter
+from ..config import settings
+from ..errors import QuotaExceededError
+from ..logger import logger
+
+Lane = Literal["interactive", "batch", "background"]
+
+# Lanes in strict priority order
+LANES: tuple[str, ...] = ("interactive", "batch", "background")
+
+# Guests get a fresh ID per request, so they share one queue flow and one quota
+GUEST_FLOW = "guest_*"
+
+# An emptied bucket refills completely within a minute
+_BUCKET_IDLE_SECONDS = 60.0
+
+
+class _Job:
+    """A request waiting for an upstream slot."""
+
+    __slots__ = ("user_id", "future")
+
+    def __init__(self, user_id: str, future: asyncio.Future):
+        self.user_id = user_id
+        self.future = future
+
+
+class FairScheduler:
+    """
+    Weighted fair queuing of summarization work across users.
+
+    At most ``capacity`` jobs hold a slot at once. With an enabled
+    ``limiter``, the capacity follows its adaptive limit, so excess work
+    waits here, in its lane, instead of in the limiter's FIFO queue.
+    Otherwise it is ``max_concurrency``. Waiting jobs are served from the highest-priority non-empty lane. Within a lane, the job
+    with the smallest virtual finish tag goes first. The tag advances by
+    cost / weight per job, so a user with a large backlog cannot starve
+    others in the same lane. Each user also has a token-per-minute quota
+    enforced with a token bucket. Guests count as a single user with their
+    own quota, since their IDs change on every request.
+
+    Per-user state is pruned as it stops mattering: buckets once they have
+    refilled, and finish tags once the lane's virtual time has passed them.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = settings.SCHEDULER_MAX_CONCURRENCY,
+        tokens_per_minute: int = settings.SCHEDULER_USER_TOKENS_PER_MINUTE,
+        guest_tokens_per_minute: int = settings.SCHEDULER_GUEST_TOKENS_PER_MINUTE,
+        limiter: Optional[AdaptiveLimiter] = None,
+    ):
+        """Initialize the scheduler with its slot count, upstream limiter and per-user and guest quotas."""
+        self.max_concurrency = max_concurrency
+        self.limiter = limiter
+        self.tokens_per_minute = tokens_per_minute
+        self.guest_tokens_per_minute = guest_tokens_per_minute
+        self.running = 0
+        self._queues: dict[str, list] = {lane: [] for lane in LANES}
+        self._virtual_time: dict[str, float] = {lane: 0.0 for lane in LANES}
+        self._finish_tags: dict[str, dict[str, float]] = {lane: {} for lane in LANES}
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._last_prune = time.monotonic()
+        self._sequence = itertools.count()
+
+    def stats(self) -> dict:
+        """Return current scheduler statistics."""
+        return {
+            "running": self.running,
+            "capacity": self.capacity,
+            "queued": {lane: len(queue) for lane, queue in self._queues.items()},
+        }
+
+    @property
+    def capacity(self) -> int:
+        """Return how many jobs may hold a slot right now."""
+        if self.limiter is not None and self.limiter.enabled:
+            return int(self.limiter.limit)
+        return self.max_concurrency
+
+    @staticmethod
+    def _flow(user_id: str) -> str:
+        """Return the key a user is queued and charged under."""
+        return GUEST_FLOW if user_id.startswith("guest_") else user_id
+
+    def _prune_buckets(self, now: float) -> None:
+        """Drop buckets idle long enough to be full again; a missing bucket counts as full."""
+        if now - self._last_prune < _BUCKET_IDLE_SECONDS:
+            return
+        self._last_prune = now
+        self._buckets = {
+            flow: bucket for flow, bucket in self._buckets.items() if now - bucket[1] < _BUCKET_IDLE_SECONDS
+        }
+
+    def _charge(self, flow: str, cost: int) -> None:
+        """Take ``cost`` tokens from the flow's bucket or raise QuotaExceededError."""
+        limit = self.guest_tokens_per_minute if flow == GUEST_FLOW else self.tokens_per_minute
+        if limit <= 0:
+            return
+        capacity = float(limit)
+        rate = capacity / 60.0
+        now = time.monotonic()
+        self._prune_buckets(now)
+        tokens, updated = self._buckets.get(flow, (capacity, now))
+        tokens = min(capacity, tokens + (now - updated) * rate)
+
+        # A single request larger than the whole quota only needs a full bucket
+        needed = min(float(cost), capacity)
+        if tokens < needed:
+            self._buckets[flow] = (tokens, now)
+            retry_after = int((needed - tokens) / rate) + 1
+            raise QuotaExceededError(f"Token quota of {limit} per minute exceeded; retry in {retry_after}s")
+        self._buckets[flow] = (tokens - needed, now)
+
+    def _has_waiters(self) -> bool:
+        return any(self._queues.values())
+
+    def _enqueue(self, flow: str, lane: str, cost: int, weight: float) -> asyncio.Future:
+        tags = self._finish_tags[lane]
+        start = max(self._virtual_time[lane], tags.get(flow, 0.0))
+        finish = start + max(cost, 1) / weight
+        tags[flow] = finish
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queues[lane], (finish, next(self._sequence), start, _Job(flow, future)))
+        return future
+
+    def _prune_tags(self, lane: str) -> None:
+        """Forget finish tags the lane's virtual time has passed; they no longer delay anyone."""
+        tags = self._finish_tags[lane]
+        # Amortized: only flows with queued jobs can hold tags ahead of virtual time
+        if len(tags) <= 2 * len(self._queues[lane]) + 16:
+            return
+        virtual_time = self._virtual_time[lane]
+        self._finish_tags[lane] = {flow: tag for flow, tag in tags.items() if tag > virtual_time}
+
+    def _dispatch(self) -> bool:
+        """Hand a free slot to the next waiting job; return False if none is waiting."""
+        for lane in LANES:
+            queue = self._queues[lane]
+            while queue:
+                _, _, start, job = heapq.heappop(queue)
+                if job.future.done():
+                    continue
+                self._virtual_time[lane] = start
+                if not queue:
+                    # Lane is idle again; old finish tags no longer matter
+                    self._finish_tags[lane].clear()
+                else:
+                    self._prune_tags(lane)
+                job.future.set_result(None)
+                return True
+        return False
+
+    def _release(self) -> None:
+        self.running -= 1
+        # The capacity may have grown or shrunk since the slot was taken
+        while self.running < self.capacity and self._dispatch():
+            self.running += 1
+
+    @asynccontextmanager
+    async def slot(self, user_id: str, lane: Lane = "interactive", cost: int = 1, weight: float = 1.0):
+        """
+        Hold an upstream slot for the duration of the block.
+
+        Args:
+            user_id: User the work is done for
+            lane: Priority lane (interactive, batch, background)
+            cost: Estimated tokens the work will consume
+            weight: Relative share of the user within the lane
+
+        Raises:
+            QuotaExceededError: If the user's token quota is exhausted
+        """
+        if lane not in self._queues:
+            raise ValueError(f"Unknown scheduling lane: {lane}")
+        flow = self._flow(user_id)
+        self._charge(flow, cost)
+
+        if self.running < self.capacity and not self._has_waiters():
+            self.running += 1
+        else:
+            future = self._enqueue(flow, lane, cost, weight)
+            logger.debug(f"Queued {lane} job for user {user_id} ({self.running} running)")
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # The slot was granted just as we were cancelled
+                    self._release()
+                else:
+                    future.cancel()
+                raise
+
+        try:
+            yield
+        finally:
+            self._release()
+
+
+# Global instance
+scheduler = FairScheduler(limiter=engine.limiter)
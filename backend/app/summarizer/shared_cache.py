@@ -0,0 +1,196 @@
+"""Cross-process cache table in a memory-mapped file, shared by all workers."""
+import hashlib
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+from ..config import settings
+from ..logger import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, so the shared table is unavailable
+    fcntl = None
+
+_MAGIC = b"GSCT"
+_VERSION = 1
+_FILE_HEADER = struct.Struct("<4sIII")  # magic, version, slot count, slot size
+_FILE_HEADER_SIZE = 64
+_COUNTER_OFFSET = 16  # u64 write counter used as the eviction clock
+
+# Slot layout: seq (u32), stamp (u32), key digest (16 bytes), value length (u32), value
+_U32 = struct.Struct("<I")
+_STAMP_OFFSET = 4
+_KEY_OFFSET = 8
+_KEY_SIZE = 16
+_LENGTH_OFFSET = _KEY_OFFSET + _KEY_SIZE
+_SLOT_HEADER_SIZE = _LENGTH_OFFSET + 4
+_EMPTY_KEY = bytes(_KEY_SIZE)
+
+# Slots probed per key, and read attempts while a writer holds a slot
+MAX_PROBE = 8
+READ_RETRIES = 4
+
+
+def shared_tables_supported() -> bool:
+    """Return True if the platform supports the cross-process file lock the table needs."""
+    return fcntl is not None
+
+
+class SharedTable:
+    """
+    Fixed-size open-addressing hash table in a memory-mapped file.
+
+    Every process that opens the same file sees the same entries, so
+    several uvicorn workers share one warm cache. Keys are hashed to a
+    16-byte digest and placed with linear probing over ``MAX_PROBE`` slots.
+    When the probe window is full, the least recently written slot in it is
+    overwritten.
+
+    Writers serialise on an ``flock`` of the file. Readers take no lock:
+    each slot carries a sequence number that a writer makes odd while it
+    rewrites the slot and even again afterwards (a seqlock). A reader that
+    sees the number change, or sees it odd, retries and otherwise treats the
+    lookup as a miss.
+    """
+
+    def __init__(self, path: str, slots: int, slot_size: int):
+        """
+        Open or create the table file.
+
+        Args:
+            path: Table file, shared by every process using the table
+            slots: Number of slots
+            slot_size: Bytes per slot; values up to slot_size - 28 bytes fit
+        """
+        if fcntl is None:
+            raise RuntimeError("Shared cache tables require fcntl (POSIX)")
+        self.path = Path(path)
+        self.slots = slots
+        self.slot_size = slot_size
+        self.capacity = slot_size - _SLOT_HEADER_SIZE
+        self._thread_lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        size = _FILE_HEADER_SIZE + slots * slot_size
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._write_lock():
+            header = os.pread(self._fd, _FILE_HEADER.size, 0)
+            expected = _FILE_HEADER.pack(_MAGIC, _VERSION, slots, slot_size)
+            if header != expected:
+                if header.strip(b"\0"):
+                    logger.warning(f"Recreating shared cache {self.path.name} with a new layout")
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, size)
+                os.pwrite(self._fd, expected, 0)
+        self._map = mmap.mmap(self._fd, size)
+
+    @contextmanager
+    def _write_lock(self):
+        with self._thread_lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _digest(key: str) -> bytes:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=_KEY_SIZE).digest()
+        # An all-zero digest marks an empty slot
+        return digest if digest != _EMPTY_KEY else b"\x01" + digest[1:]
+
+    def _offsets(self, digest: bytes):
+        start = int.from_bytes(digest[:8], "little") % self.slots
+        for probe in range(min(MAX_PROBE, self.slots)):
+            yield _FILE_HEADER_SIZE + ((start + probe) % self.slots) * self.slot_size
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value stored under ``key``, or None. Takes no lock."""
+        digest = self._digest(key)
+        memory = self._map
+        for offset in self._offsets(digest):
+            for _ in range(READ_RETRIES):
+                seq = _U32.unpack_from(memory, offset)[0]
+                if seq & 1:
+                    continue
+                stored = memory[offset + _KEY_OFFSET:offset + _LENGTH_OFFSET]
+                if stored == _EMPTY_KEY and _U32.unpack_from(memory, offset)[0] == seq:
+                    # Entries are never removed, so an empty slot ends the probe chain
+                    return None
+                if stored != digest:
+                    break
+                length = _U32.unpack_from(memory, offset + _LENGTH_OFFSET)[0]
+                start = offset + _SLOT_HEADER_SIZE
+                value = memory[start:start + min(length, self.capacity)]
+                if _U32.unpack_from(memory, offset)[0] == seq:
+                    return value
+        return None
+
+    def set(self, key: str, value: bytes) -> bool:
+        """
+        Store ``value`` under ``key``.
+
+        Returns:
+            False if the value is larger than a slot, True otherwise
+        """
+        if len(value) > self.capacity:
+            return False
+        digest = self._digest(key)
+        memory = self._map
+        with self._write_lock():
+            target = None
+            oldest = None
+            for offset in self._offsets(digest):
+                stored = memory[offset + _KEY_OFFSET:offset + _LENGTH_OFFSET]
+                if stored == digest or stored == _EMPTY_KEY:
+                    target = offset
+                    break
+                stamp = _U32.unpack_from(memory, offset + _STAMP_OFFSET)[0]
+                if oldest is None or stamp < oldest[0]:
+                    oldest = (stamp, offset)
+            if target is None:
+                target = oldest[1]
+
+            counter = struct.unpack_from("<Q", memory, _COUNTER_OFFSET)[0] + 1
+            struct.pack_into("<Q", memory, _COUNTER_OFFSET, counter)
+            seq = _U32.unpack_from(memory, target)[0]
+            _U32.pack_into(memory, target, (seq + 1) & 0xFFFFFFFF)
+            _U32.pack_into(memory, target + _STAMP_OFFSET, counter & 0xFFFFFFFF)
+            memory[target + _KEY_OFFSET:target + _LENGTH_OFFSET] = digest
+            _U32.pack_into(memory, target + _LENGTH_OFFSET, len(value))
+            memory[target + _SLOT_HEADER_SIZE:target + _SLOT_HEADER_SIZE + len(value)] = value
+            _U32.pack_into(memory, target, (seq + 2) & 0xFFFFFFFF)
+        return True
+
+    def clear(self) -> None:
+        """Remove every entry, in every process sharing the table."""
+        with self._write_lock():
+            self._map[_FILE_HEADER_SIZE:] = bytes(self.slots * self.slot_size)
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+def open_shared_table(name: str, slots: int, slot_size: int) -> Optional[SharedTable]:
+    """
+    Open a shared table under SHARED_CACHE_DIR when shared caching is enabled.
+
+    Returns:
+        The table, or None if shared caching is disabled or unavailable
+    """
+    if not settings.SHARED_CACHE_ENABLED or slots <= 0:
+        return None
+    if not shared_tables_supported():
+        logger.warning("Shared cache requested but not supported on this platform")
+        return None
+    try:
+        return SharedTable(os.path.join(settings.SHARED_CACHE_DIR, f"{name}.tbl"), slots, slot_size)
+    except OSError as e:
+        logger.warning(f"Could not open shared cache {name}: {str(e)}")
+        return None
@@ -0,0 +1,122 @@
+"""Select a page range of a PDF or a heading section of a DOCX before extraction."""
+import re
+from typing import Iterable, Iterator, Optional
+
+from .docx_stream import DocxBlock
+from ..errors import ValidationError
+
+_HEADING_STYLE = re.compile(r"^heading\s*(\d)$", re.IGNORECASE)
+
+
+def parse_page_range(spec: str) -> list[tuple[int, Optional[int]]]:
+    """
+    Parse a 1-based page range such as ``"3"``, ``"10-24"`` or ``"1-2,7,30-"``.
+
+    Args:
+        spec: Comma-separated pages and inclusive ranges; a range without an end runs to the last page
+
+    Returns:
+        (first, last) pairs of 1-based page numbers, last None for open ranges
+
+    Raises:
+        ValidationError: If the range is malformed
+    """
+    ranges = []
+    for part in spec.replace(" ", "").split(","):
+        match = re.fullmatch(r"(\d+)(?:(-)(\d*))?", part)
+        if not match:
+            raise ValidationError(f"Invalid page range: {spec!r} (expected e.g. '3', '10-24' or '1-2,7,30-')")
+        first = int(match.group(1))
+        last = first if not match.group(2) else (int(match.group(3)) if match.group(3) else None)
+        if first < 1 or (last is not None and last < first):
+            raise ValidationError(f"Invalid page range: {spec!r}")
+        ranges.append((first, last))
+    return ranges
+
+
+def normalize_page_range(spec: str) -> str:
+    """Return a canonical form of a page range, used to key cached extractions."""
+    return ",".join(
+        str(first) if last == first else f"{first}-{last or ''}" for first, last in parse_page_range(spec)
+    )
+
+
+def select_pages(spec: str, page_count: int) -> list[int]:
+    """
+    Resolve a page range against a document.
+
+    Args:
+        spec: Page range accepted by ``parse_page_range``
+        page_count: Number of pages in the document
+
+    Returns:
+        Sorted, de-duplicated 0-based page indices
+
+    Raises:
+        ValidationError: If the range is malformed or selects no existing page
+    """
+    pages = set()
+    for first, last in parse_page_range(spec):
+        pages.update(range(first - 1, min(last or page_count, page_count)))
+    if not pages:
+        raise ValidationError(f"Page range {spec!r} is outside the document ({page_count} pages)", status_code=422)
+    return sorted(pages)
+
+
+def heading_level(block: DocxBlock) -> Optional[int]:
+    """Return the outline level of a heading paragraph (Title is 0), or None for body text."""
+    if block.kind != "paragraph" or not block.style:
+        return None
+    if block.style.lower() == "title":
+        return 0
+    match = _HEADING_STYLE.match(block.style)
+    return int(match.group(1)) if match else None
+
+
+def _matches(heading: str, section: str) -> bool:
+    heading = " ".join(heading.split()).casefold()
+    section = " ".join(section.split()).casefold()
+    # "3" also matches numbered headings such as "3. Results" or "Chapter 3"
+    return heading == section or heading.startswith(section + " ") or heading.startswith(section + ".") \
+        or heading.endswith(" " + section)
+
+
+def select_section(blocks: Iterable[DocxBlock], section: str) -> Iterator[DocxBlock]:
+    """
+    Yield the blocks of the first heading section whose title matches ``section``.
+
+    A section starts at a heading paragraph (a ``Heading N`` or ``Title``
+    style) whose text equals ``section``, ignoring case and spacing, or
+    begins with it as a number ("3" matches "3. Results"). It runs until the
+    next heading at the same or a higher level, so subsections are included.
+    Iteration stops there, so the rest of the document is never parsed.
+
+    Args:
+        blocks: Document blocks in order, e.g. from ``iter_docx_blocks``
+        section: Heading text or number to look for
+
+    Yields:
+        The heading and the blocks under it
+    """
+    level = None
+    for block in blocks:
+        current = heading_level(block)
+        if level is None:
+            if current is not None and _matches(block.text, section):
+                level = current
+                yield block
+        elif current is not None and current <= level:
+            return
+        else:
+            yield block
+
+
+def list_headings(blocks: Iterable[DocxBlock], limit: int = 20) -> list[str]:
+    """Return up to ``limit`` heading titles, to suggest valid sections in error messages."""
+    headings = []
+    for block in blocks:
+        if heading_level(block) is not None:
+            headings.append(block.text)
+            if len(headings) >= limit:
+                break
+    return headings
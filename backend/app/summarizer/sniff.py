@@ -0,0 +1,167 @@
+"""Cheap format sniffing and early rejection of uploads before full extraction."""
+import codecs
+import io
+import zipfile
+from typing import Optional, Sequence
+
+import PyPDF2
+
+from ..config import settings
+from ..errors import ExtractionError, FileFormatError
+from ..logger import logger
+
+# Bytes read from an upload before deciding whether to read the rest
+SNIFF_BYTES = 8192
+
+PDF_MAGIC = b"%PDF-"
+ZIP_MAGIC = b"PK\x03\x04"
+OLE_MAGIC = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"  # Legacy .doc and password-protected Office files
+
+# Unicode byte order marks; UTF-32 LE starts with the UTF-16 LE mark, so it is checked first
+TEXT_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+def text_encoding(head: bytes) -> str:
+    """Return the codec for text starting with ``head``: the one its BOM names, or UTF-8."""
+    for bom, encoding in TEXT_BOMS:
+        if head.startswith(bom):
+            return encoding
+    return "utf-8"
+
+
+def _is_text(head: bytes) -> bool:
+    """Check whether leading bytes look like text: BOM-marked and decodable, or free of NUL bytes."""
+    encoding = text_encoding(head)
+    if encoding == "utf-8":
+        return b"\x00" not in head
+    try:
+        # Incremental, since the head may end in the middle of a character
+        codecs.getincrementaldecoder(encoding)().decode(head, final=False)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def sniff_format(head: bytes) -> Optional[str]:
+    """
+    Guess a document format from its first bytes.
+
+    Args:
+        head: Leading bytes of the document
+
+    Returns:
+        "pdf", "zip", "ole" or "txt", or None for unrecognised binary data
+    """
+    # The PDF header may be preceded by junk, but must be within the first 1KB
+    if PDF_MAGIC in head[:1024]:
+        return "pdf"
+    if head.startswith(ZIP_MAGIC):
+        return "zip"
+    if head.startswith(OLE_MAGIC):
+        return "ole"
+    if _is_text(head):
+        return "txt"
+    return None
+
+
+def _is_docx(content: bytes) -> bool:
+    """Check the zip container for a Word main document part (reads only the directory)."""
+    try:
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            return "word/document.xml" in archive.namelist()
+    except zipfile.BadZipFile:
+        return False
+
+
+def check_head(head: bytes, declared: str) -> None:
+    """
+    Reject an upload from its first bytes when it cannot be the declared format.
+
+    Args:
+        head: Leading bytes of the upload (at least ``SNIFF_BYTES`` if available)
+        declared: Format from the file extension (txt, pdf, docx)
+
+    Raises:
+        FileFormatError: If the content is not a supported document
+    """
+    sniffed = sniff_format(head)
+    if sniffed == "ole":
+        raise FileFormatError("Legacy .doc and password-protected Office files are not supported")
+    if sniffed is None:
+        raise FileFormatError(f"File content is not a {declared.upper()} document")
+    if sniffed == "txt" and declared != "txt":
+        raise FileFormatError(f"File content is not a {declared.upper()} document")
+
+
+def probe_pdf(reader: PyPDF2.PdfReader, indexes: Sequence[int]) -> list[str]:
+    """
+    Make sure a PDF has an extractable text layer, before the rest is extracted.
+
+    Extracts the first ``SNIFF_PDF_PROBE_PAGES`` of the pages about to be
+    extracted. If none of them has text, the PDF is only rejected when none
+    of them references a font either, i.e. they are image-only (scanned). A
+    blank cover page within the probed pages does not cause a false
+    rejection.
+
+    Args:
+        reader: Open PDF reader; pages are decoded lazily
+        indexes: 0-based pages that will be extracted, in order
+
+    Returns:
+        Text of the probed pages, for the caller to reuse
+
+    Raises:
+        ExtractionError: If the PDF is encrypted or the probed pages have no text layer
+    """
+    if reader.is_encrypted:
+        raise ExtractionError("Encrypted PDFs are not supported")
+    probed = [reader.pages[index] for index in indexes[:settings.SNIFF_PDF_PROBE_PAGES]]
+    texts = [page.extract_text() or "" for page in probed]
+    if not probed or any(text.strip() for text in texts):
+        return texts
+    for page in probed:
+        resources = page.get("/Resources")
+        if resources is not None and resources.get_object().get("/Font"):
+            return texts
+    raise ExtractionError("PDF has no text layer (scanned or image-only document)")
+
+
+def check_document(content: bytes, declared: str) -> str:
+    """
+    Verify an upload's format from its content and return the format to parse it as.
+
+    Magic bytes and container structure take precedence over the file
+    extension, so a mislabeled PDF or DOCX is still parsed correctly. Only
+    the zip directory is read; PDFs are probed for a text layer during
+    extraction (see ``probe_pdf``), so repeat uploads served from the
+    extraction cache are never parsed.
+
+    Args:
+        content: Uploaded file content
+        declared: Format from the file extension (txt, pdf, docx)
+
+    Returns:
+        Format to extract the content as
+
+    Raises:
+        FileFormatError: If the content is not a supported document
+    """
+    head = content[:SNIFF_BYTES]
+    sniffed = sniff_format(head)
+    if sniffed == "zip":
+        if not _is_docx(content):
+            raise FileFormatError("Zip archive is not a Word (DOCX) document")
+        sniffed = "docx"
+    elif sniffed != "pdf":
+        check_head(head, declared)
+        return declared
+
+    if sniffed != declared:
+        logger.warning(f"Upload declared as {declared} is a {sniffed} document; parsing as {sniffed}")
+    return sniffed
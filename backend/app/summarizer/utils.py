@@ -1,44 +1,127 @@
 """Text extraction utilities for multiple document formats."""
 import io
-from typing import Literal
+from typing import Iterator, Literal, Optional
 from pathlib import Path
 import requests
 from bs4 import BeautifulSoup
 import PyPDF2
 from docx import Document
-from ..errors import FileFormatError, ExtractionError, FileSizeError, URLFetchError
+from .docx_stream import DocxBlock, docx_blocks_to_text, iter_docx_blocks
+from .extraction_cache import extraction_cache
+from .slicing import list_headings, normalize_page_range, select_pages, select_section
+from .sniff import probe_pdf, text_encoding
+from ..deadline import timeout_for
+from ..errors import (
+    FileFormatError, ExtractionError, FileSizeError, SummarizerException, URLFetchError, ValidationError,
+)
 from ..logger import logger
 from ..config import settings
+from ..profiling import to_thread
+from ..tracing import span
 
+# Separator placed between pages of extracted PDF text
+PAGE_BREAK = "\f"
 
-async def extract_text_from_pdf(file_content: bytes) -> str:
-    """Extract text from PDF file content."""
+
+# Parsing and fetching block, so the extractors run them in worker threads
+# to keep the event loop free for other requests
+
+
+def _read_pdf(file_content: bytes, page_range: Optional[str] = None) -> str:
+    """
+    Parse PDF bytes and return the text of every page, or only of the pages in ``page_range``.
+
+    The first pages are probed for a text layer, so scanned documents fail
+    before the rest is extracted.
+    """
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+    pages = pdf_reader.pages
+    # Pages are parsed lazily, so unselected pages are never decoded
+    indexes = select_pages(page_range, len(pages)) if page_range is not None else range(len(pages))
+    texts = probe_pdf(pdf_reader, indexes)
+    texts.extend(pages[index].extract_text() for index in indexes[len(texts):])
+    return PAGE_BREAK.join(texts)
+
+
+def _read_docx(file_content: bytes, section: Optional[str] = None) -> str:
+    """Stream paragraph and table text out of DOCX bytes, falling back to python-docx."""
+    if section is not None:
+        return _read_docx_section(file_content, section)
+    try:
+        text = docx_blocks_to_text(iter_docx_blocks(file_content))
+        if text:
+            return text
+    except Exception as e:
+        logger.warning(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+    return _read_docx_document(file_content)
+
+
+def _read_docx_section(file_content: bytes, section: str) -> str:
+    """Return the text of one heading section, stopping the stream at the section's end."""
+    try:
+        text = docx_blocks_to_text(select_section(iter_docx_blocks(file_content), section))
+        blocks = iter_docx_blocks
+    except Exception as e:
+        logger.warning(f"Streaming DOCX extraction failed, falling back to python-docx: {str(e)}")
+        text = docx_blocks_to_text(select_section(_iter_docx_paragraphs(file_content), section))
+        blocks = _iter_docx_paragraphs
+    if not text:
+        headings = list_headings(blocks(file_content))
+        available = f" Headings: {'; '.join(headings)}" if headings else " The document has no headings."
+        raise ValidationError(f"Section {section!r} not found.{available}", status_code=422)
+    return text
+
+
+def _iter_docx_paragraphs(file_content: bytes) -> Iterator[DocxBlock]:
+    """Yield DOCX paragraphs with their style IDs via python-docx."""
+    for paragraph in Document(io.BytesIO(file_content)).paragraphs:
+        if paragraph.text.strip():
+            yield DocxBlock(paragraph.text.strip(), "paragraph", paragraph.style.style_id if paragraph.style else None)
+
+
+def _read_docx_document(file_content: bytes) -> str:
+    """Parse DOCX bytes with python-docx and return paragraph and table text."""
+    doc = Document(io.BytesIO(file_content))
+    text = ""
+    for paragraph in doc.paragraphs:
+        text += paragraph.text + "\n"
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                text += cell.text + " "
+            text += "\n"
+    return text
+
+
+async def extract_text_from_pdf(file_content: bytes, page_range: Optional[str] = None) -> str:
+    """Extract text from PDF file content, optionally only from the pages in ``page_range``."""
     try:
-        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text()
+        with span("extract_pdf", bytes=len(file_content)) as current:
+            if page_range is not None:
+                current.set_attribute("page_range", page_range)
+            text = await to_thread(_read_pdf, file_content, page_range)
+            current.set_attribute("chars", len(text))
         logger.info("Successfully extracted text from PDF")
         return text
+    except SummarizerException:
+        raise
     except Exception as e:
         logger.error(f"PDF extraction failed: {str(e)}")
         raise ExtractionError(f"Failed to extract text from PDF: {str(e)}")
 
 
-async def extract_text_from_docx(file_content: bytes) -> str:
-    """Extract text from DOCX file content."""
+async def extract_text_from_docx(file_content: bytes, section: Optional[str] = None) -> str:
+    """Extract text from DOCX file content, optionally only from one heading section."""
     try:
-        doc = Document(io.BytesIO(file_content))
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    text += cell.text + " "
-                text += "\n"
+        with span("extract_docx", bytes=len(file_content)) as current:
+            if section is not None:
+                current.set_attribute("section", section)
+            text = await to_thread(_read_docx, file_content, section)
+            current.set_attribute("chars", len(text))
         logger.info("Successfully extracted text from DOCX")
         return text
+    except SummarizerException:
+        raise
     except Exception as e:
         logger.error(f"DOCX extraction failed: {str(e)}")
         raise ExtractionError(f"Failed to extract text from DOCX: {str(e)}")
@@ -50,7 +133,9 @@ async def extract_text_from_url(url: str) -> str:
         headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        with span("extract_url", url=url) as current:
+            response = await to_thread(requests.get, url, headers=headers, timeout=timeout_for(10))
+            current.set_attribute("http.status_code", response.status_code)
         response.raise_for_status()
 
         soup = BeautifulSoup(response.content, "html.parser")
@@ -74,32 +159,67 @@ async def extract_text_from_url(url: str) -> str:
         raise ExtractionError(f"Failed to extract text from URL: {str(e)}")
 
 
-async def extract_text(content: str | bytes, format_type: Literal["txt", "pdf", "docx", "url"]) -> str:
+async def _extract_cached(content: bytes, format_type: str, extractor, selection: Optional[str] = None) -> str:
+    """Run a binary extractor, reusing the cached result for identical uploads and selections."""
+    if not settings.EXTRACTION_CACHE_ENABLED:
+        return await extractor(content, selection)
+
+    cache_format = format_type if selection is None else f"{format_type}[{selection}]"
+    text = extraction_cache.get(content, cache_format)
+    if text is not None:
+        logger.info(f"Extraction cache hit for {format_type} upload ({len(content)} bytes)")
+        return text
+
+    text = await extractor(content, selection)
+    extraction_cache.set(content, cache_format, text)
+    return text
+
+
+async def extract_text(
+    content: str | bytes,
+    format_type: Literal["txt", "pdf", "docx", "url"],
+    page_range: Optional[str] = None,
+    section: Optional[str] = None,
+) -> str:
     """
     Extract text from various document formats.
 
     Args:
         content: File content or URL string
         format_type: Format of the content (txt, pdf, docx, url)
+        page_range: Only extract these 1-based PDF pages, e.g. "10-24" or "1-2,7"
+        section: Only extract the DOCX heading section with this title or number
 
     Returns:
         Extracted text content
+
+    Raises:
+        ValidationError: If a selection does not apply to the format or matches nothing
     """
     try:
+        if page_range is not None and format_type != "pdf":
+            raise ValidationError("page_range is only supported for PDF files")
+        if section is not None and format_type != "docx":
+            raise ValidationError("section is only supported for DOCX files")
+
         if format_type == "txt":
             if isinstance(content, bytes):
-                return content.decode("utf-8", errors="ignore")
+                return content.decode(text_encoding(content[:4]), errors="ignore")
             return content
 
         elif format_type == "pdf":
             if isinstance(content, str):
                 content = content.encode()
-            return await extract_text_from_pdf(content)
+            if page_range is not None:
+                page_range = normalize_page_range(page_range)
+            return await _extract_cached(content, "pdf", extract_text_from_pdf, page_range)
 
         elif format_type == "docx":
             if isinstance(content, str):
                 content = content.encode()
-            return await extract_text_from_docx(content)
+            if section is not None:
+                section = " ".join(section.split())
+            return await _extract_cached(content, "docx", extract_text_from_docx, section)
 
         elif format_type == "url":
             if isinstance(content, bytes):
@@ -114,6 +234,11 @@ async def extract_text(content: str | bytes, format_type: Literal["txt", "pdf",
         raise
 
 
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of model tokens in text (roughly four characters per token)."""
+    return (len(text) + 3) // 4
+
+
 def validate_file_size(file_size: int) -> None:
     """Validate that file size does not exceed maximum allowed."""
     if file_size > settings.MAX_FILE_SIZE:
@@ -0,0 +1,280 @@
+"""Request tracing: spans across the summarization pipeline with pluggable exporters."""
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from .config import settings
+from .logger import logger
+from .profiling import stage
+
+REQUEST_ID_HEADER = "X-Request-ID"
+TRACEPARENT_HEADER = "traceparent"
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "request_id", "name", "start", "duration_ms",
+                 "attributes", "status", "_started")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], request_id: Optional[str], attributes: dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.request_id = request_id
+        self.attributes = attributes
+        self.status = "ok"
+        self.start = time.time()
+        self.duration_ms: Optional[float] = None
+        self._started = time.perf_counter()
+
+    def set_attribute(self, key: str, value) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "request_id": self.request_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter:
+    """Base class for span exporters; subclasses receive every finished span."""
+
+    def export(self, span: Span) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Write finished spans as JSON lines to stderr."""
+
+    def export(self, span: Span) -> None:
+        print(json.dumps(span.to_dict(), default=str), file=sys.stderr, flush=True)
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans as JSON lines to a local file, for offline analysis."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Line-buffered append mode, so worker processes can share the file
+        self._file = open(path, "a", encoding="utf-8", buffering=1)
+
+    def export(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), default=str) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+# Exporter factories selectable through TRACING_EXPORTERS
+EXPORTERS: dict[str, Callable[[], SpanExporter]] = {
+    "console": ConsoleSpanExporter,
+    "file": lambda: FileSpanExporter(settings.TRACING_FILE),
+}
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+class Tracer:
+    """Creates spans and hands finished ones to the registered exporters."""
+
+    def __init__(self, exporters: Optional[list[SpanExporter]] = None):
+        self.exporters: list[SpanExporter] = list(exporters or [])
+
+    @classmethod
+    def from_settings(cls) -> "Tracer":
+        """Build a tracer with the exporters named in TRACING_EXPORTERS."""
+        exporters = []
+        for name in (n.strip() for n in settings.TRACING_EXPORTERS.split(",")):
+            if not name:
+                continue
+            if name not in EXPORTERS:
+                logger.warning(f"Unknown trace exporter: {name}")
+                continue
+            exporters.append(EXPORTERS[name]())
+        return cls(exporters)
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        self.exporters.append(exporter)
+
+    def remove_exporter(self, exporter: SpanExporter) -> None:
+        self.exporters.remove(exporter)
+
+    def _export(self, span: Span) -> None:
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Trace exporter {type(exporter).__name__} failed: {str(e)}")
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """
+        Record a span around the block, as a child of the current span.
+
+        The span is also recorded as a profiling stage when the request is
+        being profiled.
+
+        Args:
+            name: Operation name
+            **attributes: Initial span attributes
+
+        Yields:
+            The active span, for adding attributes
+        """
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        current = Span(name, trace_id, parent.span_id if parent else None, _request_id.get(), attributes)
+        token = _current_span.set(current)
+        try:
+            with stage(name):
+                yield current
+        except BaseException as e:
+            current.status = "error"
+            current.attributes["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            current.duration_ms = round((time.perf_counter() - current._started) * 1000, 3)
+            _current_span.reset(token)
+            if self.exporters:
+                self._export(current)
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+# Global instance
+tracer = Tracer.from_settings()
+
+
+def span(name: str, **attributes):
+    """Record a span with the global tracer; see ``Tracer.span``."""
+    return tracer.span(name, **attributes)
+
+
+def current_request_id() -> Optional[str]:
+    """Return the ID of the request being handled, if any."""
+    return _request_id.get()
+
+
+def inject() -> dict:
+    """
+    Capture the current trace context for work sent to another process.
+
+    Threads started with ``asyncio.to_thread`` inherit the context already;
+    process pool workers do not, so pass this to them and call ``attach``.
+    """
+    parent = _current_span.get()
+    return {
+        "request_id": _request_id.get(),
+        "trace_id": parent.trace_id if parent else None,
+        "span_id": parent.span_id if parent else None,
+    }
+
+
+@contextmanager
+def attach(carrier: Optional[dict]):
+    """Continue a trace captured by ``inject`` in this thread or process."""
+    if not carrier or not carrier.get("trace_id"):
+        yield
+        return
+    remote = Span("remote", carrier["trace_id"], None, carrier.get("request_id"), {})
+    remote.span_id = carrier["span_id"]
+    span_token = _current_span.set(remote)
+    request_token = _request_id.set(carrier.get("request_id"))
+    try:
+        yield
+    finally:
+        _request_id.reset(request_token)
+        _current_span.reset(span_token)
+
+
+def _parse_traceparent(value: Optional[str]) -> Optional[tuple[str, str]]:
+    """Return (trace_id, parent span_id) from a W3C traceparent header."""
+    if not value:
+        return None
+    parts = value.strip().split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2]
+
+
+class RequestTracingMiddleware:
+    """
+    ASGI middleware that gives every HTTP request an ID and a root span.
+
+    The request ID is taken from ``X-Request-ID`` (or generated) and echoed
+    back in the response. An incoming W3C ``traceparent`` header continues
+    the caller's trace.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+        request_id = headers.get(REQUEST_ID_HEADER.lower()) or secrets.token_hex(8)
+        carrier = None
+        upstream = _parse_traceparent(headers.get(TRACEPARENT_HEADER))
+        if upstream:
+            carrier = {"request_id": request_id, "trace_id": upstream[0], "span_id": upstream[1]}
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [
+                    (REQUEST_ID_HEADER.encode("latin-1"), request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            with attach(carrier), span("http.request", method=scope["method"], path=scope["path"]) as root:
+                await self.app(scope, receive, send_with_id)
+        finally:
+            _request_id.reset(token)
+
+
+def _add_trace_ids(record) -> None:
+    """Loguru patcher that stamps log records with the current request and trace IDs."""
+    request_id = _request_id.get()
+    if request_id is not None:
+        record["extra"]["request_id"] = request_id
+        current = _current_span.get()
+        if current is not None:
+            record["extra"]["trace_id"] = current.trace_id
+
+
+logger.configure(patcher=_add_trace_ids)
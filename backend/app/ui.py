@@ -1,6 +1,6 @@
 """Web UI backend logic and route handlers."""
 from fastapi import APIRouter, Request, Form, Depends, HTTPException, status
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from jinja2 import Environment, FileSystemLoader
 from pathlib import Path
@@ -9,11 +9,11 @@ from typing import Optional
 from datetime import datetime
 
 from .auth import get_user_token, verify_token, get_guest_token
-from .api import summaries_db, users_db
 from .summarizer.engine import engine
 from .summarizer.utils import extract_text, validate_file_size
 from .errors import SummarizerException, format_error_response
 from .logger import logger
+from .page_cache import PageCache, page_response
 
 router = APIRouter(tags=["UI"])
 
@@ -21,43 +21,41 @@ router = APIRouter(tags=["UI"])
 template_dir = Path(__file__).parent.parent.parent / "frontend" / "templates"
 jinja_env = Environment(loader=FileSystemLoader(template_dir))
 
+# Pages served by this router, pre-rendered at startup when they are static
+PAGES = ["index.html", "dashboard.html", "history.html", "about.html"]
+
+page_cache = PageCache(jinja_env)
+
 
 @router.get("/", response_class=HTMLResponse)
-async def index() -> str:
+async def index(request: Request) -> Response:
     """Serve the main dashboard page (guest accessible)."""
     try:
-        template = jinja_env.get_template("index.html")
-        return template.render()
+        return page_response(request, page_cache.page("index.html"))
     except Exception as e:
         logger.error(f"Failed to render index: {str(e)}")
-        return "<h1>Error loading dashboard</h1>"
+        return HTMLResponse("<h1>Error loading dashboard</h1>")
 
 
 @router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard(user_id: str = Depends(verify_token)) -> str:
+async def dashboard(request: Request, user_id: str = Depends(verify_token)) -> Response:
     """Serve the user dashboard (guest accessible)."""
     try:
-        template = jinja_env.get_template("dashboard.html")
-        is_guest = user_id.startswith("guest_")
-        return template.render(user_id=user_id, is_guest=is_guest)
+        return page_response(request, page_cache.page("dashboard.html"))
     except Exception as e:
         logger.error(f"Failed to render dashboard: {str(e)}")
-        return "<h1>Error loading dashboard</h1>"
+        return HTMLResponse("<h1>Error loading dashboard</h1>")
 
 
 @router.get("/history", response_class=HTMLResponse)
-async def history_page(user_id: str = Depends(verify_token)) -> str:
+async def history_page(request: Request, user_id: str = Depends(verify_token)) -> Response:
     """Serve the history page (guest accessible)."""
     try:
-        user_summaries = users_db.get(user_id, [])
-        summaries = [summaries_db[sid] for sid in user_summaries if sid in summaries_db]
-        is_guest = user_id.startswith("guest_")
-
-        template = jinja_env.get_template("history.html")
-        return template.render(summaries=summaries, user_id=user_id, is_guest=is_guest)
+        # The page loads the user's summaries from the API, so it is the same for everyone
+        return page_response(request, page_cache.page("history.html"))
     except Exception as e:
         logger.error(f"Failed to render history: {str(e)}")
-        return "<h1>Error loading history</h1>"
+        return HTMLResponse("<h1>Error loading history</h1>")
 
 
 @router.post("/api/login")
@@ -116,11 +114,10 @@ async def get_guest_access() -> JSONResponse:
 
 
 @router.get("/about", response_class=HTMLResponse)
-async def about() -> str:
+async def about(request: Request) -> Response:
     """Serve the about page."""
     try:
-        template = jinja_env.get_template("about.html")
-        return template.render()
+        return page_response(request, page_cache.page("about.html"))
     except Exception as e:
         logger.error(f"Failed to render about page: {str(e)}")
-        return "<h1>About GenAIsummarizer</h1><p>An AI-powered summarization tool</p>"
+        return HTMLResponse("<h1>About GenAIsummarizer</h1><p>An AI-powered summarization tool</p>")
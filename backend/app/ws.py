@@ -0,0 +1,322 @@
+"""WebSocket endpoint that multiplexes summarization jobs over one connection."""
+import asyncio
+import base64
+import binascii
+import json
+import secrets
+import uuid
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+
+from .admission import admission
+from .api import _normalize, _save_summary, _summarize, summaries_db
+from .auth import decode_access_token
+from .config import settings
+from .errors import ExtractionError, FileFormatError, SummarizerException, ValidationError, format_error_response
+from .logger import logger
+from .metrics import metrics
+from .profiling import to_thread
+from .summarizer.slicing import parse_page_range
+from .summarizer.sniff import SNIFF_BYTES, check_document, check_head
+from .summarizer.utils import extract_text, validate_file_size
+from .tracing import attach, span
+
+router = APIRouter(tags=["WebSocket"])
+
+LENGTHS = ("short", "medium", "long")
+EXTRACTIVE_MODES = ("off", "prefilter", "fallback")
+FILE_FORMATS = ("txt", "pdf", "docx")
+
+
+def _error(job_id: Optional[str], message: str, code: str) -> dict:
+    return {"type": "error", "id": job_id, "error": {"message": message, "code": code}}
+
+
+def _field(message: dict, name: str, default: Optional[str] = None) -> Optional[str]:
+    """Return a string field of a client message, or ``default`` if it is missing or null."""
+    value = message.get(name)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise ValidationError(f"{name} must be a string")
+    return value
+
+
+class SummarizeSession:
+    """
+    One authenticated WebSocket connection and the jobs running on it.
+
+    Jobs run concurrently as tasks. Everything sent to the client goes
+    through one outbox drained by a single writer task, so messages from
+    different jobs never interleave mid-frame. If the writer fails, the
+    error is logged and the session closes with 1011. The session also
+    forwards changes to the user's history from the summary store.
+    """
+
+    def __init__(self, websocket: WebSocket, user_id: str):
+        """Initialize a session for an accepted connection."""
+        self.websocket = websocket
+        self.user_id = user_id
+        self.jobs: dict[str, asyncio.Task] = {}
+        self._outbox: asyncio.Queue[dict] = asyncio.Queue()
+
+    def send(self, message: dict) -> None:
+        """Queue a message for the client."""
+        self._outbox.put_nowait(message)
+
+    async def _writer(self) -> None:
+        while True:
+            await self.websocket.send_json(await self._outbox.get())
+
+    async def _receive(self, writer: asyncio.Task) -> Optional[dict]:
+        """Wait for the next frame from the client; return None if the writer stopped first."""
+        receiving = asyncio.ensure_future(self.websocket.receive())
+        try:
+            await asyncio.wait((receiving, writer), return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if not receiving.done():
+                receiving.cancel()
+        if writer.done():
+            return None
+        return receiving.result()
+
+    def on_store_event(self, event: str, record) -> None:
+        """Summary store listener: push changes to this user's history."""
+        if event == "clear":
+            self.send({"type": "history", "event": "clear"})
+        elif record is not None and record.user_id == self.user_id:
+            self.send({"type": "history", "event": event, "summary": record.to_dict(include_text=False)})
+
+    async def run(self) -> None:
+        """Serve the connection until the client disconnects."""
+        summaries_db.subscribe(self.on_store_event)
+        writer = asyncio.create_task(self._writer())
+        metrics.inc("ws_connections_total")
+        try:
+            self.send({"type": "ready", "user_id": self.user_id})
+            while True:
+                frame = await self._receive(writer)
+                if frame is None:
+                    # The writer failed; nothing more can reach the client
+                    break
+                if frame["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(frame.get("code", status.WS_1000_NORMAL_CLOSURE), frame.get("reason"))
+                raw = frame.get("text")
+                if raw is None:
+                    self.send(_error(None, "Messages must be JSON text frames, not binary", "VALIDATION_ERROR"))
+                    continue
+                try:
+                    message = json.loads(raw)
+                except ValueError:
+                    self.send(_error(None, "Messages must be JSON objects", "VALIDATION_ERROR"))
+                    continue
+                self.handle(message)
+        except WebSocketDisconnect:
+            logger.info(f"WebSocket closed for user {self.user_id}")
+        finally:
+            summaries_db.unsubscribe(self.on_store_event)
+            for task in list(self.jobs.values()):
+                task.cancel()
+            if not writer.done():
+                writer.cancel()
+            elif not writer.cancelled() and writer.exception() is not None:
+                error = writer.exception()
+                logger.error(f"WebSocket writer failed for user {self.user_id}: {str(error)}")
+                metrics.inc("ws_writer_errors_total")
+                try:
+                    await self.websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+                except Exception:
+                    # Usually the connection is already gone, which is what broke the writer
+                    pass
+
+    def handle(self, message) -> None:
+        """Dispatch one client message."""
+        if not isinstance(message, dict):
+            self.send(_error(None, "Messages must be JSON objects", "VALIDATION_ERROR"))
+            return
+        kind = message.get("type")
+        job_id = str(message["id"]) if message.get("id") is not None else None
+
+        if kind == "summarize":
+            job_id = job_id or uuid.uuid4().hex
+            if job_id in self.jobs:
+                self.send(_error(job_id, "A job with this ID is already running", "DUPLICATE_JOB"))
+                return
+            if len(self.jobs) >= settings.WS_MAX_JOBS_PER_CONNECTION:
+                self.send(_error(job_id, "Too many jobs running on this connection", "TOO_MANY_JOBS"))
+                return
+            task = asyncio.create_task(self._job(job_id, message))
+            self.jobs[job_id] = task
+            task.add_done_callback(lambda _: self.jobs.pop(job_id, None))
+            self.send({"type": "accepted", "id": job_id})
+        elif kind == "cancel":
+            task = self.jobs.get(job_id)
+            if task is None:
+                self.send(_error(job_id, "No running job with this ID", "UNKNOWN_JOB"))
+            else:
+                task.cancel()
+        elif kind == "ping":
+            self.send({"type": "pong"})
+        else:
+            self.send(_error(job_id, f"Unknown message type: {kind}", "VALIDATION_ERROR"))
+
+    async def _job(self, job_id: str, message: dict) -> None:
+        """Run one job and report its result, error or cancellation."""
+        carrier = {"request_id": secrets.token_hex(8), "trace_id": secrets.token_hex(16), "span_id": None}
+        try:
+            with attach(carrier), span("ws.summarize", job_id=job_id, mode=message.get("mode", "text")):
+                await admission.acquire()
+                try:
+                    record = await self._summarize(job_id, message)
+                finally:
+                    admission.release()
+            self.send({"type": "result", "id": job_id, "summary": record})
+        except asyncio.CancelledError:
+            logger.info(f"WebSocket job {job_id} cancelled")
+            self.send({"type": "cancelled", "id": job_id})
+        except SummarizerException as e:
+            logger.error(f"WebSocket job {job_id} failed: {e.message}")
+            self.send({"type": "error", "id": job_id, **format_error_response(e)})
+        except HTTPException as e:
+            detail = e.detail if isinstance(e.detail, dict) else {"error": {"message": str(e.detail), "code": "ERROR"}}
+            self.send({"type": "error", "id": job_id, **detail})
+        except Exception as e:
+            logger.error(f"Unexpected error in WebSocket job {job_id}: {str(e)}")
+            self.send(_error(job_id, "Internal server error", "INTERNAL_ERROR"))
+
+    def _progress(self, job_id: str, stage: str) -> None:
+        self.send({"type": "progress", "id": job_id, "stage": stage})
+
+    async def _summarize(self, job_id: str, message: dict) -> dict:
+        """
+        Extract, normalize, summarize and save the input of a job.
+
+        Accepts the same options as the HTTP summarize routes. ``mode`` is
+        "text" (with ``text``), "url" (with ``url``) or "file" (with
+        ``filename`` and base64 ``data``).
+
+        Returns:
+            The saved summary record
+        """
+        mode = _field(message, "mode", "text")
+        length = _field(message, "summary_length", "medium")
+        extractive = _field(message, "extractive", "off")
+        if length not in LENGTHS:
+            raise ValidationError(f"summary_length must be one of: {', '.join(LENGTHS)}")
+        if extractive not in EXTRACTIVE_MODES:
+            raise ValidationError(f"extractive must be one of: {', '.join(EXTRACTIVE_MODES)}")
+
+        record = {}
+        if mode == "text":
+            text = _field(message, "text", "")
+            if not text.strip():
+                raise ValidationError("Text content cannot be empty")
+            stored_text = text
+        elif mode == "url":
+            url = _field(message, "url", "")
+            if not url.strip():
+                raise ValidationError("URL cannot be empty")
+            self._progress(job_id, "extracting")
+            text = await extract_text(url, "url")
+            stored_text = text[:500]
+            record["source_url"] = url
+        elif mode == "file":
+            text = await self._extract_file(job_id, message, record)
+            stored_text = text[:500]
+        else:
+            raise ValidationError(f"Unknown mode: {mode}")
+
+        if not text or not text.strip():
+            raise ExtractionError("Could not extract text from the input")
+
+        self._progress(job_id, "normalizing")
+        text, normalization = _normalize(text)
+
+        self._progress(job_id, "summarizing")
+        summary, details = await _summarize(
+            text,
+            length,
+            self.user_id,
+            incremental=bool(message.get("incremental")),
+            extractive=extractive,
+            reuse_similar=bool(message.get("reuse_similar", True)),
+        )
+        if "route" in details:
+            self.send({"type": "tokens", "id": job_id, **details["route"]})
+
+        summary_record = {
+            "id": str(uuid.uuid4()),
+            "text": stored_text,
+            "summary": summary,
+            "length": length,
+            "created_at": datetime.utcnow().isoformat(),
+            "user_id": self.user_id,
+            **record,
+        }
+        summary_record.update(details)
+        if normalization is not None:
+            summary_record["normalization"] = normalization
+        _save_summary(summary_record)
+        logger.info(f"Summary {summary_record['id']} created over WebSocket for user {self.user_id}")
+        return summary_record
+
+    async def _extract_file(self, job_id: str, message: dict, record: dict) -> str:
+        """Decode, check and extract an uploaded file, filling the record's file fields."""
+        filename = _field(message, "filename", "")
+        file_ext = filename.split(".")[-1].lower() if "." in filename else ""
+        if file_ext not in FILE_FORMATS:
+            raise FileFormatError(f"Unsupported file format: {file_ext}")
+        page_range = _field(message, "page_range") or None
+        section = _field(message, "section") or None
+        if page_range is not None and section is not None:
+            raise ValidationError("Use either page_range or section, not both")
+        if page_range is not None:
+            parse_page_range(page_range)
+
+        data = _field(message, "data", "")
+        # Base64 is 4/3 the size of the decoded bytes
+        validate_file_size(len(data) * 3 // 4)
+        try:
+            content = base64.b64decode(data, validate=True)
+        except (binascii.Error, ValueError):
+            raise ValidationError("File data must be base64-encoded")
+        validate_file_size(len(content))
+
+        self._progress(job_id, "extracting")
+        check_head(content[:SNIFF_BYTES], file_ext)
+        file_ext = await to_thread(check_document, content, file_ext)
+        text = await extract_text(content, file_ext, page_range=page_range, section=section)
+
+        record["filename"] = filename
+        if page_range is not None:
+            record["page_range"] = page_range
+        if section is not None:
+            record["section"] = section
+        return text
+
+
+@router.websocket("/api/ws")
+async def summarize_socket(websocket: WebSocket) -> None:
+    """
+    Multiplexed summarization over one WebSocket.
+
+    Authenticate with ``?token=<JWT>``; without a token the session runs as
+    a guest. Clients send ``{"type": "summarize", "id": ..., "mode": ...}``
+    and ``{"type": "cancel", "id": ...}``, and receive ``accepted``,
+    ``progress``, ``tokens``, ``result``, ``error`` and ``cancelled`` events
+    tagged with the job ID, plus ``history`` events when the user's
+    summaries change.
+    """
+    token = websocket.query_params.get("token")
+    if token:
+        user_id = decode_access_token(token)
+        if user_id is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+            return
+    else:
+        user_id = f"guest_{uuid.uuid4().hex[:8]}"
+
+    await websocket.accept()
+    await SummarizeSession(websocket, user_id).run()
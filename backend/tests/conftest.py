@@ -14,3 +14,56 @@ def clear_test_data():
     yield
     # Cleanup after test
     pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_extraction_cache(tmp_path, monkeypatch):
+    """Point the extraction cache at a temporary directory instead of the real cache/extraction."""
+    from backend.app.summarizer import utils
+    from backend.app.summarizer.extraction_cache import ExtractionCache
+
+    monkeypatch.setattr(utils, "extraction_cache", ExtractionCache(directory=str(tmp_path / "extraction")))
+
+
+def build_pdf(pages: list) -> bytes:
+    """
+    Build a minimal PDF with one page per entry.
+
+    A string entry becomes a page with that text in Helvetica; None becomes
+    a page with no text and no fonts, like a scanned image page.
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        if text is None:
+            stream = "q 10 0 0 10 0 0 cm Q"
+            resources = "<< >>"
+        else:
+            escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            stream = f"BT /F1 12 Tf 72 720 Td ({escaped}) Tj ET"
+            resources = "<< /Font << /F1 3 0 R >> >>"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources {resources} /Contents {content_ref} 0 R >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return output
+
+
+@pytest.fixture
+def make_pdf():
+    """Factory fixture for small in-memory PDFs (see build_pdf)."""
+    return build_pdf
@@ -0,0 +1,77 @@
+"""Unit tests for admission control."""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+from backend.app.admission import AdmissionController
+from backend.app.main import app
+
+
+class FakeRequest:
+    """Minimal stand-in for a Starlette request."""
+
+    def __init__(self, disconnected: bool = False):
+        self.disconnected = disconnected
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+class TestAdmissionController:
+    """Tests for the bounded in-flight/queue controller."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test that requests beyond capacity get 503 with Retry-After."""
+        controller = AdmissionController(max_in_flight=1, max_queue=1, retry_after=7, poll_interval=0.01)
+        await controller.acquire(FakeRequest())
+        queued = asyncio.create_task(controller.acquire(FakeRequest()))
+        await asyncio.sleep(0.02)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await controller.acquire(FakeRequest())
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.headers["Retry-After"] == "7"
+
+        controller.release()
+        await queued
+        assert controller.in_flight == 1
+        controller.release()
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_drops_disconnected_waiters(self):
+        """Test that queued requests from disconnected clients never run."""
+        controller = AdmissionController(max_in_flight=1, max_queue=5, poll_interval=0.01)
+        await controller.acquire(FakeRequest())
+        request = FakeRequest()
+        queued = asyncio.create_task(controller.acquire(request))
+        await asyncio.sleep(0.02)
+
+        request.disconnected = True
+        with pytest.raises(HTTPException) as exc_info:
+            await queued
+        assert exc_info.value.status_code == 499
+        assert controller.queued == 0
+        assert controller.dropped == 1
+
+        controller.release()
+        assert controller.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_saturation(self):
+        """Test saturation accounting."""
+        controller = AdmissionController(max_in_flight=2, max_queue=2)
+        await controller.acquire()
+        assert controller.saturation == 0.25
+
+
+class TestReadiness:
+    """Tests for the readiness endpoint."""
+
+    def test_ready_when_idle(self):
+        """Test that an idle server reports ready."""
+        response = TestClient(app).get("/api/health/ready")
+        assert response.status_code == 200
+        assert response.json()["status"] == "ready"
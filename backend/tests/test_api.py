@@ -86,3 +86,20 @@ class TestAPIEndpoints:
         """Test deleting summary without authentication."""
         response = client.delete("/api/summary/some_id")
         assert response.status_code == 403
+
+    def test_summarize_extractive_fallback(self, client, test_token):
+        """Test that fallback mode returns a local summary when the model is unavailable."""
+        with patch("backend.app.api.engine.client", None):
+            response = client.post(
+                "/api/summarize",
+                headers={"Authorization": f"Bearer {test_token}"},
+                json={
+                    "text": "Solar power is growing fast. Batteries store solar power. Cats nap.",
+                    "summary_length": "short",
+                    "extractive": "fallback",
+                },
+            )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["extractive"]["fallback"] is True
+        assert "Solar power" in data["summary"]
@@ -0,0 +1,67 @@
+"""Unit tests for offline bulk summarization."""
+import json
+import pytest
+from unittest.mock import patch
+
+from backend.app.bulk import resolve_inputs, summarize_files
+from backend.app.errors import ValidationError
+
+
+async def fake_summary(text, length="medium"):
+    """Return a deterministic summary without calling the model."""
+    return f"summary of {len(text)} chars"
+
+
+@pytest.fixture
+def documents(tmp_path):
+    """Create a small directory of text documents."""
+    folder = tmp_path / "docs"
+    (folder / "nested").mkdir(parents=True)
+    for i in range(3):
+        (folder / f"doc{i}.txt").write_text(f"Document {i} has some content.")
+    (folder / "nested" / "deep.txt").write_text("Nested document content.")
+    (folder / "image.png").write_bytes(b"\x89PNG")
+    return folder
+
+
+class TestBulkSummarization:
+    """Tests for the run.py summarize pipeline."""
+
+    def test_resolve_directory_and_glob(self, documents):
+        """Test that directories are searched recursively and globs expand."""
+        assert len(resolve_inputs(str(documents))) == 4
+        assert len(resolve_inputs(str(documents / "doc*.txt"))) == 3
+
+    def test_resolve_manifest(self, documents, tmp_path):
+        """Test that manifests list relative or JSON-lines paths."""
+        manifest = tmp_path / "inputs.jsonl"
+        manifest.write_text(json.dumps({"path": "docs/doc0.txt"}) + "\n" + json.dumps({"path": "docs/doc1.txt"}))
+        assert [p.name for p in resolve_inputs(str(manifest))] == ["doc0.txt", "doc1.txt"]
+
+    def test_malformed_manifest_line(self, documents, tmp_path):
+        """Test that a bad JSON line is reported with the manifest path and line number."""
+        manifest = tmp_path / "inputs.jsonl"
+        manifest.write_text(json.dumps({"path": "docs/doc0.txt"}) + '\n{"path": \n{"file": "x"}\n')
+        with pytest.raises(ValidationError, match=r"inputs.jsonl:2: invalid JSON"):
+            resolve_inputs(str(manifest))
+        manifest.write_text('{"file": "docs/doc0.txt"}\n')
+        with pytest.raises(ValidationError, match=r'inputs.jsonl:1: entry has no "path"'):
+            resolve_inputs(str(manifest))
+
+    @pytest.mark.asyncio
+    async def test_writes_ndjson_and_resumes(self, documents, tmp_path):
+        """Test that results stream to NDJSON and a rerun skips checkpointed files."""
+        output = tmp_path / "out.ndjson"
+        checkpoint = tmp_path / "out.checkpoint"
+        paths = resolve_inputs(str(documents))
+
+        with patch("backend.app.bulk.engine.generate_summary", side_effect=fake_summary) as summarize:
+            first = await summarize_files(paths[:2], output, checkpoint, workers=1, concurrency=2)
+            second = await summarize_files(paths, output, checkpoint, workers=1, concurrency=2)
+
+        assert first == {"processed": 2, "failed": 0, "skipped": 0}
+        assert second == {"processed": 2, "failed": 0, "skipped": 2}
+        assert summarize.call_count == 4
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert len(records) == 4
+        assert all(record["summary"].startswith("summary of") for record in records)
@@ -0,0 +1,71 @@
+"""Unit tests for content-defined chunking and incremental summarization."""
+import pytest
+from unittest.mock import MagicMock
+
+from backend.app.summarizer.chunking import chunk_text, chunk_hash
+from backend.app.summarizer.engine import SummarizationEngine
+
+
+def make_document(sections: int = 30) -> str:
+    """Build a multi-section document with distinct paragraphs."""
+    return "\n\n".join(
+        f"Section {i}. " + " ".join(f"Sentence {i}-{j} describes item number {j}." for j in range(20))
+        for i in range(sections)
+    )
+
+
+class TestChunking:
+    """Tests for content-defined chunking."""
+
+    def test_chunks_cover_text(self):
+        """Test that chunking keeps every paragraph."""
+        text = make_document()
+        chunks = chunk_text(text, min_chars=1000, max_chars=4000)
+        assert len(chunks) > 1
+        assert "\n\n".join(chunks) == text
+
+    def test_chunks_respect_max_size(self):
+        """Test that no chunk exceeds the maximum size."""
+        text = "word " * 5000
+        chunks = chunk_text(text, min_chars=500, max_chars=2000)
+        assert all(len(chunk) <= 2000 for chunk in chunks)
+
+    def test_local_edit_keeps_other_chunks(self):
+        """Test that editing one section only changes nearby chunk hashes."""
+        text = make_document()
+        edited = text.replace("Sentence 25-3 describes", "Sentence 25-3 now describes")
+
+        before = {chunk_hash(c) for c in chunk_text(text, min_chars=1000, max_chars=4000)}
+        after = [chunk_hash(c) for c in chunk_text(edited, min_chars=1000, max_chars=4000)]
+
+        changed = [h for h in after if h not in before]
+        assert 1 <= len(changed) <= 2
+
+
+class TestIncrementalSummary:
+    """Tests for incremental re-summarization."""
+
+    @pytest.mark.asyncio
+    async def test_resubmission_only_sends_changed_chunks(self, monkeypatch):
+        """Test that unchanged chunks reuse stored partial summaries."""
+        monkeypatch.setattr(
+            "backend.app.summarizer.engine.chunk_text",
+            lambda text: chunk_text(text, min_chars=1000, max_chars=4000),
+        )
+        engine = SummarizationEngine()
+        engine.client = MagicMock()
+        engine.client.chat.completions.create.side_effect = lambda **kwargs: MagicMock(
+            choices=[MagicMock(message=MagicMock(content=f"partial {len(kwargs['messages'][-1]['content'])}"))]
+        )
+
+        text = make_document()
+        summary, stats = await engine.generate_incremental_summary(text, "medium")
+        assert stats["reused"] == 0
+        first_calls = engine.client.chat.completions.create.call_count
+        assert first_calls == stats["total"] + 1
+
+        edited = text.replace("Sentence 25-3 describes", "Sentence 25-3 now describes")
+        summary, stats = await engine.generate_incremental_summary(edited, "medium")
+        second_calls = engine.client.chat.completions.create.call_count - first_calls
+        assert stats["reused"] >= stats["total"] - 2
+        assert second_calls == stats["total"] - stats["reused"] + 1
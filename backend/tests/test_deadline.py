@@ -0,0 +1,77 @@
+"""Unit tests for request deadlines and disconnect cancellation."""
+import asyncio
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.app.auth import create_access_token
+from backend.app.config import settings
+from backend.app.deadline import note_input_tokens, request_deadline
+from backend.app.main import app
+from backend.app.metrics import metrics
+
+
+class FakeRequest:
+    """Minimal stand-in for a Starlette request."""
+
+    def __init__(self, headers=None):
+        self.headers = headers or {}
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+async def slow_summary(*args, **kwargs):
+    """Simulate an upstream call that takes too long."""
+    await asyncio.sleep(5)
+    return "too late"
+
+
+class TestRequestDeadline:
+    """Tests for the request deadline dependency."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_deadline_header_cancels_request(self):
+        """Test that X-Request-Timeout bounds the request and nothing is stored."""
+        token = create_access_token(data={"sub": "deadline_user"})
+        with patch("backend.app.api.engine.generate_summary", side_effect=slow_summary):
+            response = TestClient(app).post(
+                "/api/summarize",
+                headers={"Authorization": f"Bearer {token}", "X-Request-Timeout": "0.2"},
+                json={"text": "Some text to summarize", "summary_length": "short"},
+            )
+        assert response.status_code == 504
+        assert metrics.get("requests_cancelled_deadline_total") == 1
+
+    def test_invalid_timeout_header(self):
+        """Test that a malformed timeout header is rejected."""
+        token = create_access_token(data={"sub": "deadline_user"})
+        response = TestClient(app).post(
+            "/api/summarize",
+            headers={"Authorization": f"Bearer {token}", "X-Request-Timeout": "soon"},
+            json={"text": "Some text", "summary_length": "short"},
+        )
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_work(self, monkeypatch):
+        """Test that a client disconnect cancels the handler and counts saved tokens."""
+        monkeypatch.setattr(settings, "REQUEST_DISCONNECT_POLL_SECONDS", 0.01)
+        request = FakeRequest()
+        dependency = request_deadline(request)
+        await dependency.__anext__()
+        note_input_tokens(1234)
+
+        request.disconnected = True
+        with pytest.raises(asyncio.CancelledError) as cancelled:
+            await asyncio.sleep(5)
+
+        with pytest.raises(HTTPException) as exc_info:
+            await dependency.athrow(cancelled.value)
+        assert exc_info.value.status_code == 499
+        assert metrics.get("requests_cancelled_disconnect_total") == 1
+        assert metrics.get("cancelled_tokens_saved_total") == 1234
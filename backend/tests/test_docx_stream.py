@@ -0,0 +1,76 @@
+"""Unit tests for streaming DOCX extraction."""
+import io
+import zipfile
+import pytest
+from docx import Document
+from unittest.mock import patch
+
+from backend.app.summarizer import utils
+from backend.app.summarizer.docx_stream import docx_blocks_to_text, iter_docx_blocks
+
+
+def build_docx() -> bytes:
+    document = Document()
+    document.add_heading("Quarterly Report", level=1)
+    document.add_paragraph("Revenue grew in every region.")
+    table = document.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "Region"
+    table.cell(0, 1).text = "Revenue"
+    table.cell(1, 0).text = "North"
+    table.cell(1, 1).text = "120"
+    document.add_paragraph("Outlook remains positive.")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class TestStreamingDocx:
+    """Tests for the iterparse-based DOCX extractor."""
+
+    def test_blocks_in_document_order(self):
+        """Test that tables appear where they are in the document."""
+        blocks = list(iter_docx_blocks(build_docx()))
+        assert [block.text for block in blocks] == [
+            "Quarterly Report",
+            "Revenue grew in every region.",
+            "Region | Revenue",
+            "North | 120",
+            "Outlook remains positive.",
+        ]
+        assert blocks[0].style == "Heading1"
+        assert [block.kind for block in blocks[2:4]] == ["table_row", "table_row"]
+
+    def test_nested_table_folds_into_cell(self):
+        """Test that a table inside a cell becomes part of that cell's text."""
+        document = Document()
+        outer = document.add_table(rows=1, cols=2)
+        outer.cell(0, 0).text = "Outer"
+        inner = outer.cell(0, 1).add_table(rows=1, cols=2)
+        inner.cell(0, 0).text = "a"
+        inner.cell(0, 1).text = "b"
+        buffer = io.BytesIO()
+        document.save(buffer)
+
+        blocks = list(iter_docx_blocks(buffer.getvalue()))
+        assert len(blocks) == 1
+        assert blocks[0].text == "Outer | a | b"
+
+    def test_text_layout(self):
+        """Test the paragraph and table row separators."""
+        text = docx_blocks_to_text(iter_docx_blocks(build_docx()))
+        assert text == (
+            "Quarterly Report\n\nRevenue grew in every region.\n\n"
+            "Region | Revenue\nNorth | 120\n\nOutlook remains positive."
+        )
+
+    def test_not_a_docx(self):
+        """Test that non-zip content is reported."""
+        with pytest.raises(zipfile.BadZipFile):
+            list(iter_docx_blocks(b"not a zip"))
+
+    def test_falls_back_to_python_docx(self):
+        """Test that a failing streaming parse falls back to python-docx."""
+        with patch.object(utils, "iter_docx_blocks", side_effect=ValueError("bad xml")):
+            text = utils._read_docx(build_docx())
+        assert "Revenue grew in every region." in text
+        assert "North" in text
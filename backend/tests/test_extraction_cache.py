@@ -0,0 +1,52 @@
+"""Unit tests for the extraction result cache."""
+import os
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from backend.app.summarizer import utils
+from backend.app.summarizer.extraction_cache import ExtractionCache
+
+
+class TestExtractionCache:
+    """Tests for the on-disk extraction cache."""
+
+    def test_round_trip(self, tmp_path):
+        """Test that stored text is returned for identical bytes."""
+        cache = ExtractionCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+        cache.set(b"%PDF-1.4 data", "pdf", "Extracted text")
+
+        assert cache.get(b"%PDF-1.4 data", "pdf") == "Extracted text"
+        assert cache.get(b"%PDF-1.4 data", "docx") is None
+        assert cache.get(b"other bytes", "pdf") is None
+
+    def test_entries_are_compressed(self, tmp_path):
+        """Test that entries on disk are smaller than the text they hold."""
+        cache = ExtractionCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+        text = "repetitive text " * 1000
+        cache.set(b"file", "docx", text)
+
+        stored = sum(path.stat().st_size for path in tmp_path.glob("*/*.z"))
+        assert 0 < stored < len(text) / 10
+
+    def test_eviction_bounds_total_size(self, tmp_path):
+        """Test that the cache evicts old entries to stay under its byte budget."""
+        cache = ExtractionCache(directory=str(tmp_path), max_bytes=4096)
+        for i in range(20):
+            cache.set(f"file {i}".encode(), "pdf", os.urandom(400).hex())
+
+        entries = list(tmp_path.glob("*/*.z"))
+        assert sum(path.stat().st_size for path in entries) <= 4096
+        assert len(entries) < 20
+        assert cache.get(b"file 19", "pdf") is not None
+
+    @pytest.mark.asyncio
+    async def test_second_upload_skips_parsing(self, tmp_path):
+        """Test that extract_text parses identical uploads only once."""
+        cache = ExtractionCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+        parser = AsyncMock(return_value="Parsed text")
+        with patch.object(utils, "extraction_cache", cache), patch.object(utils, "extract_text_from_pdf", parser):
+            first = await utils.extract_text(b"%PDF-1.4 same file", "pdf")
+            second = await utils.extract_text(b"%PDF-1.4 same file", "pdf")
+
+        assert first == second == "Parsed text"
+        assert parser.await_count == 1
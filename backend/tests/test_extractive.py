@@ -0,0 +1,55 @@
+"""Unit tests for the local extractive summarizer."""
+from backend.app.summarizer.extractive import (
+    extractive_summary,
+    score_sentences,
+    select_salient,
+    split_sentences,
+)
+from backend.app.summarizer.utils import estimate_tokens
+
+
+DOCUMENT = (
+    "Solar panels convert sunlight into electricity. "
+    "The weather was pleasant on Tuesday. "
+    "Modern solar panels convert more sunlight into electricity than older panels. "
+    "Electricity from solar panels can be stored in batteries. "
+    "A cat slept on the porch."
+)
+
+
+class TestExtractive:
+    """Tests for TF-IDF sentence scoring and selection."""
+
+    def test_split_sentences(self):
+        """Test sentence splitting."""
+        assert len(split_sentences(DOCUMENT)) == 5
+
+    def test_central_sentences_score_higher(self):
+        """Test that on-topic sentences outrank off-topic ones."""
+        scores = score_sentences(split_sentences(DOCUMENT))
+        assert scores[2] > scores[1]
+        assert scores[2] > scores[4]
+
+    def test_select_salient_respects_budget(self):
+        """Test that the pre-filter fits the token budget and keeps document order."""
+        text = " ".join([DOCUMENT] * 20)
+        selected = select_salient(text, token_budget=60)
+        assert estimate_tokens(selected) <= 60
+        assert selected in text or all(s in text for s in split_sentences(selected))
+
+    def test_select_salient_keeps_short_text(self):
+        """Test that text under budget is returned unchanged."""
+        assert select_salient(DOCUMENT, token_budget=10000) == DOCUMENT
+
+    def test_select_salient_unpunctuated_text_is_truncated(self):
+        """Test that over-budget text with no sentence breaks is truncated, not emptied."""
+        table = " ".join(f"row{i} col{i % 7} {i * 3}" for i in range(30000))
+        selected = select_salient(table, token_budget=500)
+        assert selected
+        assert estimate_tokens(selected) <= 500
+        assert table.startswith(selected)
+
+    def test_extractive_summary_length(self):
+        """Test that the extractive summary stays within the word budget."""
+        summary = extractive_summary(" ".join([DOCUMENT] * 20), "short")
+        assert 0 < len(summary.split()) <= 50
@@ -0,0 +1,103 @@
+"""Unit tests for hedged model calls."""
+import asyncio
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.app.metrics import metrics
+from backend.app.summarizer.engine import SummarizationEngine
+from backend.app.summarizer.hedging import Hedger
+from backend.app.summarizer.routing import ModelRouter, Route
+
+PRIMARY = Route("primary", "primary-deployment")
+BACKUP = Route("backup", "backup-deployment")
+
+
+def warmed_hedger(budget_ratio: float = 1.0) -> Hedger:
+    hedger = Hedger(percentile=0.95, min_delay=0.01, min_samples=5, budget_ratio=budget_ratio)
+    for _ in range(5):
+        hedger.observe_primary(0.02)
+    return hedger
+
+
+def fake_call(delays: dict, cancelled: list):
+    async def call(route: Route, is_primary: bool):
+        try:
+            await asyncio.sleep(delays[route.name])
+        except asyncio.CancelledError:
+            cancelled.append(route.name)
+            raise
+        if isinstance(delays.get(f"{route.name}_error"), Exception):
+            raise delays[f"{route.name}_error"]
+        return route.name
+    return call
+
+
+class TestHedger:
+    """Tests for the hedging policy."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged(self):
+        """Test that the backup wins when the primary is slow, and the primary is cancelled."""
+        cancelled = []
+        result = await warmed_hedger().run(fake_call({"primary": 1.0, "backup": 0.01}, cancelled), PRIMARY, BACKUP)
+        await asyncio.sleep(0)  # Let the cancelled primary unwind
+        assert result == "backup"
+        assert cancelled == ["primary"]
+        assert metrics.get("hedges_total") == 1
+        assert metrics.get("hedge_win_rate") == 1.0
+
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """Test that a primary finishing before the hedge delay runs alone."""
+        result = await warmed_hedger().run(fake_call({"primary": 0.0, "backup": 0.0}, []), PRIMARY, BACKUP)
+        assert result == "primary"
+        assert metrics.get("hedges_total") == 0
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_hedges(self):
+        """Test that no hedge is sent once the budget is spent."""
+        hedger = warmed_hedger(budget_ratio=0.0)
+        result = await hedger.run(fake_call({"primary": 0.1, "backup": 0.0}, []), PRIMARY, BACKUP)
+        assert result == "primary"
+        assert metrics.get("hedges_total") == 0
+
+    @pytest.mark.asyncio
+    async def test_no_hedging_without_samples(self):
+        """Test that hedging waits for enough latency samples."""
+        hedger = Hedger(min_samples=5, min_delay=0.01, budget_ratio=1.0)
+        result = await hedger.run(fake_call({"primary": 0.05, "backup": 0.0}, []), PRIMARY, BACKUP)
+        assert result == "primary"
+
+    @pytest.mark.asyncio
+    async def test_failed_backup_falls_back_to_primary(self):
+        """Test that a failing hedge does not fail a primary that later succeeds."""
+        delays = {"primary": 0.1, "backup": 0.0, "backup_error": RuntimeError("backup down")}
+        result = await warmed_hedger().run(fake_call(delays, []), PRIMARY, BACKUP)
+        assert result == "primary"
+
+
+class TestEngineHedging:
+    """Tests for hedging inside the engine."""
+
+    @pytest.mark.asyncio
+    async def test_engine_hedges_to_second_route(self):
+        """Test that the engine sends the hedge to the next route."""
+        def create(model, **kwargs):
+            time.sleep(0.5 if model == "primary-deployment" else 0.0)
+            response = MagicMock()
+            response.choices[0].message.content = f"from {model}"
+            response.usage.prompt_tokens = 10
+            response.usage.completion_tokens = 5
+            return response
+
+        engine = SummarizationEngine()
+        engine.client = MagicMock()
+        engine.client.chat.completions.create.side_effect = create
+        engine.router = ModelRouter([Route("primary", "primary-deployment"), Route("backup", "backup-deployment")])
+        engine.hedger = warmed_hedger()
+        with patch("backend.app.summarizer.engine.settings.HEDGING_ENABLED", True):
+            assert await engine._complete("Summarize this") == "from backup-deployment"
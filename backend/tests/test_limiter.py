@@ -0,0 +1,210 @@
+"""Unit tests for the adaptive upstream concurrency limit."""
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from backend.app.metrics import metrics
+from backend.app.summarizer.engine import SummarizationEngine
+from backend.app.summarizer.limiter import AdaptiveLimiter, is_throttle
+
+
+class Throttled(Exception):
+    """Stand-in for an openai status error."""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def limiter(**kwargs) -> AdaptiveLimiter:
+    options = {"initial": 4, "min_limit": 1, "max_limit": 16, "enabled": True}
+    options.update(kwargs)
+    return AdaptiveLimiter(**options)
+
+
+class TestAdaptiveLimiter:
+    """Tests for AIMD limit changes and admission."""
+
+    def setup_method(self):
+        metrics.reset()
+
+    def test_throttle_detection(self):
+        """Test that only 429 and 503 count as throttling."""
+        assert is_throttle(Throttled(429))
+        assert is_throttle(Throttled(503))
+        assert not is_throttle(Throttled(400))
+        assert not is_throttle(ValueError("boom"))
+
+    def test_throttle_halves_limit(self):
+        """Test multiplicative decrease on a throttled call."""
+        adaptive = limiter(initial=8)
+        adaptive._observe(0.1, Throttled(429), saturated=True)
+        assert adaptive.limit == 4
+        assert metrics.get("llm_throttled_total") == 1
+        assert metrics.get("llm_concurrency_limit") == 4
+
+    def test_limit_respects_bounds(self):
+        """Test that the limit never leaves [min, max]."""
+        adaptive = limiter(initial=2, min_limit=2, max_limit=3)
+        for _ in range(5):
+            adaptive._observe(0.1, Throttled(429), saturated=True)
+        assert adaptive.limit == 2
+        for _ in range(50):
+            adaptive._observe(0.1, None, saturated=True)
+        assert adaptive.limit == 3
+
+    def test_additive_increase_only_when_saturated(self):
+        """Test that the limit grows by about one per window of saturated calls."""
+        adaptive = limiter(initial=4)
+        adaptive._observe(0.1, None, saturated=False)
+        assert adaptive.limit == 4
+        for _ in range(4):
+            adaptive._observe(0.1, None, saturated=True)
+        assert 4.9 < adaptive.limit < 5.0
+
+    def test_latency_spike_shrinks_limit(self):
+        """Test the gradient step when a call is much slower than average."""
+        adaptive = limiter(initial=10, latency_tolerance=2.0)
+        adaptive._observe(1.0, None, saturated=False)
+        adaptive._observe(3.0, None, saturated=True)
+        assert adaptive.limit == pytest.approx(9.0)
+
+    def test_other_errors_leave_limit(self):
+        """Test that failures other than throttling and timeouts carry no capacity signal."""
+        adaptive = limiter(initial=4)
+        adaptive._observe(0.1, ValueError("bad request"), saturated=True)
+        assert adaptive.limit == 4
+        assert adaptive.latency_ewma is None
+
+    def test_timeout_shrinks_limit(self):
+        """Test that timeouts count as congestion."""
+        adaptive = limiter(initial=8)
+        adaptive._observe(30.0, TimeoutError(), saturated=True)
+        assert adaptive.limit == 4
+        assert metrics.get("llm_timeouts_total") == 1
+
+    @pytest.mark.asyncio
+    async def test_run_caps_in_flight(self):
+        """Test that calls over the limit wait their turn."""
+        adaptive = limiter(initial=2, max_limit=2)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            peak = max(peak, adaptive.in_flight)
+            await asyncio.sleep(0.01)
+            return "done"
+
+        results = await asyncio.gather(*(adaptive.run(call) for _ in range(6)))
+        assert results == ["done"] * 6
+        assert peak == 2
+        assert adaptive.in_flight == 0
+        assert adaptive.stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_throttled_call_shrinks_limit(self):
+        """Test that a 429 from the call lowers the limit and propagates."""
+        adaptive = limiter(initial=8)
+
+        async def call():
+            raise Throttled(429)
+
+        with pytest.raises(Throttled):
+            await adaptive.run(call)
+        assert adaptive.limit == 4
+        assert adaptive.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_abandoned_call_keeps_its_slot(self):
+        """Test that a cancelled caller frees the slot only once the call itself finishes."""
+        adaptive = limiter(initial=1, max_limit=1)
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+
+        caller = asyncio.create_task(adaptive.run(call))
+        await asyncio.sleep(0)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        assert adaptive.in_flight == 1
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert adaptive.in_flight == 0
+        assert adaptive.limit == 1
+
+    @pytest.mark.asyncio
+    async def test_deadline_cancel_shrinks_limit(self):
+        """Test that a call abandoned at the request deadline counts as a timeout."""
+        adaptive = limiter(initial=8)
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+
+        caller = asyncio.create_task(adaptive.run(call))
+        await asyncio.sleep(0)
+        with patch("backend.app.summarizer.limiter.remaining", return_value=0.0):
+            caller.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await caller
+        release.set()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert adaptive.limit == 4
+        assert metrics.get("llm_timeouts_total") == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_frees_its_place(self):
+        """Test that cancelling a queued call does not leak a slot."""
+        adaptive = limiter(initial=1, max_limit=1)
+        release = asyncio.Event()
+
+        async def holder():
+            await release.wait()
+
+        async def noop():
+            return None
+
+        holding = asyncio.create_task(adaptive.run(holder))
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(adaptive.run(noop))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        release.set()
+        await holding
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert adaptive.in_flight == 0
+        assert adaptive.stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_limiter_passes_through(self):
+        """Test that a disabled limiter neither counts nor adapts."""
+        adaptive = limiter(enabled=False)
+
+        async def call():
+            assert adaptive.in_flight == 0
+            raise Throttled(429)
+
+        with pytest.raises(Throttled):
+            await adaptive.run(call)
+        assert adaptive.limit == 4
+
+
+class TestEngineLimiter:
+    """Tests for the limiter around engine model calls."""
+
+    @pytest.mark.asyncio
+    async def test_engine_throttle_lowers_limit(self):
+        """Test that a throttled completion feeds the engine's limiter."""
+        engine = SummarizationEngine()
+        engine.client = MagicMock()
+        engine.client.chat.completions.create.side_effect = Throttled(429)
+        engine.limiter = limiter(initial=8)
+        with pytest.raises(Throttled):
+            await engine._complete("Summarize this")
+        assert engine.limiter.limit == 4
+        assert engine.limiter.in_flight == 0
@@ -0,0 +1,143 @@
+"""Unit tests for near-duplicate summary reuse."""
+import random
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.app.auth import create_access_token
+from backend.app.main import app
+from backend.app.store import SummaryStore
+from backend.app.summarizer.near_dup import NearDuplicateIndex, near_duplicates
+
+random.seed(7)
+VOCABULARY = [f"word{i}" for i in range(2000)]
+
+
+def article(words: int = 300) -> str:
+    return " ".join(random.choice(VOCABULARY) for _ in range(words))
+
+
+class TestNearDuplicateIndex:
+    """Tests for MinHash/LSH lookups."""
+
+    def test_near_duplicate_found(self):
+        """Test that a copy with a different footer matches."""
+        index = NearDuplicateIndex(threshold=0.8)
+        text = article()
+        index.add(text, "medium", "Stored summary")
+        match = index.lookup(text + " Subscribe today for 50% off, updated 10:42 UTC", "medium")
+        assert match is not None
+        summary, similarity = match
+        assert summary == "Stored summary"
+        assert similarity >= 0.8
+
+    def test_different_text_and_namespace(self):
+        """Test that unrelated text or another namespace does not match."""
+        index = NearDuplicateIndex(threshold=0.8)
+        text = article()
+        index.add(text, "medium", "Stored summary")
+        assert index.lookup(article(), "medium") is None
+        assert index.lookup(text, "short") is None
+
+    def test_short_text_is_ignored(self):
+        """Test that texts below the minimum word count are not indexed."""
+        index = NearDuplicateIndex(min_words=50)
+        index.add("too short to compare", "medium", "Summary")
+        assert len(index) == 0
+        assert index.lookup("too short to compare", "medium") is None
+
+    def test_oldest_entries_overwritten(self):
+        """Test that the index stays bounded and forgets the oldest entries."""
+        index = NearDuplicateIndex(max_entries=2)
+        texts = [article() for _ in range(3)]
+        for i, text in enumerate(texts):
+            index.add(text, "medium", f"Summary {i}")
+        assert len(index) == 2
+        assert index.lookup(texts[0], "medium") is None
+        assert index.lookup(texts[2], "medium")[0] == "Summary 2"
+
+    def test_deleted_summary_is_forgotten(self):
+        """Test that store deletions drop the entries of the deleted summary."""
+        index = NearDuplicateIndex(threshold=0.8)
+        store = SummaryStore()
+        store.subscribe(index.on_store_event)
+        text, other = article(), article()
+        index.add(text, "medium", "Deleted summary")
+        index.add(other, "medium", "Kept summary")
+        store["a"] = {"summary": "Deleted summary", "length": "medium", "user_id": "u"}
+        del store["a"]
+        assert index.lookup(text, "medium") is None
+        assert index.lookup(other, "medium")[0] == "Kept summary"
+        store.clear()
+        assert len(index) == 0
+
+
+class TestNearDuplicateEndpoint:
+    """Tests for reuse through the summarize route."""
+
+    def test_reused_summary_is_marked(self):
+        """Test that a near-duplicate request skips the model and is marked reused."""
+        near_duplicates.clear()
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'dup_user'})}"}
+        text = article()
+        client = TestClient(app)
+        with patch("backend.app.api.engine.generate_summary", return_value="Original summary") as generate:
+            first = client.post("/api/summarize", headers=headers, json={"text": text, "summary_length": "short"})
+            second = client.post(
+                "/api/summarize",
+                headers=headers,
+                json={"text": text + " Advertisement: buy now", "summary_length": "short"},
+            )
+        assert "reused" not in first.json()
+        assert second.json()["summary"] == "Original summary"
+        assert second.json()["reused"]["similarity"] >= 0.9
+        assert generate.call_count == 1
+
+    def test_reuse_is_scoped_to_user(self):
+        """Test that another user's summaries are not reused by default."""
+        near_duplicates.clear()
+        text = article()
+        client = TestClient(app)
+        with patch("backend.app.api.engine.generate_summary", return_value="A summary") as generate:
+            for user in ("first_user", "second_user"):
+                headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user})}"}
+                response = client.post("/api/summarize", headers=headers, json={"text": text, "summary_length": "short"})
+                assert "reused" not in response.json()
+        assert generate.call_count == 2
+
+    def test_reuse_opt_out_and_incremental(self):
+        """Test that reuse_similar=false and incremental requests call the model again."""
+        near_duplicates.clear()
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'fresh_user'})}"}
+        text = article()
+        client = TestClient(app)
+        with patch("backend.app.api.engine.generate_summary", return_value="A summary") as generate, patch(
+            "backend.app.api.engine.generate_incremental_summary", return_value=("Incremental summary", {})
+        ) as incremental:
+            client.post("/api/summarize", headers=headers, json={"text": text, "summary_length": "short"})
+            opted_out = client.post(
+                "/api/summarize",
+                headers=headers,
+                json={"text": text, "summary_length": "short", "reuse_similar": False},
+            )
+            recomputed = client.post(
+                "/api/summarize",
+                headers=headers,
+                json={"text": text, "summary_length": "short", "incremental": True},
+            )
+        assert "reused" not in opted_out.json()
+        assert recomputed.json()["summary"] == "Incremental summary"
+        assert generate.call_count == 2
+        assert incremental.call_count == 1
+
+    def test_deleted_summary_is_not_reused(self):
+        """Test that deleting a summary stops it being served for similar input."""
+        near_duplicates.clear()
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'deleting_user'})}"}
+        text = article()
+        client = TestClient(app)
+        with patch("backend.app.api.engine.generate_summary", return_value="Deleted later") as generate:
+            first = client.post("/api/summarize", headers=headers, json={"text": text, "summary_length": "short"})
+            client.delete(f"/api/summary/{first.json()['id']}", headers=headers)
+            second = client.post("/api/summarize", headers=headers, json={"text": text, "summary_length": "short"})
+        assert "reused" not in second.json()
+        assert generate.call_count == 2
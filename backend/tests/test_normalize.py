@@ -0,0 +1,39 @@
+"""Unit tests for pre-summarization text normalization."""
+from backend.app.summarizer.normalize import normalize_text
+from backend.app.summarizer.utils import PAGE_BREAK
+
+
+class TestNormalizeText:
+    """Tests for the normalization and deduplication stage."""
+
+    def test_collapses_whitespace(self):
+        """Test that whitespace runs and trailing table-cell spaces are collapsed."""
+        text, stats = normalize_text("Cell one   Cell two \t \nNext   line  \n\n\n\nLast")
+        assert text == "Cell one Cell two\nNext line\n\nLast"
+        assert stats["chars_saved"] > 0
+
+    def test_removes_repeated_headers_and_page_numbers(self):
+        """Test that running headers, footers and page numbers are dropped."""
+        bodies = ["Revenue grew.", "Costs fell.", "Margins widened.", "Hiring paused.", "Outlook held."]
+        pages = [f"ACME Corp Annual Report\n{body}\nPage {i} of 5" for i, body in enumerate(bodies, 1)]
+        text, stats = normalize_text(PAGE_BREAK.join(pages))
+        assert "ACME Corp" not in text
+        assert "Page 3 of 5" not in text
+        assert "Margins widened." in text
+        assert stats["header_footer_lines_removed"] == 10
+
+    def test_removes_near_duplicate_paragraphs(self):
+        """Test that boilerplate paragraphs differing slightly are removed."""
+        boilerplate = "This message and any attachments are confidential and intended solely for the addressee"
+        text, stats = normalize_text(
+            f"Quarterly results improved.\n\n{boilerplate}.\n\nGuidance was raised.\n\n{boilerplate} only."
+        )
+        assert text.count("confidential") == 1
+        assert stats["duplicate_paragraphs_removed"] == 1
+        assert stats["tokens_saved"] > 0
+
+    def test_keeps_single_page_numbers(self):
+        """Test that single-page text keeps numeric lines."""
+        text, stats = normalize_text("42\nThe answer.")
+        assert text == "42\nThe answer."
+        assert stats["header_footer_lines_removed"] == 0
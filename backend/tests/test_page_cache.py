@@ -0,0 +1,91 @@
+"""Unit tests for cached UI pages and response compression."""
+import pytest
+from fastapi.testclient import TestClient
+from jinja2 import DictLoader, Environment
+
+from backend.app.main import app
+from backend.app.page_cache import PageCache, etag_matches
+from backend.app.ui import PAGES, page_cache
+
+
+def make_cache() -> PageCache:
+    env = Environment(loader=DictLoader({
+        "static.html": "<p>Same for everyone</p>",
+        "history.html": "{% for s in summaries %}<li>{{ s }}</li>{% endfor %}",
+    }))
+    return PageCache(env)
+
+
+class TestPageCache:
+    """Tests for the rendered page cache."""
+
+    def test_static_page_rendered_once(self):
+        """Test that a template without variables is rendered once and shared."""
+        cache = make_cache()
+        cache.warm(["static.html", "history.html"])
+        assert cache.is_static("static.html") and not cache.is_static("history.html")
+        assert list(cache._static) == ["static.html"]
+        assert cache.page("static.html") is cache.page("static.html")
+
+    def test_ui_pages_are_static(self):
+        """Test that every UI page can be served from the shared cache."""
+        assert all(page_cache.is_static(name) for name in PAGES)
+
+    def test_etag_matching(self):
+        """Test If-None-Match lists, weak tags and the wildcard."""
+        assert etag_matches('"a", W/"b"', '"b"')
+        assert etag_matches("*", '"b"')
+        assert not etag_matches('"a"', '"b"')
+        assert not etag_matches(None, '"b"')
+
+
+class TestUIPages:
+    """Tests for conditional and compressed UI responses."""
+
+    def test_not_modified(self):
+        """Test that a matching ETag gets an empty 304."""
+        client = TestClient(app)
+        first = client.get("/about")
+        assert first.status_code == 200
+        assert first.headers["cache-control"] == "no-cache"
+        second = client.get("/about", headers={"If-None-Match": first.headers["etag"]})
+        assert second.status_code == 304
+        assert second.content == b""
+
+    def test_pages_compressed(self):
+        """Test that HTML is compressed for clients that accept gzip, with a weakened ETag."""
+        response = TestClient(app).get("/", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"].startswith('W/"')
+        assert b"<html" in response.content.lower()
+
+    def test_json_compressed(self):
+        """Test that JSON API responses are compressed too."""
+        response = TestClient(app).get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json()["info"]["title"]
+
+    def test_compressed_etag_revalidates(self):
+        """Test that the weak ETag of a compressed page still yields a 304."""
+        client = TestClient(app)
+        etag = client.get("/", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+        response = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_pages_brotli_compressed(self):
+        """Test that clients accepting br get Brotli when the optional package is installed."""
+        brotli = pytest.importorskip("brotli")
+        with TestClient(app).stream("GET", "/", headers={"Accept-Encoding": "br, gzip"}) as response:
+            raw = b"".join(response.iter_raw())
+        assert response.headers["content-encoding"] == "br"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.headers["etag"].startswith('W/"')
+        assert b"<html" in brotli.decompress(raw).lower()
+
+    def test_small_responses_not_brotli_compressed(self):
+        """Test that bodies under the minimum size are sent as is."""
+        pytest.importorskip("brotli")
+        response = TestClient(app).get("/api/health", headers={"Accept-Encoding": "br"})
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
@@ -0,0 +1,105 @@
+"""Unit tests for opt-in request profiling."""
+import time
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.app.auth import create_access_token
+from backend.app.main import app
+from backend.app.profiling import ProfileStore, RequestProfile, profile_store, stage, to_thread
+
+
+async def profiled_summary(text, length="medium"):
+    """Simulate a model call that spends time in a worker thread."""
+    with stage("llm_call"):
+        await to_thread(time.sleep, 0.05)
+    return "A summary"
+
+
+def auth_headers(user_id: str, **extra) -> dict:
+    token = create_access_token(data={"sub": user_id})
+    return {"Authorization": f"Bearer {token}", **extra}
+
+
+class TestStage:
+    """Tests for stage timing outside and inside a profile."""
+
+    def test_stage_is_noop_without_profile(self):
+        """Test that stage() returns the shared no-op context when not profiling."""
+        assert stage("a") is stage("b")
+        with stage("a"):
+            pass
+
+    def test_profile_store_is_bounded(self):
+        """Test that the oldest profiles are evicted."""
+        store = ProfileStore(max_entries=2)
+        profiles = [RequestProfile("/api/summarize", "admin") for _ in range(3)]
+        for profile in profiles:
+            store.add(profile)
+        assert store.get(profiles[0].id) is None
+        assert [p.id for p in store.list()] == [profiles[2].id, profiles[1].id]
+
+
+class TestProfilingEndpoints:
+    """Tests for profiling through the API."""
+
+    @pytest.fixture(autouse=True)
+    def admin_users(self):
+        with patch("backend.app.auth.settings.ADMIN_USERS", "admin_user, other_admin"):
+            yield
+
+    def test_admin_can_profile_request(self):
+        """Test that an admin gets a downloadable profile with stage timings."""
+        client = TestClient(app)
+        with patch("backend.app.api.engine.generate_summary", side_effect=profiled_summary):
+            response = client.post(
+                "/api/summarize",
+                headers=auth_headers("admin_user", **{"X-Profile": "1"}),
+                json={"text": "Some text to summarize", "summary_length": "short"},
+            )
+        assert response.status_code == 200
+        profile_id = response.headers["X-Profile-Id"]
+
+        profile = client.get(f"/api/admin/profiles/{profile_id}", headers=auth_headers("admin_user")).json()
+        stages = [entry["stage"] for entry in profile["stages"]]
+        assert "llm_call" in stages
+        assert "persistence" in stages
+        assert profile["sample_count"] > 0
+
+        folded = client.get(
+            f"/api/admin/profiles/{profile_id}?format=folded", headers=auth_headers("admin_user")
+        )
+        assert folded.status_code == 200
+        assert "profiling.py" in folded.text
+
+    def test_unprofiled_request_has_no_profile(self):
+        """Test that requests without the flag are not profiled."""
+        with patch("backend.app.api.engine.generate_summary", side_effect=profiled_summary):
+            response = TestClient(app).post(
+                "/api/summarize",
+                headers=auth_headers("admin_user"),
+                json={"text": "Some text to summarize", "summary_length": "short"},
+            )
+        assert response.status_code == 200
+        assert "X-Profile-Id" not in response.headers
+
+    def test_non_admin_cannot_profile(self):
+        """Test that profiling is refused for non-admin users."""
+        response = TestClient(app).post(
+            "/api/summarize?profile=1",
+            headers=auth_headers("regular_user"),
+            json={"text": "Some text to summarize", "summary_length": "short"},
+        )
+        assert response.status_code == 403
+
+    def test_non_admin_cannot_download(self):
+        """Test that the profile endpoints require admin access."""
+        client = TestClient(app)
+        assert client.get("/api/admin/profiles", headers=auth_headers("regular_user")).status_code == 403
+        assert client.get("/api/admin/profiles", headers=auth_headers("other_admin")).status_code == 200
+
+    def test_unknown_profile(self):
+        """Test that a missing profile returns 404."""
+        response = TestClient(app).get("/api/admin/profiles/missing", headers=auth_headers("admin_user"))
+        assert response.status_code == 404
+        assert profile_store.get("missing") is None
@@ -0,0 +1,135 @@
+"""Unit tests for summary retention."""
+import asyncio
+from datetime import datetime, timedelta
+import pytest
+
+from backend.app.retention import RetentionManager, RetentionPolicy
+from backend.app.config import settings
+from backend.app.store import SummaryStore, UserIndexes
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+def populate(store: SummaryStore, indexes: UserIndexes, user_id: str, ages_hours: list[float]) -> list[str]:
+    ids = []
+    for i, age in enumerate(ages_hours):
+        summary_id = f"{user_id}-{i}"
+        store[summary_id] = {
+            "summary": f"Summary {i}",
+            "length": "short",
+            "created_at": (NOW - timedelta(hours=age)).isoformat(),
+            "user_id": user_id,
+        }
+        indexes.setdefault(user_id, [])
+        indexes[user_id].append(summary_id)
+        ids.append(summary_id)
+    return ids
+
+
+def make_manager(store: SummaryStore, indexes: UserIndexes) -> RetentionManager:
+    return RetentionManager(
+        store,
+        indexes,
+        guest_policy=RetentionPolicy(max_count=2, max_age_hours=24),
+        user_policy=RetentionPolicy(max_count=3),
+        interval=0.01,
+    )
+
+
+class TestRetention:
+    """Tests for retention sweeps."""
+
+    def test_age_and_count_limits(self):
+        """Test that guests lose old summaries and users keep only their newest ones."""
+        store, indexes = SummaryStore(), UserIndexes()
+        guest = populate(store, indexes, "guest_abc", [48, 1, 2])
+        user = populate(store, indexes, "alice", [500, 5, 400, 1, 2])
+
+        result = make_manager(store, indexes).sweep(now=NOW)
+
+        assert result["evicted"] == 3
+        assert list(indexes["guest_abc"]) == guest[1:]
+        assert list(indexes["alice"]) == [user[1], user[3], user[4]]
+        assert len(store) == 5
+
+    def test_empty_users_dropped(self):
+        """Test that a user whose summaries all expire is removed from the indexes."""
+        store, indexes = SummaryStore(), UserIndexes()
+        populate(store, indexes, "guest_old", [30, 40])
+        make_manager(store, indexes).sweep(now=NOW)
+        assert "guest_old" not in indexes
+        assert len(store) == 0
+
+    def test_listeners_notified(self):
+        """Test that evictions reach store listeners such as the search index."""
+        store, indexes = SummaryStore(), UserIndexes()
+        events = []
+        store.subscribe(lambda event, record: events.append(event))
+        populate(store, indexes, "guest_abc", [48])
+        events.clear()
+        make_manager(store, indexes).sweep(now=NOW)
+        assert events == ["delete"]
+
+    def test_within_policy_untouched(self):
+        """Test that a sweep with nothing to evict changes nothing."""
+        store, indexes = SummaryStore(), UserIndexes()
+        populate(store, indexes, "alice", [1, 2])
+        assert make_manager(store, indexes).sweep(now=NOW)["evicted"] == 0
+        assert len(indexes["alice"]) == 2
+
+    def test_guests_capped_as_one_group(self):
+        """Test that the guest count limit applies to all guests together, newest kept."""
+        store, indexes = SummaryStore(), UserIndexes()
+        populate(store, indexes, "guest_a", [5])
+        newer = populate(store, indexes, "guest_b", [1])
+        newest = populate(store, indexes, "guest_c", [0.5])
+        result = make_manager(store, indexes).sweep(now=NOW)
+        assert result["evicted"] == 1
+        assert "guest_a" not in indexes
+        assert list(indexes["guest_b"]) == newer and list(indexes["guest_c"]) == newest
+
+    def test_default_keeps_user_history(self):
+        """Test that registered users' history is not capped by default."""
+        assert settings.RETENTION_USER_MAX_COUNT == 0 and settings.RETENTION_USER_MAX_AGE_HOURS == 0
+        store, indexes = SummaryStore(), UserIndexes()
+        populate(store, indexes, "alice", [float(i) for i in range(1500)])
+        manager = RetentionManager(store, indexes, user_policy=RetentionPolicy(
+            settings.RETENTION_USER_MAX_COUNT, settings.RETENTION_USER_MAX_AGE_HOURS
+        ))
+        assert manager.sweep(now=NOW)["evicted"] == 0
+        assert len(indexes["alice"]) == 1500
+
+    @pytest.mark.asyncio
+    async def test_async_sweep_yields_between_batches(self):
+        """Test that the incremental sweep lets other tasks run and evicts the same summaries."""
+        store, indexes = SummaryStore(), UserIndexes()
+        for i in range(6):
+            populate(store, indexes, f"user{i}", [1, 2, 3, 4])
+        manager = make_manager(store, indexes)
+        manager.batch_size = 2
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(ticker())
+        await asyncio.sleep(0)
+        result = await manager.sweep_async(now=NOW)
+        task.cancel()
+        assert result["evicted"] == 6
+        assert ticks >= 3
+        assert all(len(indexes[f"user{i}"]) == 3 for i in range(6))
+
+    @pytest.mark.asyncio
+    async def test_background_task(self):
+        """Test that the background task sweeps until stopped."""
+        store, indexes = SummaryStore(), UserIndexes()
+        populate(store, indexes, "guest_abc", [1000])
+        manager = make_manager(store, indexes)
+        manager.start()
+        await asyncio.sleep(0.05)
+        await manager.stop()
+        assert len(store) == 0
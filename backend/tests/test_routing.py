@@ -0,0 +1,155 @@
+"""Unit tests for model routing."""
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from backend.app.auth import create_access_token
+from backend.app.main import app
+from backend.app.summarizer.engine import SummarizationEngine
+from backend.app.summarizer.limiter import AdaptiveLimiter
+from backend.app.summarizer.routing import ModelRouter, Route
+
+
+def make_router() -> ModelRouter:
+    return ModelRouter([
+        Route("small", "mini", max_input_tokens=1000, lengths=["short", "medium"],
+              input_cost_per_1k=0.1, output_cost_per_1k=0.4, latency_slo=5.0),
+        Route("large", "big", input_cost_per_1k=1.0, output_cost_per_1k=4.0, params={"temperature": 0.3}),
+    ])
+
+
+def fake_completion(content: str, prompt_tokens: int = 100, completion_tokens: int = 20) -> MagicMock:
+    response = MagicMock()
+    response.choices[0].message.content = content
+    response.usage.prompt_tokens = prompt_tokens
+    response.usage.completion_tokens = completion_tokens
+    return response
+
+
+class TestModelRouter:
+    """Tests for the routing policy."""
+
+    def test_routes_by_size_and_length(self):
+        """Test that small inputs go to the small route and big or long ones to the large one."""
+        router = make_router()
+        assert router.choose(200, "short").name == "small"
+        assert router.choose(5000, "short").name == "large"
+        assert router.choose(200, "long").name == "large"
+
+    def test_degraded_route_is_skipped(self):
+        """Test that a route over its latency SLO loses to a faster one."""
+        router = make_router()
+        router.record(router.routes[0], 30.0)
+        router.record(router.routes[1], 2.0)
+        assert router.choose(200, "short").name == "large"
+
+    def test_degraded_route_recovers(self):
+        """Test that a degraded route is probed after the recovery period and returns once fast."""
+        router = make_router()
+        small, large = router.routes
+        router.record(small, 30.0)
+        router.record(large, 2.0)
+        small.latency_updated -= 61
+        with patch("backend.app.summarizer.routing.settings.MODEL_ROUTING_RECOVERY_SECONDS", 60.0):
+            assert router.choose(200, "short").name == "small"
+            assert router.start_probe(small)
+            # Only one probe is out at a time
+            assert small.probing
+            assert router.choose(200, "short").name == "large"
+            router.record(small, 1.0)
+            assert not small.probing
+            assert router.choose(200, "short").name == "small"
+            assert router.choose(200, "short").name == "small"
+
+    def test_slow_probe_keeps_route_out(self):
+        """Test that a failed or slow probe waits another recovery period."""
+        router = make_router()
+        small, large = router.routes
+        router.record(small, 30.0)
+        router.record(large, 2.0)
+        small.latency_updated -= 61
+        with patch("backend.app.summarizer.routing.settings.MODEL_ROUTING_RECOVERY_SECONDS", 60.0):
+            assert router.start_probe(router.choose(200, "short"))
+            router.record_failure(small, 0.1)
+            assert router.choose(200, "short").name == "large"
+            small.latency_updated -= 61
+            assert router.start_probe(router.choose(200, "short"))
+            router.record(small, 25.0)
+            assert router.choose(200, "short").name == "large"
+
+    def test_healthy_route_is_not_probed(self):
+        """Test that only a degraded route can be claimed for a probe."""
+        router = make_router()
+        assert not router.start_probe(router.routes[0])
+        assert not router.routes[0].probing
+
+    def test_oversized_input_uses_largest_route(self):
+        """Test that input over every limit goes to the route with the largest limit."""
+        router = ModelRouter([Route("a", "a", max_input_tokens=100), Route("b", "b", max_input_tokens=500)])
+        assert router.choose(10000).name == "b"
+
+    def test_default_route(self):
+        """Test that an empty configuration uses the configured deployment."""
+        with patch("backend.app.summarizer.routing.settings.MODEL_ROUTES", []):
+            router = ModelRouter()
+        assert [route.name for route in router.routes] == ["default"]
+
+
+class TestRoutedRequests:
+    """Tests for routing through the API."""
+
+    def test_route_and_cost_recorded(self):
+        """Test that the chosen route, tokens and cost are stored on the summary record."""
+        token = create_access_token(data={"sub": "routing_user"})
+        with patch("backend.app.api.engine.client") as client, \
+                patch("backend.app.api.engine.router", make_router()):
+            client.chat.completions.create.return_value = fake_completion("Routed summary")
+            response = TestClient(app).post(
+                "/api/summarize",
+                headers={"Authorization": f"Bearer {token}"},
+                json={"text": "A short note for the routing test.", "summary_length": "long"},
+            )
+        assert response.status_code == 200
+        route = response.json()["route"]
+        assert route["routes"] == ["large"]
+        assert route["prompt_tokens"] == 100
+        assert route["cost"] == 0.1 * 1.0 + 0.02 * 4.0
+
+        call = client.chat.completions.create.call_args
+        assert call.kwargs["model"] == "big"
+        assert call.kwargs["temperature"] == 0.3
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_route(self):
+        """Test that a probe cancelled before it reports back does not keep the route out."""
+        router = make_router()
+        small, large = router.routes
+        router.record(small, 30.0)
+        router.record(large, 2.0)
+        small.latency_updated -= 61
+        engine = SummarizationEngine()
+        engine.router = router
+        engine.client = MagicMock()
+        engine.limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=1, enabled=True)
+        release = asyncio.Event()
+
+        async def holder():
+            await release.wait()
+
+        # The only limiter slot is busy, so the probe waits in the queue and is cancelled there
+        holding = asyncio.create_task(engine.limiter.run(holder))
+        await asyncio.sleep(0)
+        with patch("backend.app.summarizer.routing.settings.MODEL_ROUTING_RECOVERY_SECONDS", 60.0):
+            probe = asyncio.create_task(engine._complete("Summarize this"))
+            await asyncio.sleep(0)
+            assert small.probing
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            release.set()
+            await holding
+            assert not small.probing
+            engine.client.chat.completions.create.assert_not_called()
+            small.latency_updated -= 61
+            assert router.choose(200, "short").name == "small"
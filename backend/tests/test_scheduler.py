@@ -0,0 +1,175 @@
+"""Unit tests for per-user fair scheduling."""
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+
+from backend.app.errors import QuotaExceededError
+from backend.app.summarizer.limiter import AdaptiveLimiter
+from backend.app.summarizer.scheduler import GUEST_FLOW, FairScheduler
+
+
+async def run_job(scheduler, order, user_id, lane="interactive", cost=100):
+    """Acquire a slot and record the order in which jobs run."""
+    async with scheduler.slot(user_id, lane, cost=cost):
+        order.append((user_id, lane))
+        await asyncio.sleep(0)
+
+
+class TestFairScheduler:
+    """Tests for the weighted fair queuing scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_interactive_lane_runs_before_batch(self):
+        """Test that queued interactive work overtakes queued batch work."""
+        scheduler = FairScheduler(max_concurrency=1, tokens_per_minute=0)
+        order = []
+        gate = asyncio.Event()
+
+        async def blocker():
+            async with scheduler.slot("holder"):
+                await gate.wait()
+
+        holder = asyncio.create_task(blocker())
+        await asyncio.sleep(0)
+        batch = [asyncio.create_task(run_job(scheduler, order, "batcher", "batch")) for _ in range(3)]
+        await asyncio.sleep(0)
+        interactive = asyncio.create_task(run_job(scheduler, order, "alice"))
+        await asyncio.sleep(0)
+
+        gate.set()
+        await asyncio.gather(holder, *batch, interactive)
+        assert order[0] == ("alice", "interactive")
+
+    @pytest.mark.asyncio
+    async def test_users_share_a_lane_fairly(self):
+        """Test that a user with a backlog does not starve a newcomer."""
+        scheduler = FairScheduler(max_concurrency=1, tokens_per_minute=0)
+        order = []
+        gate = asyncio.Event()
+
+        async def blocker():
+            async with scheduler.slot("holder"):
+                await gate.wait()
+
+        holder = asyncio.create_task(blocker())
+        await asyncio.sleep(0)
+        heavy = [asyncio.create_task(run_job(scheduler, order, "heavy", "batch")) for _ in range(5)]
+        await asyncio.sleep(0)
+        light = asyncio.create_task(run_job(scheduler, order, "light", "batch"))
+        await asyncio.sleep(0)
+
+        gate.set()
+        await asyncio.gather(holder, *heavy, light)
+        assert [user for user, _ in order].index("light") <= 1
+
+    @pytest.mark.asyncio
+    async def test_quota_exceeded(self):
+        """Test that the per-user token quota is enforced."""
+        scheduler = FairScheduler(max_concurrency=4, tokens_per_minute=100)
+        async with scheduler.slot("alice", cost=80):
+            pass
+        with pytest.raises(QuotaExceededError):
+            async with scheduler.slot("alice", cost=80):
+                pass
+        async with scheduler.slot("bob", cost=80):
+            pass
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_releases_nothing(self):
+        """Test that a cancelled queued job does not leak a slot."""
+        scheduler = FairScheduler(max_concurrency=1, tokens_per_minute=0)
+        order = []
+        async with scheduler.slot("holder"):
+            waiter = asyncio.create_task(run_job(scheduler, order, "alice"))
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        assert scheduler.running == 0
+        assert order == []
+
+    @pytest.mark.asyncio
+    async def test_guests_share_one_quota(self):
+        """Test that new guest IDs cannot reset the token quota."""
+        scheduler = FairScheduler(max_concurrency=4, tokens_per_minute=1000, guest_tokens_per_minute=100)
+        async with scheduler.slot("guest_aaaa1111", cost=80):
+            pass
+        with pytest.raises(QuotaExceededError):
+            async with scheduler.slot("guest_bbbb2222", cost=80):
+                pass
+        assert list(scheduler._buckets) == [GUEST_FLOW]
+
+    @pytest.mark.asyncio
+    async def test_idle_buckets_are_pruned(self):
+        """Test that refilled buckets are dropped instead of kept per user forever."""
+        scheduler = FairScheduler(max_concurrency=4, tokens_per_minute=100)
+        now = time.monotonic()
+        with patch("backend.app.summarizer.scheduler.time.monotonic", return_value=now):
+            for user in ("alice", "bob", "carol"):
+                async with scheduler.slot(user, cost=10):
+                    pass
+        assert len(scheduler._buckets) == 3
+        with patch("backend.app.summarizer.scheduler.time.monotonic", return_value=now + 120):
+            async with scheduler.slot("dave", cost=10):
+                pass
+        assert list(scheduler._buckets) == ["dave"]
+
+    @pytest.mark.asyncio
+    async def test_passed_finish_tags_are_pruned(self):
+        """Test that finish tags behind the lane's virtual time are forgotten while it stays busy."""
+        scheduler = FairScheduler(max_concurrency=1, tokens_per_minute=0)
+        sizes = []
+
+        async def job(user_id):
+            async with scheduler.slot(user_id, cost=100):
+                sizes.append((user_id, len(scheduler._finish_tags["interactive"])))
+                await asyncio.sleep(0)
+
+        async with scheduler.slot("holder"):
+            jobs = [asyncio.create_task(job("heavy")) for _ in range(5)]
+            jobs += [asyncio.create_task(job(f"light{i}")) for i in range(30)]
+            await asyncio.sleep(0)
+            assert len(scheduler._finish_tags["interactive"]) == 31
+        await asyncio.gather(*jobs)
+        # Once the heavy user's later jobs advance virtual time, the light users' tags are dropped
+        assert sizes[-2] == ("heavy", 1)
+
+    def test_capacity_follows_limiter(self):
+        """Test that the slot count tracks the adaptive limit, above and below max_concurrency."""
+        limiter = AdaptiveLimiter(initial=2, min_limit=1, max_limit=64, enabled=True)
+        scheduler = FairScheduler(max_concurrency=16, tokens_per_minute=0, limiter=limiter)
+        assert scheduler.capacity == 2
+        limiter.limit = 32.0
+        assert scheduler.capacity == 32
+        limiter.enabled = False
+        assert scheduler.capacity == 16
+
+    @pytest.mark.asyncio
+    async def test_lanes_hold_work_over_the_limit(self):
+        """Test that work over the limit queues by lane, and a grown limit admits several jobs."""
+        limiter = AdaptiveLimiter(initial=1, min_limit=1, max_limit=8, enabled=True)
+        scheduler = FairScheduler(max_concurrency=16, tokens_per_minute=0, limiter=limiter)
+        order = []
+        gate = asyncio.Event()
+
+        async def blocker():
+            async with scheduler.slot("holder"):
+                await gate.wait()
+
+        holder = asyncio.create_task(blocker())
+        await asyncio.sleep(0)
+        batch = [asyncio.create_task(run_job(scheduler, order, "batcher", "batch")) for _ in range(2)]
+        interactive = asyncio.create_task(run_job(scheduler, order, "alice"))
+        await asyncio.sleep(0)
+        assert scheduler.running == 1
+        assert scheduler.stats()["queued"] == {"interactive": 1, "batch": 2, "background": 0}
+
+        limiter.limit = 4.0
+        gate.set()
+        await holder
+        # The freed slot and the grown limit admit every waiter at once, interactive first
+        assert scheduler.running == 3
+        await asyncio.gather(*batch, interactive)
+        assert order[0] == ("alice", "interactive")
+        assert scheduler.running == 0
@@ -0,0 +1,104 @@
+"""Unit tests for full-text search over summary history."""
+import uuid
+from datetime import datetime
+from fastapi.testclient import TestClient
+
+from backend.app.api import summaries_db, users_db
+from backend.app.auth import create_access_token
+from backend.app.main import app
+from backend.app.search import SearchIndex
+from backend.app.store import SummaryRecord, SummaryStore
+
+
+def make_record(summary: str, user_id: str = "test_user", **extra) -> SummaryRecord:
+    """Build a stored summary record."""
+    return SummaryRecord(
+        summary_id=str(uuid.uuid4()),
+        summary=summary,
+        length="medium",
+        user_id=user_id,
+        created_at=datetime.utcnow(),
+        extra=extra,
+    )
+
+
+class TestSearchIndex:
+    """Tests for the BM25 inverted index."""
+
+    def test_ranks_more_relevant_first(self):
+        """Test that summaries matching more query terms rank higher."""
+        index = SearchIndex()
+        weak = make_record("Solar output was flat this quarter.")
+        strong = make_record("Solar battery storage lifted solar output.")
+        other = make_record("The cafeteria menu changed.")
+        for record in (weak, strong, other):
+            index.add(record)
+
+        hits, total = index.search("test_user", "solar battery")
+        assert total == 2
+        assert [summary_id for summary_id, _ in hits] == [strong.id, weak.id]
+
+    def test_searches_filename_and_url(self):
+        """Test that filename and source URL are searchable."""
+        index = SearchIndex()
+        record = make_record("Quarterly numbers.", filename="acme_report.pdf")
+        index.add(record)
+
+        hits, _ = index.search("test_user", "acme")
+        assert hits[0][0] == record.id
+
+    def test_isolates_users(self):
+        """Test that users only see their own summaries."""
+        index = SearchIndex()
+        index.add(make_record("Solar panels", user_id="someone_else"))
+        assert index.search("test_user", "solar") == ([], 0)
+
+    def test_pagination(self):
+        """Test limit and offset."""
+        index = SearchIndex()
+        for i in range(5):
+            index.add(make_record(f"Solar report number {i}"))
+
+        first, total = index.search("test_user", "solar", limit=2)
+        second, _ = index.search("test_user", "solar", limit=2, offset=2)
+        assert total == 5
+        assert len(first) == len(second) == 2
+        assert not {sid for sid, _ in first} & {sid for sid, _ in second}
+
+    def test_follows_store_changes(self):
+        """Test that the index is updated incrementally from store events."""
+        store = SummaryStore()
+        index = SearchIndex()
+        store.subscribe(index.on_store_event)
+
+        record = make_record("Wind turbine maintenance")
+        store[record.id] = record
+        assert index.search("test_user", "turbine")[1] == 1
+
+        del store[record.id]
+        assert index.search("test_user", "turbine") == ([], 0)
+
+
+class TestSearchEndpoint:
+    """Tests for /api/history/search."""
+
+    def setup_method(self):
+        """Clear databases before each test."""
+        summaries_db.clear()
+        users_db.clear()
+
+    def test_search_endpoint(self):
+        """Test searching history through the API."""
+        record = make_record("Hydrogen fuel cell roadmap")
+        summaries_db[record.id] = record
+        token = create_access_token(data={"sub": "test_user"})
+
+        response = TestClient(app).get(
+            "/api/history/search",
+            params={"q": "hydrogen"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 1
+        assert data["results"][0]["id"] == record.id
@@ -0,0 +1,78 @@
+"""Unit tests for the cross-worker shared cache table."""
+import multiprocessing
+
+from backend.app.summarizer.cache import SummaryCache
+from backend.app.summarizer.extraction_cache import ExtractionCache
+from backend.app.summarizer.shared_cache import MAX_PROBE, SharedTable
+
+
+def _write_in_child(path: str) -> None:
+    table = SharedTable(path, 64, 256)
+    table.set("from-child", b"written by another process")
+    table.close()
+
+
+class TestSharedTable:
+    """Tests for the memory-mapped table."""
+
+    def test_instances_share_entries(self, tmp_path):
+        """Test that a value written through one mapping is read through another."""
+        path = str(tmp_path / "table.tbl")
+        first, second = SharedTable(path, 64, 256), SharedTable(path, 64, 256)
+        assert first.set("key", b"value")
+        assert second.get("key") == b"value"
+        assert second.get("missing") is None
+        second.set("key", b"updated")
+        assert first.get("key") == b"updated"
+
+    def test_other_process_sees_writes(self, tmp_path):
+        """Test that a write from a separate process is visible to this one."""
+        path = str(tmp_path / "table.tbl")
+        table = SharedTable(path, 64, 256)
+        process = multiprocessing.get_context("spawn").Process(target=_write_in_child, args=(path,))
+        process.start()
+        process.join(timeout=30)
+        assert process.exitcode == 0
+        assert table.get("from-child") == b"written by another process"
+
+    def test_full_table_evicts_oldest(self, tmp_path):
+        """Test that writing past capacity overwrites the oldest entries and keeps the newest."""
+        table = SharedTable(str(tmp_path / "table.tbl"), MAX_PROBE, 64)
+        for i in range(MAX_PROBE * 2):
+            table.set(f"key-{i}", str(i).encode())
+        assert table.get(f"key-{MAX_PROBE * 2 - 1}") == str(MAX_PROBE * 2 - 1).encode()
+        assert table.get("key-0") is None
+
+    def test_oversized_value_rejected(self, tmp_path):
+        """Test that a value larger than a slot is not stored."""
+        table = SharedTable(str(tmp_path / "table.tbl"), 8, 64)
+        assert not table.set("big", b"x" * 64)
+        assert table.get("big") is None
+
+    def test_layout_change_recreates_file(self, tmp_path):
+        """Test that reopening with a different slot size starts from an empty table."""
+        path = str(tmp_path / "table.tbl")
+        SharedTable(path, 8, 64).set("key", b"value")
+        assert SharedTable(path, 16, 64).get("key") is None
+
+
+class TestSharedCaches:
+    """Tests for the caches backed by a shared table."""
+
+    def test_summary_cache_hits_across_workers(self, tmp_path):
+        """Test that a summary cached by one worker is a hit in another."""
+        path = str(tmp_path / "summaries.tbl")
+        writer = SummaryCache(shared=SharedTable(path, 64, 1024))
+        reader = SummaryCache(shared=SharedTable(path, 64, 1024))
+        writer.set("Some input text", "short", "Résumé summary")
+        assert reader.get("Some input text", "short") == "Résumé summary"
+        assert len(reader) == 1  # Promoted into the local LRU
+        assert reader.get("Some input text", "long") is None
+
+    def test_extraction_cache_hits_across_workers(self, tmp_path):
+        """Test that extracted text is served from the shared table without the disk cache."""
+        path = str(tmp_path / "extraction.tbl")
+        writer = ExtractionCache(str(tmp_path / "a"), shared=SharedTable(path, 16, 4096))
+        reader = ExtractionCache(str(tmp_path / "b"), shared=SharedTable(path, 16, 4096))
+        writer.set(b"%PDF-upload", "pdf", "Extracted text")
+        assert reader.get(b"%PDF-upload", "pdf") == "Extracted text"
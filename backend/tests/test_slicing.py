@@ -0,0 +1,128 @@
+"""Unit tests for page- and section-range summarization."""
+import asyncio
+import io
+import pytest
+from docx import Document
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.app.auth import create_access_token
+from backend.app.errors import ValidationError
+from backend.app.main import app
+from backend.app.summarizer import utils
+from backend.app.summarizer.docx_stream import DocxBlock
+from backend.app.summarizer.slicing import normalize_page_range, select_pages, select_section
+
+
+def build_report() -> bytes:
+    document = Document()
+    document.add_heading("Annual Report", level=0)
+    document.add_heading("1. Introduction", level=1)
+    document.add_paragraph("Intro text.")
+    document.add_heading("2. Results", level=1)
+    document.add_paragraph("Results text.")
+    document.add_heading("2.1 Regional", level=2)
+    document.add_paragraph("Regional text.")
+    document.add_heading("3. Outlook", level=1)
+    document.add_paragraph("Outlook text.")
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class TestPageRanges:
+    """Tests for page range parsing."""
+
+    def test_select_pages(self):
+        """Test single pages, ranges, open ranges and clipping to the page count."""
+        assert select_pages("2", 5) == [1]
+        assert select_pages("1-2, 4", 5) == [0, 1, 3]
+        assert select_pages("4-", 5) == [3, 4]
+        assert select_pages("3-10,1", 5) == [0, 2, 3, 4]
+
+    def test_invalid_ranges(self):
+        """Test that malformed or empty selections are rejected."""
+        for spec in ("", "a-b", "0", "5-2", "1--3"):
+            with pytest.raises(ValidationError):
+                select_pages(spec, 5)
+        with pytest.raises(ValidationError):
+            select_pages("9-12", 5)
+
+    def test_normalize(self):
+        """Test that equivalent spellings share one cache key."""
+        assert normalize_page_range(" 3 - 5 ,7,9- ") == "3-5,7,9-"
+        assert normalize_page_range("2-2") == "2"
+
+    def test_only_selected_pages_extracted(self, make_pdf):
+        """Test that PDF extraction returns just the requested pages."""
+        pdf = make_pdf(["Page one", "Page two", "Page three"])
+        text = utils._read_pdf(pdf, "2-3")
+        assert "Page one" not in text
+        assert "Page two" in text and "Page three" in text
+
+
+class TestSections:
+    """Tests for DOCX heading sections."""
+
+    def test_section_includes_subsections(self):
+        """Test that a section runs until the next heading of the same level."""
+        text = utils._read_docx(build_report(), "2. Results")
+        assert text.split("\n\n") == ["2. Results", "Results text.", "2.1 Regional", "Regional text."]
+
+    def test_section_by_number(self):
+        """Test that a bare number matches a numbered heading."""
+        assert utils._read_docx(build_report(), "3").endswith("Outlook text.")
+
+    def test_stops_reading_after_section(self):
+        """Test that blocks after the section are never pulled from the stream."""
+        pulled = []
+
+        def blocks():
+            for block in [DocxBlock("Intro", "paragraph", "Heading1"), DocxBlock("a", "paragraph"),
+                          DocxBlock("Next", "paragraph", "Heading1"), DocxBlock("b", "paragraph")]:
+                pulled.append(block.text)
+                yield block
+
+        assert [block.text for block in select_section(blocks(), "intro")] == ["Intro", "a"]
+        assert pulled == ["Intro", "a", "Next"]
+
+    def test_missing_section_lists_headings(self):
+        """Test that an unknown section is reported with the available headings."""
+        with pytest.raises(ValidationError) as error:
+            utils._read_docx(build_report(), "Appendix")
+        assert "2. Results" in error.value.message
+
+    def test_selection_must_match_format(self):
+        """Test that a page range on a DOCX is rejected."""
+        with pytest.raises(ValidationError):
+            asyncio.run(utils.extract_text(build_report(), "docx", page_range="1"))
+
+
+class TestSliceEndpoint:
+    """Tests for slices through the file upload route."""
+
+    def test_page_range_summarized(self, make_pdf):
+        """Test that only the requested pages reach the model and the range is recorded."""
+        headers = {"Authorization": f"Bearer {create_access_token(data={'sub': 'slice_user'})}"}
+        pdf = make_pdf(["Cover page", "Chapter three text about results"])
+        with patch("backend.app.api.engine.generate_summary", return_value="Chapter summary") as generate:
+            response = TestClient(app).post(
+                "/api/summarize/file",
+                headers=headers,
+                files={"file": ("book.pdf", pdf, "application/pdf")},
+                data={"summary_length": "short", "page_range": "2"},
+            )
+        assert response.status_code == 200
+        assert response.json()["page_range"] == "2"
+        sent = generate.call_args.args[0]
+        assert "Chapter three" in sent and "Cover page" not in sent
+
+    def test_malformed_range_rejected(self, make_pdf):
+        """Test that a malformed range fails with a validation error."""
+        response = TestClient(app).post(
+            "/api/summarize/file",
+            files={"file": ("book.pdf", make_pdf(["Text"]), "application/pdf")},
+            data={"summary_length": "short", "page_range": "two"},
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"]["code"] == "VALIDATION_ERROR"
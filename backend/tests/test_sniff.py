@@ -0,0 +1,141 @@
+"""Unit tests for upload format sniffing."""
+import asyncio
+import io
+import zipfile
+import PyPDF2
+import pytest
+from docx import Document
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.app.errors import ExtractionError, FileFormatError
+from backend.app.main import app
+from backend.app.summarizer.sniff import check_document, check_head, sniff_format
+from backend.app.summarizer.utils import _read_pdf, extract_text
+
+
+def make_docx(text: str) -> bytes:
+    document = Document()
+    document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+class TestSniffing:
+    """Tests for magic byte and container checks."""
+
+    def test_sniff_format(self):
+        """Test format detection from leading bytes."""
+        assert sniff_format(b"%PDF-1.7\n...") == "pdf"
+        assert sniff_format(b"PK\x03\x04rest") == "zip"
+        assert sniff_format(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1rest") == "ole"
+        assert sniff_format("Plain text, ünïcode".encode()) == "txt"
+        assert sniff_format(b"\x89PNG\r\n\x1a\n\x00\x00") is None
+
+    def test_unicode_text_with_bom(self):
+        """Test that UTF-16 and UTF-32 text is recognised by its BOM despite its NUL bytes."""
+        text = "Plain text, ünïcode"
+        for encoding in ("utf-16", "utf-16-be", "utf-32", "utf-8-sig"):
+            data = text.encode(encoding)
+            if encoding == "utf-16-be":
+                data = b"\xfe\xff" + data
+            assert sniff_format(data) == "txt"
+            assert asyncio.run(extract_text(data, "txt")) == text
+        # A BOM in front of undecodable bytes is still binary
+        assert sniff_format(b"\xff\xfe\x00\xdc\x00\x00") is None
+
+    def test_check_head_rejects_binary_mislabeled(self):
+        """Test that binary junk and legacy Office files are rejected from the head alone."""
+        with pytest.raises(FileFormatError):
+            check_head(b"\x89PNG\r\n\x1a\n\x00\x00", "pdf")
+        with pytest.raises(FileFormatError):
+            check_head(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "docx")
+        with pytest.raises(FileFormatError):
+            check_head(b"just some text", "pdf")
+        check_head(b"just some text", "txt")
+
+    def test_mislabeled_documents_are_parsed_by_content(self, make_pdf):
+        """Test that the content decides the parser, not the extension."""
+        assert check_document(make_pdf(["Hello"]), "docx") == "pdf"
+        assert check_document(make_docx("Hello"), "pdf") == "docx"
+
+    def test_zip_without_word_document(self):
+        """Test that an arbitrary zip uploaded as DOCX is rejected."""
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as archive:
+            archive.writestr("notes.txt", "hello")
+        with pytest.raises(FileFormatError):
+            check_document(buffer.getvalue(), "docx")
+
+    def test_scanned_pdf_is_rejected(self, make_pdf):
+        """Test that an image-only PDF fails the text-layer probe."""
+        with pytest.raises(ExtractionError, match="no text layer"):
+            _read_pdf(make_pdf([None, None]))
+
+    def test_blank_cover_pages_are_not_rejected(self, make_pdf):
+        """Test that a blank cover page within the probed pages does not reject the PDF."""
+        with patch("backend.app.summarizer.sniff.settings.SNIFF_PDF_PROBE_PAGES", 2):
+            assert "Body text" in _read_pdf(make_pdf([None, "Body text"]))
+
+    def test_probe_only_reads_probed_pages(self, make_pdf):
+        """Test that a scanned PDF fails after the probed pages, without extracting or scanning the rest."""
+        with patch("backend.app.summarizer.sniff.settings.SNIFF_PDF_PROBE_PAGES", 2), patch.object(
+            PyPDF2.PageObject, "extract_text", autospec=True, return_value=""
+        ) as extract:
+            with pytest.raises(ExtractionError, match="no text layer"):
+                _read_pdf(make_pdf([None, None, "Late text"]))
+        assert extract.call_count == 2
+
+    def test_probed_pages_follow_page_range(self, make_pdf):
+        """Test that a page range probes the selected pages, not the cover."""
+        with patch("backend.app.summarizer.sniff.settings.SNIFF_PDF_PROBE_PAGES", 1):
+            assert "Chapter" in _read_pdf(make_pdf([None, "Chapter"]), "2")
+
+    def test_cached_upload_is_not_parsed(self, make_pdf):
+        """Test that a repeat upload is served from the extraction cache without parsing or probing."""
+        content = make_pdf(["Cached text"])
+        with patch("backend.app.summarizer.utils.settings.EXTRACTION_CACHE_ENABLED", True):
+            first = asyncio.run(extract_text(content, "pdf"))
+            with patch("backend.app.summarizer.utils.PyPDF2.PdfReader") as reader:
+                assert asyncio.run(extract_text(content, "pdf")) == first
+        reader.assert_not_called()
+
+
+class TestSniffingEndpoint:
+    """Tests for early rejection in the file upload route."""
+
+    def test_scanned_pdf_rejected_before_extraction(self, make_pdf):
+        """Test that the route reports a scanned PDF after probing, without extracting every page."""
+        with patch("backend.app.summarizer.sniff.settings.SNIFF_PDF_PROBE_PAGES", 3), patch.object(
+            PyPDF2.PageObject, "extract_text", autospec=True, return_value=""
+        ) as extract:
+            response = TestClient(app).post(
+                "/api/summarize/file",
+                files={"file": ("scan.pdf", make_pdf([None] * 10), "application/pdf")},
+                data={"summary_length": "short"},
+            )
+        assert response.status_code == 422
+        assert response.json()["detail"]["error"]["code"] == "EXTRACTION_ERROR"
+        assert extract.call_count == 3
+
+    def test_binary_upload_labeled_txt(self):
+        """Test that binary content uploaded as text is rejected."""
+        response = TestClient(app).post(
+            "/api/summarize/file",
+            files={"file": ("notes.txt", b"\x00\x01\x02binary", "text/plain")},
+            data={"summary_length": "short"},
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"]["error"]["code"] == "FILE_FORMAT_ERROR"
+
+    def test_utf16_upload_labeled_txt(self):
+        """Test that a UTF-16 text file is summarized, not rejected as binary."""
+        with patch("backend.app.api.engine.generate_summary", return_value="Summary") as generate:
+            response = TestClient(app).post(
+                "/api/summarize/file",
+                files={"file": ("notes.txt", "Notes saved by Notepad.".encode("utf-16"), "text/plain")},
+                data={"summary_length": "short"},
+            )
+        assert response.status_code == 200
+        assert generate.call_args.args[0] == "Notes saved by Notepad."
@@ -0,0 +1,82 @@
+"""Unit tests for compact summary storage."""
+import uuid
+import pytest
+from datetime import datetime
+
+from backend.app.store import SummaryRecord, SummaryStore, UserIndex, UserIndexes, pack_id, unpack_id
+
+
+def make_record(summary_id: str, **extra) -> dict:
+    """Build a summary record in the API dict form."""
+    return {
+        "id": summary_id,
+        "text": "Original text " * 50,
+        "summary": "Summary text",
+        "length": "medium",
+        "created_at": datetime(2026, 1, 2, 3, 4, 5, 678901).isoformat(),
+        "user_id": "test_user",
+        **extra,
+    }
+
+
+class TestSummaryRecord:
+    """Tests for the compact record type."""
+
+    def test_round_trip(self):
+        """Test that a record converts back to the original dict."""
+        data = make_record(str(uuid.uuid4()), filename="report.pdf")
+        record = SummaryRecord.from_dict(data)
+
+        assert record.to_dict() == data
+        assert record["filename"] == "report.pdf"
+        assert record.get("source_url") is None
+
+    def test_compact_fields(self):
+        """Test binary IDs, integer timestamps and compressed text."""
+        summary_id = str(uuid.uuid4())
+        record = SummaryRecord.from_dict(make_record(summary_id))
+
+        assert record.packed_id == uuid.UUID(summary_id).bytes
+        assert isinstance(record.created_at, int)
+        assert len(record._text) < len(record.text)
+        assert not hasattr(record, "__dict__")
+
+    def test_text_omitted_unless_requested(self):
+        """Test that to_dict only decompresses text when asked."""
+        record = SummaryRecord.from_dict(make_record(str(uuid.uuid4())))
+        assert "text" not in record.to_dict(include_text=False)
+
+    def test_non_uuid_ids_kept_as_strings(self):
+        """Test that arbitrary string IDs survive packing."""
+        assert pack_id("summary_1") == "summary_1"
+        assert unpack_id(pack_id("summary_1")) == "summary_1"
+
+
+class TestSummaryStore:
+    """Tests for the store and per-user indexes."""
+
+    def test_store_accepts_dicts(self):
+        """Test that dict records are converted on insert."""
+        store = SummaryStore()
+        summary_id = str(uuid.uuid4())
+        store[summary_id] = make_record(summary_id)
+
+        assert summary_id in store
+        assert isinstance(store[summary_id], SummaryRecord)
+        assert list(store) == [summary_id]
+        del store[summary_id]
+        assert summary_id not in store
+
+    def test_user_index_removal(self):
+        """Test that the user index keeps order and removes entries directly."""
+        indexes = UserIndexes()
+        ids = [str(uuid.uuid4()) for _ in range(5)]
+        indexes["test_user"] = []
+        for summary_id in ids:
+            indexes["test_user"].append(summary_id)
+
+        assert isinstance(indexes["test_user"], UserIndex)
+        indexes["test_user"].remove(ids[2])
+        assert list(indexes["test_user"]) == ids[:2] + ids[3:]
+        with pytest.raises(ValueError):
+            indexes["test_user"].remove(ids[2])
@@ -63,3 +63,63 @@ class TestSummarizationEngine:
         """Test engine initialization."""
         engine = SummarizationEngine()
         assert engine is not None
+
+    @pytest.mark.asyncio
+    async def test_generate_summary_uses_cache(self, engine):
+        """Test that a repeated request is served from the summary cache."""
+        engine.client = MagicMock()
+        engine.client.chat.completions.create.return_value.choices = [
+            MagicMock(message=MagicMock(content="Cached summary"))
+        ]
+
+        first = await engine.generate_summary("Some text to summarize", "short")
+        second = await engine.generate_summary("Some text to summarize", "short")
+
+        assert first == second == "Cached summary"
+        assert engine.client.chat.completions.create.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_generate_summaries_single_call(self, engine):
+        """Test that all lengths come from one call and populate the cache."""
+        engine.client = MagicMock()
+        engine.client.chat.completions.create.return_value.choices = [
+            MagicMock(message=MagicMock(content='{"short": "S", "medium": "M", "long": "L"}'))
+        ]
+
+        summaries = await engine.generate_summaries("Some text to summarize")
+
+        assert summaries == {"short": "S", "medium": "M", "long": "L"}
+        assert engine.client.chat.completions.create.call_count == 1
+        assert await engine.generate_summary("Some text to summarize", "medium") == "M"
+        assert engine.client.chat.completions.create.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_generate_summaries_derives_missing_lengths(self, engine):
+        """Test that lengths missing from the response are derived from a longer summary."""
+        engine.client = MagicMock()
+        engine.client.chat.completions.create.return_value.choices = [
+            MagicMock(message=MagicMock(content='{"long": "Long summary"}'))
+        ]
+
+        summaries = await engine.generate_summaries("Some text to summarize", ["short", "long"])
+
+        assert summaries["long"] == "Long summary"
+        assert "short" in summaries
+        derived_call = engine.client.chat.completions.create.call_args_list[-1]
+        assert "Long summary" in derived_call.kwargs["messages"][-1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_generate_summaries_never_expands_a_shorter_summary(self, engine):
+        """Test that a missing long summary comes from the text, not from the short one."""
+        engine.client = MagicMock()
+        engine.client.chat.completions.create.return_value.choices = [
+            MagicMock(message=MagicMock(content='{"short": "Short summary"}'))
+        ]
+
+        summaries = await engine.generate_summaries("Some text to summarize", ["short", "long"])
+
+        assert summaries["short"] == "Short summary"
+        derived_call = engine.client.chat.completions.create.call_args_list[-1]
+        prompt = derived_call.kwargs["messages"][-1]["content"]
+        assert "Some text to summarize" in prompt
+        assert "Short summary" not in prompt
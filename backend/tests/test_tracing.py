@@ -0,0 +1,129 @@
+"""Unit tests for request tracing."""
+import contextvars
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock, patch
+
+from backend.app.auth import create_access_token
+from backend.app.main import app
+from backend.app.tracing import FileSpanExporter, SpanExporter, attach, inject, span, tracer
+
+
+class MemoryExporter(SpanExporter):
+    """Collect finished spans in memory."""
+
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span) -> None:
+        self.spans.append(span.to_dict())
+
+    def named(self, name: str) -> list:
+        return [s for s in self.spans if s["name"] == name]
+
+
+@pytest.fixture
+def exporter():
+    exporter = MemoryExporter()
+    tracer.add_exporter(exporter)
+    yield exporter
+    tracer.remove_exporter(exporter)
+
+
+def fake_completion(content: str) -> MagicMock:
+    response = MagicMock()
+    response.choices[0].message.content = content
+    response.usage.prompt_tokens = 42
+    response.usage.completion_tokens = 7
+    return response
+
+
+class TestSpans:
+    """Tests for span creation and context propagation."""
+
+    def test_nested_spans_share_trace(self, exporter):
+        """Test that child spans point at their parent within one trace."""
+        with span("outer") as outer:
+            with span("inner", answer=42):
+                pass
+        inner = exporter.named("inner")[0]
+        assert inner["trace_id"] == outer.trace_id
+        assert inner["parent_id"] == outer.span_id
+        assert inner["attributes"]["answer"] == 42
+        assert exporter.named("outer")[0]["parent_id"] is None
+
+    def test_error_status(self, exporter):
+        """Test that exceptions mark the span as failed."""
+        with pytest.raises(ValueError):
+            with span("failing"):
+                raise ValueError("boom")
+        failed = exporter.named("failing")[0]
+        assert failed["status"] == "error"
+        assert "boom" in failed["attributes"]["error"]
+
+    def test_inject_and_attach(self, exporter):
+        """Test that a captured context continues the trace in a fresh context."""
+        with span("parent") as parent:
+            carrier = inject()
+
+        def worker():
+            with attach(carrier), span("child"):
+                pass
+
+        contextvars.Context().run(worker)
+        child = exporter.named("child")[0]
+        assert child["trace_id"] == parent.trace_id
+        assert child["parent_id"] == parent.span_id
+
+    def test_file_exporter(self, tmp_path):
+        """Test that the file exporter writes one JSON line per span."""
+        exporter = FileSpanExporter(str(tmp_path / "traces" / "spans.jsonl"))
+        tracer.add_exporter(exporter)
+        try:
+            with span("first"):
+                pass
+            with span("second"):
+                pass
+        finally:
+            tracer.remove_exporter(exporter)
+            exporter.shutdown()
+        lines = (tmp_path / "traces" / "spans.jsonl").read_text().splitlines()
+        assert [json.loads(line)["name"] for line in lines] == ["first", "second"]
+
+
+class TestRequestTracing:
+    """Tests for the request tracing middleware."""
+
+    def test_request_id_and_pipeline_spans(self, exporter):
+        """Test that a request is traced end to end under one request ID."""
+        token = create_access_token(data={"sub": "tracing_user"})
+        with patch("backend.app.api.engine.client") as client:
+            client.chat.completions.create.return_value = fake_completion("Traced summary")
+            response = TestClient(app).post(
+                "/api/summarize",
+                headers={"Authorization": f"Bearer {token}", "X-Request-ID": "req-123"},
+                json={"text": "A unique text for the tracing test.", "summary_length": "short"},
+            )
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == "req-123"
+
+        root = exporter.named("http.request")[0]
+        llm = exporter.named("llm_call")[0]
+        persistence = exporter.named("persistence")[0]
+        assert root["attributes"]["http.status_code"] == 200
+        assert llm["trace_id"] == persistence["trace_id"] == root["trace_id"]
+        assert llm["request_id"] == "req-123"
+        assert llm["attributes"]["prompt_tokens"] == 42
+        assert llm["attributes"]["completion_tokens"] == 7
+
+    def test_traceparent_continues_trace(self, exporter):
+        """Test that an incoming traceparent header sets the trace ID."""
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        response = TestClient(app).get(
+            "/api/health", headers={"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"}
+        )
+        assert "X-Request-ID" in response.headers
+        root = exporter.named("http.request")[0]
+        assert root["trace_id"] == trace_id
+        assert root["parent_id"] == "00f067aa0ba902b7"
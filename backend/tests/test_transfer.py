@@ -0,0 +1,125 @@
+"""Unit tests for streaming history export and import."""
+import asyncio
+import gzip
+import json
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+
+from backend.app.api import summaries_db, users_db
+from backend.app.auth import create_access_token
+from backend.app.errors import ValidationError
+from backend.app.main import app
+from backend.app.ndjson import encode_ndjson, iter_ndjson_lines
+
+
+def auth(user: str) -> dict:
+    return {"Authorization": f"Bearer {create_access_token(data={'sub': user})}"}
+
+
+def ndjson(records: list[dict]) -> bytes:
+    return b"".join(encode_ndjson(records, batch_size=2))
+
+
+async def chunked(data: bytes, size: int = 7):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def collect(data: bytes, **kwargs) -> list[tuple[int, bytes]]:
+    return [line async for line in iter_ndjson_lines(chunked(data), **kwargs)]
+
+
+class TestNdjson:
+    """Tests for the NDJSON codec."""
+
+    def test_roundtrip_across_chunk_boundaries(self):
+        """Test that lines split across body chunks are reassembled."""
+        records = [{"n": i, "text": "ünïcode " * i} for i in range(5)]
+        lines = asyncio.run(collect(ndjson(records)))
+        assert [json.loads(line) for _, line in lines] == records
+
+    def test_gzip_roundtrip(self):
+        """Test that compressed output decodes to the same lines."""
+        records = [{"n": i} for i in range(10)]
+        data = b"".join(encode_ndjson(records, batch_size=3, compress=True))
+        assert gzip.decompress(data).count(b"\n") == 10
+        assert len(asyncio.run(collect(data, compressed=True))) == 10
+
+    def test_long_line_rejected(self):
+        """Test that a line over the limit fails instead of growing the buffer."""
+        with pytest.raises(ValidationError):
+            asyncio.run(collect(b"x" * 100, max_line_bytes=50))
+
+
+class TestHistoryTransfer:
+    """Tests for the export and import endpoints."""
+
+    def test_export_then_import(self):
+        """Test that an exported history imports into another account."""
+        client = TestClient(app)
+        with patch("backend.app.api.engine.generate_summary", return_value="A summary"):
+            for text in ("First document.", "Second document."):
+                client.post("/api/summarize", headers=auth("exporter"), json={"text": text, "summary_length": "short"})
+
+        export = client.get("/api/history/export?gzip=true", headers=auth("exporter"))
+        assert export.status_code == 200
+        assert export.headers["content-type"] == "application/gzip"
+        lines = gzip.decompress(export.content).splitlines()
+        assert [json.loads(line)["text"] for line in lines] == ["First document.", "Second document."]
+
+        response = client.post(
+            "/api/history/import",
+            headers={**auth("importer"), "Content-Type": "application/gzip"},
+            content=export.content,
+        )
+        assert response.json()["imported"] == 2
+        assert len(users_db["importer"]) == 2
+        assert all(summaries_db[sid].user_id == "importer" for sid in users_db["importer"])
+
+    def test_reimport_skips_duplicates(self):
+        """Test that importing the same lines twice stores them once."""
+        client = TestClient(app)
+        body = ndjson([{"id": "a1b2c3", "summary": "One", "length": "short"}])
+        client.post("/api/history/import", headers=auth("twice"), content=body)
+        second = client.post("/api/history/import", headers=auth("twice"), content=body).json()
+        assert second["imported"] == 0 and second["skipped"] == 1
+        assert len(users_db["twice"]) == 1
+
+    def test_invalid_lines_reported(self):
+        """Test that bad lines are counted and reported without failing the import."""
+        body = b'{"summary": "Good", "length": "short"}\nnot json\n{"summary": "", "length": "short"}\n'
+        response = TestClient(app).post("/api/history/import", headers=auth("partial"), content=body).json()
+        assert response["imported"] == 1
+        assert response["invalid"] == 2
+        assert [error["line"] for error in response["errors"]] == [2, 3]
+
+    def test_unknown_fields_dropped(self):
+        """Test that only exported fields are stored, not arbitrary or server-set extras."""
+        body = ndjson([{
+            "id": "imported-extra",
+            "summary": "One",
+            "length": "short",
+            "filename": "report.pdf",
+            "extra_field": {"a": 1},
+            "reused": {"similarity": 1.0},
+        }])
+        response = TestClient(app).post("/api/history/import", headers=auth("extras"), content=body).json()
+        assert response["imported"] == 1
+        record = summaries_db["imported-extra"].to_dict()
+        assert record["filename"] == "report.pdf"
+        assert "extra_field" not in record
+        assert "reused" not in record
+
+    def test_repeated_foreign_id_imported_once(self):
+        """Test that a line repeated in one import is stored once, even when its ID is someone else's."""
+        client = TestClient(app)
+        client.post("/api/history/import", headers=auth("owner"), content=ndjson([
+            {"id": "shared-id", "summary": "Owner's", "length": "short"},
+        ]))
+        line = {"id": "shared-id", "summary": "Copied", "length": "short"}
+        response = client.post("/api/history/import", headers=auth("copier"), content=ndjson([line, line])).json()
+        assert response["imported"] == 1 and response["skipped"] == 1
+        assert len(users_db["copier"]) == 1
+        assert "shared-id" not in users_db["copier"]
+        assert summaries_db["shared-id"].user_id == "owner"
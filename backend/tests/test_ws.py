@@ -0,0 +1,139 @@
+"""Unit tests for the multiplexed summarization WebSocket."""
+import asyncio
+import base64
+import pytest
+from fastapi.testclient import TestClient
+from starlette.websockets import WebSocket, WebSocketDisconnect
+from unittest.mock import patch
+
+from backend.app.auth import create_access_token
+from backend.app.main import app
+from backend.app.metrics import metrics
+
+
+def connect(client: TestClient, user: str = "ws_user"):
+    token = create_access_token(data={"sub": user})
+    return client.websocket_connect(f"/api/ws?token={token}")
+
+
+def receive_until(websocket, kind: str, job_id: str) -> list[dict]:
+    """Collect messages up to and including the first ``kind`` event for a job."""
+    messages = []
+    while True:
+        message = websocket.receive_json()
+        messages.append(message)
+        if message["type"] == kind and message.get("id") == job_id:
+            return messages
+
+
+class TestSummarizeSocket:
+    """Tests for jobs over the WebSocket."""
+
+    def test_text_job(self):
+        """Test that a job reports progress, its result and a history push."""
+        with patch("backend.app.api.engine.generate_summary", return_value="Socket summary"):
+            with connect(TestClient(app)) as websocket:
+                assert websocket.receive_json() == {"type": "ready", "user_id": "ws_user"}
+                websocket.send_json({"type": "summarize", "id": "a", "text": "Some text to summarize."})
+                messages = receive_until(websocket, "result", "a")
+
+        kinds = [message["type"] for message in messages]
+        assert kinds[0] == "accepted"
+        assert [m["stage"] for m in messages if m["type"] == "progress"] == ["normalizing", "summarizing"]
+        assert "history" in kinds
+        result = messages[-1]["summary"]
+        assert result["summary"] == "Socket summary"
+        assert result["user_id"] == "ws_user"
+
+    def test_file_job(self):
+        """Test that a base64 file upload is extracted and summarized."""
+        data = base64.b64encode(b"Plain text file contents.").decode()
+        with patch("backend.app.api.engine.generate_summary", return_value="File summary"):
+            with connect(TestClient(app)) as websocket:
+                websocket.receive_json()
+                websocket.send_json({
+                    "type": "summarize", "id": "f", "mode": "file", "filename": "notes.txt", "data": data,
+                })
+                messages = receive_until(websocket, "result", "f")
+        assert messages[-1]["summary"]["filename"] == "notes.txt"
+        assert "extracting" in [m.get("stage") for m in messages]
+
+    def test_errors_are_per_job(self):
+        """Test that a failing job reports an error and the connection stays usable."""
+        with connect(TestClient(app)) as websocket:
+            websocket.receive_json()
+            websocket.send_json({"type": "summarize", "id": "bad", "text": "   "})
+            error = receive_until(websocket, "error", "bad")[-1]
+            assert error["error"]["code"] == "VALIDATION_ERROR"
+            websocket.send_json({"type": "ping"})
+            assert websocket.receive_json() == {"type": "pong"}
+
+    def test_non_string_fields_rejected(self):
+        """Test that fields of the wrong JSON type are validation errors, not internal errors."""
+        jobs = [
+            {"id": "t", "text": ["not", "a", "string"]},
+            {"id": "p", "mode": "file", "filename": "a.pdf", "page_range": 3, "data": ""},
+            {"id": "d", "mode": "file", "filename": "a.txt", "data": {"bytes": 1}},
+            {"id": "l", "text": "Some text.", "summary_length": ["short"]},
+        ]
+        with connect(TestClient(app)) as websocket:
+            websocket.receive_json()
+            for job in jobs:
+                websocket.send_json({"type": "summarize", **job})
+                error = receive_until(websocket, "error", job["id"])[-1]
+                assert error["error"]["code"] == "VALIDATION_ERROR"
+
+    def test_binary_frame_rejected(self):
+        """Test that a binary frame gets an error and the connection stays usable."""
+        with connect(TestClient(app)) as websocket:
+            websocket.receive_json()
+            websocket.send_bytes(b'{"type": "ping"}')
+            error = websocket.receive_json()
+            assert error["type"] == "error"
+            assert error["error"]["code"] == "VALIDATION_ERROR"
+            websocket.send_json({"type": "ping"})
+            assert websocket.receive_json() == {"type": "pong"}
+
+    def test_writer_failure_closes_session(self):
+        """Test that a failed send is logged and closes the connection instead of being lost."""
+        real_send_json = WebSocket.send_json
+        sent = []
+
+        async def failing_send_json(websocket, data, mode="text"):
+            if sent:
+                raise RuntimeError("send failed")
+            sent.append(data)
+            await real_send_json(websocket, data, mode)
+
+        metrics.reset()
+        with patch.object(WebSocket, "send_json", failing_send_json):
+            with connect(TestClient(app)) as websocket:
+                assert websocket.receive_json()["type"] == "ready"
+                websocket.send_json({"type": "ping"})
+                with pytest.raises(WebSocketDisconnect) as closed:
+                    websocket.receive_json()
+        assert closed.value.code == 1011
+        assert metrics.get("ws_writer_errors_total") == 1
+
+    def test_cancel(self):
+        """Test that a running job can be cancelled."""
+        async def slow_generate(*args, **kwargs):
+            await asyncio.sleep(5)
+            return "Too late"
+
+        with patch("backend.app.api.engine.generate_summary", side_effect=slow_generate):
+            with connect(TestClient(app)) as websocket:
+                websocket.receive_json()
+                websocket.send_json({"type": "summarize", "id": "slow", "text": "Some text to summarize."})
+                receive_until(websocket, "progress", "slow")
+                receive_until(websocket, "progress", "slow")
+                websocket.send_json({"type": "cancel", "id": "slow"})
+                messages = receive_until(websocket, "cancelled", "slow")
+        assert all(message["type"] != "result" for message in messages)
+
+    def test_invalid_token_rejected(self):
+        """Test that a bad token closes the connection before it is accepted."""
+        with pytest.raises(WebSocketDisconnect) as closed:
+            with TestClient(app).websocket_connect("/api/ws?token=not-a-token") as websocket:
+                websocket.receive_json()
+        assert closed.value.code == 1008
@@ -1,4 +1,6 @@
 """Application entry point and CLI for running GenAIsummarizer."""
+import argparse
+import asyncio
 import os
 import sys
 import uvicorn
@@ -25,6 +27,48 @@ def run_server():
     )
 
 
+def run_bulk(args: list) -> int:
+    """Summarize many files offline, writing NDJSON results."""
+    from backend.app.bulk import resolve_inputs, summarize_files
+    from backend.app.errors import ValidationError
+
+    parser = argparse.ArgumentParser(prog="python run.py summarize", description="Bulk-summarize files.")
+    parser.add_argument("target", help="Directory, glob pattern, or manifest (.manifest/.list/.jsonl)")
+    parser.add_argument("--length", choices=["short", "medium", "long"], default="medium")
+    parser.add_argument("--output", "-o", default="summaries.ndjson", help="NDJSON output file (appended)")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent model calls")
+    options = parser.parse_args(args)
+
+    try:
+        paths = resolve_inputs(options.target)
+    except ValidationError as e:
+        print(f"Invalid manifest: {e.message}", file=sys.stderr)
+        return 1
+    if not paths:
+        print(f"No supported files found for {options.target}", file=sys.stderr)
+        return 1
+
+    output = Path(options.output)
+    checkpoint = Path(options.checkpoint or f"{options.output}.checkpoint")
+    result = asyncio.run(
+        summarize_files(
+            paths,
+            output,
+            checkpoint,
+            length=options.length,
+            workers=options.workers,
+            concurrency=options.concurrency,
+        )
+    )
+    print(
+        f"Processed {result['processed']} files ({result['failed']} failed, "
+        f"{result['skipped']} skipped from checkpoint) -> {output}"
+    )
+    return 0 if result["failed"] == 0 else 2
+
+
 def main():
     """Main entry point for the CLI."""
     if len(sys.argv) > 1:
@@ -35,6 +79,8 @@ def main():
         elif command in ["--version", "-v"]:
             print(f"{settings.APP_NAME} v{settings.APP_VERSION}")
             return 0
+        elif command == "summarize":
+            return run_bulk(sys.argv[2:])
     else:
         # Default: run the server
         run_server()
@@ -52,6 +98,9 @@ Usage: python run.py [COMMAND]
 
 Commands:
     (no command)    Start the web server (default)
+    summarize <dir|glob|manifest> [--length L] [--output FILE] [--checkpoint FILE]
+                    [--workers N] [--concurrency N]
+                    Summarize files offline into NDJSON; resumes from the checkpoint
     --help, -h      Show this help message
     --version, -v   Show version information
 
@@ -67,6 +116,7 @@ Examples:
     python run.py                           # Start server on default port
     PORT=9000 python run.py                # Start server on port 9000
     AZURE_OPENAI_API_KEY=<key> python run.py   # Start with Azure credentials
+    python run.py summarize ./docs -o out.ndjson   # Summarize every file under ./docs
 
 For detailed documentation, see README.md
     """)